@@ -1,8 +1,54 @@
 """
 핵심 로직 모듈 (캡처 및 PDF 변환)
+
+하위 모듈은 이름을 처음 사용할 때 불러온다. 명령줄 변환과 변환 워커 프로세스가
+Qt(캡처/변환 스레드)나 mss(화면 소스)를 불러오지 않도록 하기 위함이다.
 """
 
-from .capture import CaptureThread
-from .converter import PDFConverter
+import importlib
+
+# 공개 이름 -> 정의된 하위 모듈
+_EXPORTS = {
+    'CaptureThread': 'capture',
+    'PageCodec': 'codec',
+    'EncodedPage': 'codec',
+    'PDFConverter': 'converter',
+    'IncrementalPDFWriter': 'converter',
+    'ConvertThread': 'conversion',
+    'SizeOptimizer': 'optimizer',
+    'PageProcessor': 'processing',
+    'ResampleStage': 'processing',
+    'CropStage': 'processing',
+    'WhitenStage': 'processing',
+    'ContrastStage': 'processing',
+    'ThresholdStage': 'processing',
+    'SpreadSplitter': 'processing',
+    'IntermediateFormat': 'formats',
+    'FrameSpool': 'spool',
+    'JobQueue': 'jobs',
+    'JobScheduler': 'jobs',
+    'Frame': 'sources',
+    'FrameSource': 'sources',
+    'PageTurner': 'sources',
+    'MssFrameSource': 'sources',
+    'PyAutoGuiPageTurner': 'sources',
+    'ReplayFrameSource': 'sources',
+    'ReplayPageTurner': 'sources',
+    'RecordingFrameSource': 'sources',
+    'RecordingPageTurner': 'sources',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['CaptureThread', 'PDFConverter']
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -4,11 +4,16 @@
 
 import os
 import time
-import platform
 from PyQt6.QtCore import QThread, pyqtSignal
-import pyautogui
-from PIL import Image
-from mss import mss
+
+from .codec import PageCodec
+from .converter import IncrementalPDFWriter
+from .encoder import FrameEncoderPool
+from .frames import FrameComparator
+from .sources import (MssFrameSource, PyAutoGuiPageTurner,
+                      RecordingFrameSource, RecordingPageTurner)
+from ..utils.monitor import MonitorManager
+from ..utils.perf import PerfRecorder
 
 
 class CaptureThread(QThread):
@@ -17,75 +22,385 @@ class CaptureThread(QThread):
     
     시그널:
         progress: 현재 캡처 진행 상태 (페이지 번호)
+        timings: 단계별 소요 시간 통계가 담긴 성능 리포트 (finished 직전에 발생)
+        pages_captured: 실제로 저장된 페이지 수 (finished 직전에 발생)
         finished: 캡처 작업 완료 알림
     """
     progress = pyqtSignal(int)
+    timings = pyqtSignal(dict)
+    pages_captured = pyqtSignal(int)
     finished = pyqtSignal()
     
-    def __init__(self, x1, y1, x2, y2, page_num, monitor_offset, delay):
+    def __init__(self, x1, y1, x2, y2, page_num, monitor_offset, delay,
+                 encoder_workers=None, max_pending=8,
+                 wait_stable=False, poll_interval=0.05, stable_polls=2,
+                 auto_stop=False, end_repeat=3,
+                 retry_missed=False, max_retries=3, retry_backoff=0.2,
+                 source=None, turner=None, pdf_path=None,
+                 work_dir="img", intermediate="spool", codec="auto", processor=None,
+                 spread=None, record_dir=None):
         """
         Args:
             x1, y1: 캡처 영역의 좌상단 좌표
             x2, y2: 캡처 영역의 우하단 좌표
-            page_num: 총 페이지 수
-            monitor_offset: 모니터 오프셋 {'top': int, 'left': int}
-            delay: 페이지 넘김 딜레이 (초)
+            page_num: 총 페이지 수 (auto_stop 모드에서는 상한, None이면 무제한)
+            monitor_offset: 모니터 오프셋 {'top': int, 'left': int} 또는 모니터 인덱스
+                (인덱스면 MonitorManager의 캐시된 구성에서 오프셋을 가져옴)
+            delay: 페이지 넘김 딜레이 (초), 안정화 대기 모드에서는 최대 대기 시간
+            encoder_workers: PNG 인코더 워커 수 (None이면 자동)
+            max_pending: 인코딩 대기 중인 프레임의 최대 개수
+            wait_stable: True면 고정 딜레이 대신 화면이 안정될 때까지 대기
+            poll_interval: 안정화 대기 시 화면 확인 간격 (초)
+            stable_polls: 페이지 변경 후 연속으로 같아야 하는 확인 횟수
+            auto_stop: True면 같은 화면이 반복될 때 책의 끝으로 보고 캡처 중단
+            end_repeat: 책의 끝으로 판정할 연속 동일 프레임 수
+                (retry_missed가 켜져 있으면 max_retries를 모두 사용한 뒤에 판정)
+            retry_missed: True면 페이지가 넘어가지 않았을 때 중복 저장 대신 키 재입력
+            max_retries: 페이지당 최대 키 재입력 횟수
+            retry_backoff: 첫 재입력 전 대기 시간 (초), 재시도마다 두 배로 증가
+            source: 프레임 소스 (None이면 mss로 지정 영역 캡처)
+            turner: 페이지 넘김 백엔드 (None이면 pyautogui 키 입력)
+            pdf_path: 지정하면 캡처와 동시에 이 경로로 PDF를 작성
+            work_dir: 중간 프레임을 저장할 작업 디렉토리
+            intermediate: 중간 저장 형식 지정 문자열
+                ('spool': 메모리 맵 원본 프레임, 'png:1', 'bmp', 'zraw' 등은 IntermediateFormat 참고)
+            codec: 캡처 중 PDF 작성 시 페이지 코덱 ('auto', 'lossless', 'raw', PageCodec 참고)
+            processor: 중간 저장 전에 인코더 워커에서 적용할 PageProcessor (해상도 축소 등),
+                fit()이 필요한 프로세서는 받지 않음 (ValueError)
+            spread: 두 쪽 펼침 화면을 나눌 SpreadSplitter (None이면 한 번에 한 페이지),
+                page_num과 진행률은 나뉜 페이지 수 기준
+            record_dir: 지정하면 캡처한 화면과 렌더링 지연을 이 디렉토리에 녹화
+                (ReplayFrameSource로 재생 가능)
         """
         super().__init__()
+        if processor is not None and processor.needs_fit:
+            # 책 전체 자르기 영역은 표본 페이지가 필요하므로 변환 단계에서만 처리
+            raise ValueError("processors that need fitting must be applied at conversion")
+        if isinstance(monitor_offset, int):
+            monitor_offset = MonitorManager.get_monitor_offset(monitor_offset)
         self.x1 = x1 + monitor_offset['left']
         self.y1 = y1 + monitor_offset['top']
         self.x2 = x2 + monitor_offset['left']
         self.y2 = y2 + monitor_offset['top']
         self.page_num = page_num
         self.delay = delay
+        self.encoder_workers = encoder_workers
+        self.max_pending = max_pending
+        self.wait_stable = wait_stable
+        self.poll_interval = poll_interval
+        self.stable_polls = stable_polls
+        self.auto_stop = auto_stop
+        self.end_repeat = end_repeat
+        self.retry_missed = retry_missed
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.source = source
+        self.turner = turner
+        self.pdf_path = pdf_path
+        self.work_dir = work_dir
+        self.intermediate = intermediate
+        self.codec = codec
+        self.processor = processor
+        self.spread = spread
+        self.record_dir = record_dir
+        self.codec_stats = {}
+        self.dedup_stats = {}
+        self.pdf_pages = 0
+        self.captured_count = 0
+        self.retry_stats = {'retries': 0, 'recovered_pages': 0, 'exhausted': 0, 'latencies': []}
+        self.perf = PerfRecorder()
+        self.errors = []
         
     def run(self):
-        """지정된 영역을 순차적으로 캡처하고 PNG 이미지로 저장 (크로스 플랫폼 호환)"""
-        output_dir = "img"
+        """지정된 영역을 순차적으로 캡처하고 중간 형식(스풀 또는 PNG)으로 저장 (크로스 플랫폼 호환)"""
+        output_dir = self.work_dir
         os.makedirs(output_dir, exist_ok=True)
+        variable_size = ((self.processor is not None and self.processor.variable_size) or
+                         (self.spread is not None and self.spread.variable_size))
+        if self.intermediate == "spool" and variable_size:
+            # 페이지별 자르기나 펼침 분할은 프레임 크기가 달라지므로 스풀 대신 빠른 PNG 사용
+            self.intermediate = "png:1"
+        
+        started = time.perf_counter()
         
-        # 플랫폼별 pyautogui 설정
-        if platform.system() == "Darwin":  # macOS
-            # macOS에서 보안 권한 처리
-            pyautogui.FAILSAFE = True
-            pyautogui.PAUSE = 0.1
-        elif platform.system() == "Windows":
-            # Windows에서 DPI 인식 설정
-            pyautogui.FAILSAFE = True
-            pyautogui.PAUSE = 0.1
+        monitor = {
+            "top": self.y1,
+            "left": self.x1,
+            "width": self.x2 - self.x1,
+            "height": self.y2 - self.y1
+        }
         
+        pdf_writer = None
+        encoder = None
         try:
-            with mss() as sct:
-                for i in range(self.page_num):
-                    monitor = {
-                        "top": self.y1,
-                        "left": self.x1,
-                        "width": self.x2 - self.x1,
-                        "height": self.y2 - self.y1
-                    }
-                    
-                    # 캡처 영역 유효성 검사
-                    if monitor["width"] <= 0 or monitor["height"] <= 0:
-                        print(f"Invalid capture area: {monitor}")
-                        continue
+            # 캡처 중 PDF 작성: 인코딩이 끝난 페이지부터 순서대로 문서에 추가
+            if self.pdf_path:
+                pdf_writer = IncrementalPDFWriter(self.pdf_path,
+                                                  dpi=self.processor.dpi if self.processor else None,
+                                                  perf=self.perf,
+                                                  codec=PageCodec.parse(self.codec))
+            
+            # PNG 인코딩은 워커 풀에서 처리하여 페이지 넘김 루프와 분리
+            encoder = FrameEncoderPool(
+                output_dir, self.encoder_workers, self.max_pending,
+                on_encoded=self._on_page_encoded(pdf_writer),
+                perf=self.perf,
+                intermediate=self.intermediate,
+                expected_frames=self.page_num,
+                processor=self.processor
+            )
+            encoder.start()
+            
+            source = self.source
+            if source is None:
+                # 캡처 영역 유효성 검사
+                if monitor["width"] <= 0 or monitor["height"] <= 0:
+                    raise ValueError(f"Invalid capture area: {monitor}")
+                source = MssFrameSource(monitor)
+            turner = self.turner or PyAutoGuiPageTurner()
+            if self.record_dir:
+                source = RecordingFrameSource(source, self.record_dir)
+                turner = RecordingPageTurner(turner, source)
+            
+            with source:
+                detect_repeat = self.auto_stop or self.retry_missed
+                use_signature = self.wait_stable or detect_repeat
+                frame, signature = self._grab(source, use_signature)
+                saved_signature = None
+                repeat_count = 0
+                repeat_started = 0.0
+                
+                while self.page_num is None or self.captured_count < self.page_num:
+                    is_repeat = (detect_repeat and saved_signature is not None and
+                                 not FrameComparator.differs(signature, saved_signature))
+                    if is_repeat:
+                        # 페이지가 넘어가지 않음: 중복 프레임은 저장하지 않음
+                        repeat_count += 1
+                        if repeat_count == 1:
+                            repeat_started = time.monotonic()
+                        # 재시도를 먼저 모두 사용한 뒤에만 책의 끝으로 판정
+                        retry_left = self.retry_missed and repeat_count <= self.max_retries
+                        if self.auto_stop and not retry_left and repeat_count >= self.end_repeat:
+                            print(f"End of book detected after {self.captured_count} pages")
+                            break
+                        if retry_left:
+                            # 키 입력 누락으로 보고 백오프 후 다시 확인
+                            self.retry_stats['retries'] += 1
+                            with self.perf.measure('retry_backoff'):
+                                time.sleep(self.retry_backoff * (2 ** (repeat_count - 1)))
+                            frame, signature = self._grab(source, use_signature)
+                            if FrameComparator.differs(signature, saved_signature):
+                                # 백오프 중에 페이지가 넘어감: 키를 다시 보내지 않고,
+                                # 렌더링 중인 프레임일 수 있으므로 평소처럼 기다린 뒤 저장
+                                with self.perf.measure('wait'):
+                                    if self.wait_stable:
+                                        frame, signature = self._wait_until_stable(
+                                            source, saved_signature)
+                                    else:
+                                        time.sleep(self.delay)
+                                if not self.wait_stable:
+                                    frame, signature = self._grab(source, use_signature)
+                                continue
+                            # 여전히 같은 프레임이면 아래에서 키 재입력
+                        elif not self.auto_stop:
+                            # 재시도 소진: 실제로 같은 페이지일 수 있으므로 그대로 저장
+                            # (페이지가 바뀐 것이 아니므로 복구로 세지 않음)
+                            if self.retry_missed:
+                                self.retry_stats['exhausted'] += 1
+                            repeat_count = 0
+                            is_repeat = False
                     
-                    screenshot = sct.grab(monitor)
+                    if not is_repeat:
+                        if repeat_count and self.retry_missed:
+                            self.retry_stats['recovered_pages'] += 1
+                            self.retry_stats['latencies'].append(time.monotonic() - repeat_started)
+                        repeat_count = 0
+                        saved_signature = signature
+                        for page in self._split(frame):
+                            if self.captured_count == self.page_num:
+                                break
+                            self.captured_count += 1
+                            # PNG 인코딩은 워커에 맡기고 바로 다음 페이지로 진행
+                            with self.perf.measure('queue_wait'):
+                                encoder.submit(self.captured_count, page)
+                            self.progress.emit(self.captured_count)
+                        if self.captured_count == self.page_num:
+                            break
                     
-                    # PNG 형식으로 저장하여 무손실 화질 유지
-                    image_path = os.path.join(output_dir, f"page_{i+1}.png")
-                    img = Image.frombytes("RGB", screenshot.size, screenshot.rgb)
-                    img.save(image_path, "PNG")
+                    with self.perf.measure('key'):
+                        turner.turn()
                     
-                    # 플랫폼별 키 입력 방식
-                    if platform.system() == "Darwin":  # macOS
-                        pyautogui.press('right')
-                    else:  # Windows, Linux
-                        pyautogui.press('right')
-                        
-                    time.sleep(self.delay)
-                    self.progress.emit(i + 1)
+                    if self.wait_stable:
+                        # 안정화 확인에 쓴 프레임을 다음 페이지 캡처로 재사용
+                        with self.perf.measure('wait'):
+                            frame, signature = self._wait_until_stable(source, signature)
+                    else:
+                        with self.perf.measure('wait'):
+                            time.sleep(self.delay)
+                        frame, signature = self._grab(source, use_signature)
                     
         except Exception as e:
             print(f"Capture error: {e}")
+            self.errors.append(f"capture: {e}")
+        finally:
+            # 남은 프레임 인코딩이 끝날 때까지 대기 (시작 전에 실패했으면 건너뜀)
+            if encoder is not None:
+                with self.perf.measure('encoder_drain'):
+                    for error in encoder.close():
+                        print(f"Encode error: {error}")
+                        self.errors.append(f"encode: {error}")
+            
+            if pdf_writer is not None:
+                self.pdf_pages = self._finalize_pdf(pdf_writer)
+                if pdf_writer.codec is not None:
+                    self.codec_stats = pdf_writer.codec_stats
+                self.dedup_stats = pdf_writer.dedup_stats
+        
+        if self.retry_stats['retries']:
+            self._print_retry_report()
+        
+        self.timings.emit(self.build_report(time.perf_counter() - started))
+        self.pages_captured.emit(self.captured_count)
+        self.finished.emit()
+        
+    def _wait_until_stable(self, source, previous_signature):
+        """
+        페이지가 바뀐 뒤 stable_polls번 연속으로 변화가 없을 때까지 대기
+        
+        delay는 최대 대기 시간으로 사용되며, 시간 초과 시 마지막 프레임을 반환한다.
+        
+        Args:
+            source: 프레임 소스
+            previous_signature: 페이지 넘김 전 프레임의 시그니처
+            
+        Returns:
+            tuple: (마지막 프레임, 시그니처)
+        """
+        deadline = time.monotonic() + self.delay
+        changed = False
+        stable_count = 0
+        last_signature = previous_signature
+        
+        while True:
+            time.sleep(self.poll_interval)
+            frame, signature = self._grab(source, True)
+            
+            if not changed:
+                changed = FrameComparator.differs(signature, previous_signature)
+            elif FrameComparator.differs(signature, last_signature):
+                # 렌더링(애니메이션) 진행 중
+                stable_count = 0
+            else:
+                stable_count += 1
+                if stable_count >= self.stable_polls:
+                    break
+            
+            last_signature = signature
+            if time.monotonic() >= deadline:
+                break
                 
-        self.finished.emit()
\ No newline at end of file
+        return frame, signature
+        
+    def _grab(self, source, use_signature):
+        """
+        프레임 캡처 및 (필요 시) 시그니처 계산
+        
+        Returns:
+            tuple: (프레임, 시그니처 또는 None)
+        """
+        with self.perf.measure('grab'):
+            frame = source.grab()
+        if not use_signature:
+            return frame, None
+        with self.perf.measure('signature'):
+            signature = FrameComparator.signature(frame)
+        return frame, signature
+        
+    def _split(self, frame):
+        """
+        캡처 프레임을 저장할 페이지들로 나누기
+        
+        Returns:
+            list: 읽는 순서대로 정렬된 Frame 리스트 (펼침 모드가 아니면 프레임 하나)
+        """
+        if self.spread is None:
+            return [frame]
+        with self.perf.measure('split'):
+            return self.spread.split_frame(frame)
+        
+    def build_report(self, elapsed):
+        """
+        캡처 성능 리포트 생성
+        
+        Args:
+            elapsed: 전체 캡처 소요 시간 (초)
+            
+        Returns:
+            dict: 페이지 수, 처리량, 단계별 시간 통계, 재시도 통계, 코덱/중복 페이지 통계, 오류 목록
+        """
+        latencies = self.retry_stats['latencies']
+        return {
+            'pages': self.captured_count,
+            'pdf_pages': self.pdf_pages,
+            'elapsed_s': round(elapsed, 3),
+            'pages_per_min': round(self.captured_count * 60 / elapsed, 2) if elapsed > 0 else 0.0,
+            'settings': {
+                'delay': self.delay,
+                'wait_stable': self.wait_stable,
+                'auto_stop': self.auto_stop,
+                'retry_missed': self.retry_missed,
+                'incremental_pdf': bool(self.pdf_path),
+                'intermediate': self.intermediate,
+                'codec': self.codec if isinstance(self.codec, str) else self.codec.spec,
+                'processing': self.processor.describe() if self.processor else [],
+                'spread': self.spread.describe() if self.spread else None,
+            },
+            'stages': self.perf.summary(),
+            'retries': {
+                'retries': self.retry_stats['retries'],
+                'recovered_pages': self.retry_stats['recovered_pages'],
+                'exhausted': self.retry_stats['exhausted'],
+                'max_latency_s': round(max(latencies), 3) if latencies else 0.0,
+            },
+            'codecs': self.codec_stats,
+            'dedup': self.dedup_stats,
+            'errors': list(self.errors),
+        }
+        
+    @staticmethod
+    def _on_page_encoded(pdf_writer):
+        """인코딩 완료 콜백 생성 (PDF 작성기가 없으면 None)"""
+        if pdf_writer is None:
+            return None
+        
+        def callback(page_index, page):
+            if page is not None:
+                pdf_writer.add_page(page_index, page)
+            else:
+                pdf_writer.skip_page(page_index)
+        return callback
+        
+    def _finalize_pdf(self, pdf_writer):
+        """
+        캡처 중 작성한 PDF 마무리
+        
+        Returns:
+            int: PDF에 기록된 페이지 수 (실패 시 0)
+        """
+        try:
+            return pdf_writer.finalize()
+        except Exception as e:
+            print(f"PDF 변환 중 오류 발생: {e}")
+            self.errors.append(f"pdf: {e}")
+            return 0
+        
+    def _print_retry_report(self):
+        """페이지 넘김 재시도 통계 출력"""
+        latencies = self.retry_stats['latencies']
+        summary = (f"Page-turn retries: {self.retry_stats['retries']}, "
+                   f"recovered pages: {self.retry_stats['recovered_pages']}, "
+                   f"exhausted: {self.retry_stats['exhausted']}")
+        if latencies:
+            summary += (f", retry latency avg {sum(latencies) / len(latencies):.2f}s"
+                        f" / max {max(latencies):.2f}s")
+        print(summary)
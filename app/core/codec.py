@@ -0,0 +1,423 @@
+"""
+페이지 분석 및 코덱 선택 모듈
+
+캡처된 페이지는 대부분 흰 바탕의 검은 글자이므로 모든 페이지를 24비트 RGB로
+넣으면 PDF가 불필요하게 커진다. 페이지마다 히스토그램을 분석하여
+흑백(bilevel), 회색조(gray), 팔레트(palette), 컬러(color) 중 하나로 분류하고
+종류에 맞는 압축 방식으로 PDF 이미지 스트림을 만든다.
+
+    bilevel  1비트 CCITT G4 또는 1비트 Flate (둘 중 작은 쪽)
+    gray     8비트 회색조 Flate, 사진 페이지는 회색조 JPEG
+    palette  256색 이하 인덱스 컬러 Flate
+    color    24비트 Flate, 사진 페이지는 JPEG
+
+무손실 모드에서 사진 페이지는 PNG 예측 필터를 적용한 Flate로 압축한다.
+
+형식 지정 문자열:
+    auto[:Q]  손실 압축 허용 (Q는 JPEG 품질, 기본 80)
+    lossless  픽셀 값이 바뀌지 않는 압축만 사용
+    raw       분석 없이 PyMuPDF 기본 방식(24비트 RGB)으로 삽입
+
+auto와 lossless 뒤에는 쉼표로 구분한 추가 설정을 붙일 수 있다
+(예: 'auto:60,scale=0.85,threshold').
+
+    scale=S    S 비율로 축소하여 저장
+    jpeg       글자 페이지도 JPEG 사용
+    threshold  사진이 아닌 회색조 페이지도 1비트로 저장
+    flate=L    Flate 압축 레벨 (기본 6)
+"""
+
+import io
+import zlib
+import struct
+import hashlib
+import numpy as np
+from PIL import Image, features
+
+
+class EncodedPage:
+    """PDF 이미지 XObject로 바로 기록할 수 있는 압축된 페이지 스트림"""
+
+    def __init__(self, width, height, kind, codec, data, colorspace,
+                 bits_per_component=8, filter_name="FlateDecode", decode_parms=None,
+                 digest=None, display_size=None):
+        """
+        Args:
+            width, height: 픽셀 크기
+            kind: 페이지 분류 ('bilevel', 'gray', 'palette', 'color')
+            codec: 사용한 압축 방식 ('ccitt', 'flate', 'jpeg')
+            data: 압축된 스트림 바이트
+            colorspace: PDF 색 공간 ('/DeviceGray', '/DeviceRGB' 또는 Indexed 배열)
+            bits_per_component: 성분당 비트 수
+            filter_name: PDF 필터 이름
+            decode_parms: DecodeParms 사전 문자열 (없으면 None)
+            digest: 원본 픽셀 데이터의 내용 해시 (중복 페이지 판별용)
+            display_size: 페이지 크기 계산에 사용할 원본 픽셀 크기 (None이면 width, height)
+        """
+        self.width = width
+        self.height = height
+        self.kind = kind
+        self.codec = codec
+        self.data = data
+        self.colorspace = colorspace
+        self.bits_per_component = bits_per_component
+        self.filter_name = filter_name
+        self.decode_parms = decode_parms
+        self.digest = digest
+        self.display_size = display_size
+
+    @property
+    def size(self):
+        """페이지 크기 계산에 사용할 (width, height) 튜플 (축소 저장된 경우 원본 크기)"""
+        return self.display_size or (self.width, self.height)
+
+    def image_keys(self):
+        """
+        이미지 XObject 사전에 기록할 키 목록
+
+        Returns:
+            list: (키, PDF 값 문자열) 튜플 리스트
+        """
+        keys = [
+            ('Type', '/XObject'),
+            ('Subtype', '/Image'),
+            ('Width', str(self.width)),
+            ('Height', str(self.height)),
+            ('ColorSpace', self.colorspace),
+            ('BitsPerComponent', str(self.bits_per_component)),
+            ('Filter', f'/{self.filter_name}'),
+        ]
+        if self.decode_parms:
+            keys.append(('DecodeParms', self.decode_parms))
+        return keys
+
+
+class PageCodec:
+    """
+    페이지 분류기 및 인코더
+
+    분석은 NumPy 배열 연산으로 처리하며, 속도를 위해 ANALYSIS_STEP 간격으로
+    표본을 추출한 픽셀만 사용한다 (무손실 모드는 모든 픽셀을 검사).
+    인스턴스는 설정값만 가지므로 워커 스레드에서 공유해도 안전하다.
+    """
+
+    KINDS = ('bilevel', 'gray', 'palette', 'color')
+
+    # 분석에 사용할 픽셀 간격 (가로/세로 모두)
+    ANALYSIS_STEP = 2
+
+    # 채널 간 차이가 이 값보다 큰 픽셀은 유채색으로 본다
+    CHROMA_TOLERANCE = 24
+    # 유채색 픽셀 비율이 이 값 이하면 회색조 페이지
+    COLOR_PIXEL_RATIO = 0.001
+
+    # 중간 밝기(MIDTONE_RANGE) 픽셀 비율이 이 값 이하면 흑백 페이지 (손실 모드)
+    MIDTONE_RANGE = (64, 192)
+    BILEVEL_MIDTONE_RATIO = 0.01
+
+    # 양 끝 밝기(EXTREME_MARGIN 이내) 픽셀 비율이 이 값보다 낮으면 사진 페이지
+    EXTREME_MARGIN = 32
+    TEXT_EXTREME_RATIO = 0.85
+
+    # 흑백 변환 임계값
+    BILEVEL_THRESHOLD = 128
+
+    # 기본 JPEG 품질과 Flate 압축 레벨
+    DEFAULT_JPEG_QUALITY = 80
+    DEFAULT_FLATE_LEVEL = 6
+
+    def __init__(self, lossless=False, jpeg_quality=DEFAULT_JPEG_QUALITY,
+                 flate_level=DEFAULT_FLATE_LEVEL, scale=1.0,
+                 prefer_jpeg=False, threshold_text=False):
+        """
+        Args:
+            lossless: True면 픽셀 값이 바뀌는 변환(JPEG, 흑백 임계 처리, 축소)을 사용하지 않음
+            jpeg_quality: 사진 페이지의 JPEG 품질 (1~95)
+            flate_level: Flate(zlib) 압축 레벨
+            scale: 1보다 작으면 이 비율로 축소하여 저장 (PDF 페이지 크기는 그대로)
+            prefer_jpeg: True면 흑백/팔레트가 아닌 페이지는 사진이 아니어도 JPEG 사용
+            threshold_text: True면 사진이 아닌 회색조 페이지도 임계 처리하여 1비트로 저장
+        """
+        self.lossless = lossless
+        self.jpeg_quality = jpeg_quality
+        self.flate_level = flate_level
+        self.scale = 1.0 if lossless else scale
+        self.prefer_jpeg = prefer_jpeg and not lossless
+        self.threshold_text = threshold_text and not lossless
+
+    def __eq__(self, other):
+        if not isinstance(other, PageCodec):
+            return NotImplemented
+        return self.spec == other.spec
+
+    def __hash__(self):
+        return hash(self.spec)
+
+    def __repr__(self):
+        return f"PageCodec({self.spec!r})"
+
+    @property
+    def spec(self):
+        """형식 지정 문자열 (모든 설정 포함, parse()하면 같은 코덱)"""
+        if self.lossless:
+            spec = 'lossless'
+            if self.jpeg_quality != self.DEFAULT_JPEG_QUALITY:
+                spec += f':{self.jpeg_quality}'
+        else:
+            spec = f'auto:{self.jpeg_quality}'
+        options = [spec]
+        if self.scale != 1.0:
+            options.append(f'scale={self.scale!r}')
+        if self.prefer_jpeg:
+            options.append('jpeg')
+        if self.threshold_text:
+            options.append('threshold')
+        if self.flate_level != self.DEFAULT_FLATE_LEVEL:
+            options.append(f'flate={self.flate_level}')
+        return ','.join(options)
+
+    @classmethod
+    def parse(cls, spec):
+        """
+        형식 지정 문자열 해석
+
+        Args:
+            spec: 'auto', 'auto:70', 'auto:60,scale=0.85,threshold', 'lossless', 'raw'
+                (또는 PageCodec 인스턴스, None)
+
+        Returns:
+            PageCodec: 코덱 객체 ('raw'나 None이면 None)
+        """
+        if spec is None or isinstance(spec, PageCodec):
+            return spec
+        name, *options = spec.split(',')
+        name, _, quality = name.partition(':')
+        if name == 'raw' and not options:
+            return None
+        if name not in ('auto', 'lossless'):
+            raise ValueError(f"Unknown page codec: {spec}")
+
+        settings = {'lossless': name == 'lossless'}
+        if quality:
+            settings['jpeg_quality'] = int(quality)
+        for option in options:
+            key, _, value = option.partition('=')
+            if key == 'scale' and value:
+                settings['scale'] = float(value)
+            elif key == 'flate' and value:
+                settings['flate_level'] = int(value)
+            elif key == 'jpeg' and not value:
+                settings['prefer_jpeg'] = True
+            elif key == 'threshold' and not value:
+                settings['threshold_text'] = True
+            else:
+                raise ValueError(f"Unknown page codec option: {option}")
+        return cls(**settings)
+
+    @staticmethod
+    def digest(image):
+        """
+        페이지 픽셀 데이터의 내용 해시
+
+        Args:
+            image: PIL 이미지
+
+        Returns:
+            str: 모드, 크기, 픽셀 바이트로 만든 16바이트 BLAKE2b 해시 (hex)
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{image.mode}{image.size}".encode('ascii'))
+        hasher.update(image.tobytes())
+        return hasher.hexdigest()
+
+    @staticmethod
+    def ccitt_available():
+        """CCITT G4 인코딩(libtiff) 사용 가능 여부"""
+        return features.check('libtiff')
+
+    def classify(self, image):
+        """
+        페이지 종류 판정
+
+        Args:
+            image: PIL 이미지
+
+        Returns:
+            str: 'bilevel', 'gray', 'palette', 'color' 중 하나
+        """
+        if image.mode == '1':
+            return 'bilevel'
+        step = 1 if self.lossless else self.ANALYSIS_STEP
+        rgb = np.asarray(image.convert('RGB'))[::step, ::step]
+
+        # 채널 간 최대 차이로 유채색 픽셀 비율 계산
+        chroma = rgb.max(axis=2) - rgb.min(axis=2)
+        color_ratio = np.count_nonzero(chroma > self.CHROMA_TOLERANCE) / chroma.size
+        if color_ratio > self.COLOR_PIXEL_RATIO or (self.lossless and chroma.any()):
+            if image.getcolors(256) is not None:
+                return 'palette'
+            return 'color'
+
+        gray = rgb[..., 1]
+        histogram = np.bincount(gray.ravel(), minlength=256)
+        if self.lossless:
+            if histogram[1:255].sum() == 0:
+                return 'bilevel'
+            return 'gray'
+
+        low, high = self.MIDTONE_RANGE
+        midtone_ratio = histogram[low:high].sum() / gray.size
+        if midtone_ratio <= self.BILEVEL_MIDTONE_RATIO:
+            return 'bilevel'
+        return 'gray'
+
+    def is_photo(self, image):
+        """
+        연속 계조(사진) 페이지인지 판정 (JPEG 사용 여부 결정)
+
+        글자 페이지는 대부분의 픽셀이 배경색이나 글자색 근처에 모여 있으므로,
+        양 끝 밝기 픽셀 비율이 낮으면 사진으로 본다.
+        """
+        gray = np.asarray(image.convert('L'))[::self.ANALYSIS_STEP, ::self.ANALYSIS_STEP]
+        histogram = np.bincount(gray.ravel(), minlength=256)
+        margin = self.EXTREME_MARGIN
+        extreme = histogram[:margin].sum() + histogram[256 - margin:].sum()
+        return extreme / gray.size < self.TEXT_EXTREME_RATIO
+
+    def encode(self, image, kind=None):
+        """
+        페이지를 분류하고 종류에 맞게 압축
+
+        Args:
+            image: PIL 이미지
+            kind: 지정하면 분류를 건너뛰고 이 종류로 압축
+
+        Returns:
+            EncodedPage: 압축된 페이지 스트림
+        """
+        digest = self.digest(image)
+        display_size = image.size
+        kind = kind or self.classify(image)
+        if kind == 'gray' and self.threshold_text and not self.is_photo(image):
+            kind = 'bilevel'
+
+        if self.scale < 1.0:
+            # 팔레트 페이지는 색이 늘어나지 않도록 최근접 보간으로 축소
+            width = max(1, round(image.width * self.scale))
+            height = max(1, round(image.height * self.scale))
+            resample = Image.Resampling.NEAREST if kind == 'palette' else Image.Resampling.LANCZOS
+            image = image.convert('RGB').resize((width, height), resample)
+
+        if kind == 'bilevel':
+            encoded = self._encode_bilevel(image)
+        elif kind == 'palette':
+            encoded = self._encode_palette(image)
+        else:
+            encoded = self._encode_continuous(image, kind)
+        encoded.digest = digest
+        if image.size != display_size:
+            encoded.display_size = display_size
+        return encoded
+
+    def _encode_continuous(self, image, kind):
+        """회색조/컬러 페이지를 Flate 또는 JPEG로 압축"""
+        mode, colorspace = ('L', '/DeviceGray') if kind == 'gray' else ('RGB', '/DeviceRGB')
+        converted = image.convert(mode)
+        if not self.prefer_jpeg and not self.is_photo(converted):
+            data = zlib.compress(converted.tobytes(), self.flate_level)
+            return EncodedPage(image.width, image.height, kind, 'flate', data, colorspace)
+        if self.lossless:
+            data, decode_parms = self._predicted_flate(converted)
+            return EncodedPage(image.width, image.height, kind, 'flate', data, colorspace,
+                               decode_parms=decode_parms)
+        buffer = io.BytesIO()
+        converted.save(buffer, 'JPEG', quality=self.jpeg_quality, optimize=False)
+        return EncodedPage(image.width, image.height, kind, 'jpeg', buffer.getvalue(),
+                           colorspace, filter_name='DCTDecode')
+
+    def _predicted_flate(self, image):
+        """
+        PNG 예측 필터를 적용한 Flate 스트림 생성
+
+        Pillow의 PNG 인코더로 행별 필터링과 압축을 한 번에 처리한 뒤 IDAT 청크만
+        이어 붙인다. PDF의 FlateDecode는 Predictor 15로 같은 필터를 복원한다.
+
+        Returns:
+            tuple: (스트림 바이트, DecodeParms 문자열)
+        """
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG', compress_level=self.flate_level)
+        png = buffer.getvalue()
+        chunks = []
+        position = 8  # PNG 시그니처
+        while position < len(png):
+            length, chunk_type = struct.unpack_from('>I4s', png, position)
+            if chunk_type == b'IDAT':
+                chunks.append(png[position + 8:position + 8 + length])
+            position += length + 12
+        colors = 3 if image.mode == 'RGB' else 1
+        decode_parms = (f'<</Predictor 15/Colors {colors}/BitsPerComponent 8'
+                        f'/Columns {image.width}>>')
+        return b''.join(chunks), decode_parms
+
+    def _encode_bilevel(self, image):
+        """1비트 CCITT G4와 1비트 Flate 중 작은 쪽으로 압축"""
+        if image.mode == '1':
+            bilevel = image
+        else:
+            threshold = self.BILEVEL_THRESHOLD
+            bilevel = image.convert('L').point(lambda v: 255 if v >= threshold else 0, mode='1')
+        width, height = bilevel.size
+
+        # Pillow의 '1' 모드는 1 = 흰색이므로 DeviceGray 1비트와 그대로 대응
+        best = EncodedPage(width, height, 'bilevel', 'flate',
+                           zlib.compress(bilevel.tobytes(), self.flate_level),
+                           '/DeviceGray', bits_per_component=1)
+
+        ccitt = self._ccitt_g4(bilevel) if self.ccitt_available() else None
+        if ccitt is not None and len(ccitt) < len(best.data):
+            best = EncodedPage(width, height, 'bilevel', 'ccitt', ccitt, '/DeviceGray',
+                               bits_per_component=1, filter_name='CCITTFaxDecode',
+                               decode_parms=(f'<</K -1/Columns {width}/Rows {height}'
+                                             f'/BlackIs1 true>>'))
+        return best
+
+    @staticmethod
+    def _ccitt_g4(bilevel):
+        """
+        1비트 이미지를 CCITT G4로 압축
+
+        libtiff로 단일 스트립 TIFF를 만든 뒤 스트립 데이터만 잘라낸다.
+
+        Returns:
+            bytes: G4 스트림 (실패 시 None)
+        """
+        buffer = io.BytesIO()
+        try:
+            bilevel.save(buffer, 'TIFF', compression='group4', strip_size=2 ** 31 - 1)
+            with Image.open(io.BytesIO(buffer.getvalue())) as tiff:
+                offsets = tiff.tag_v2.get(273)
+                counts = tiff.tag_v2.get(279)
+        except Exception as e:
+            print(f"CCITT encode error: {e}")
+            return None
+        if not offsets or len(offsets) != 1:
+            return None
+        return buffer.getvalue()[offsets[0]:offsets[0] + counts[0]]
+
+    def _encode_palette(self, image):
+        """256색 이하 페이지를 인덱스 컬러 Flate로 압축"""
+        rgb = np.asarray(image.convert('RGB')).astype(np.uint32)
+        packed = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+        colors = image.convert('RGB').getcolors(256)
+
+        # 정렬된 색상 목록에서 각 픽셀의 위치가 곧 팔레트 인덱스 (정확한 매핑)
+        keys = np.array(sorted((r << 16) | (g << 8) | b for _, (r, g, b) in colors),
+                        dtype=np.uint32)
+        indices = np.searchsorted(keys, packed).astype(np.uint8)
+        palette = np.stack([keys >> 16, (keys >> 8) & 0xFF, keys & 0xFF], axis=1)
+        palette = palette.astype(np.uint8).tobytes()
+
+        colorspace = f'[/Indexed /DeviceRGB {len(keys) - 1} <{palette.hex()}>]'
+        data = zlib.compress(indices.tobytes(), self.flate_level)
+        return EncodedPage(image.width, image.height, 'palette', 'flate', data, colorspace)
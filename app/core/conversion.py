@@ -0,0 +1,63 @@
+"""
+PDF 변환 스레드 모듈
+"""
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .converter import PDFConverter
+
+
+class ConvertThread(QThread):
+    """
+    GUI를 멈추지 않도록 백그라운드에서 PDF 변환을 수행하는 스레드
+
+    시그널:
+        progress: PDF에 기록된 페이지 수
+        error: 변환 실패 시 오류 메시지
+        finished: 변환 작업 완료 알림 (성공 여부)
+    """
+    progress = pyqtSignal(int)
+    error = pyqtSignal(str)
+    finished = pyqtSignal(bool)
+
+    def __init__(self, page_count, output_path, input_dir="img", engine="pymupdf",
+                 codec="auto", workers=None, target_bytes=None, processor=None):
+        """
+        Args:
+            page_count: 변환할 페이지 수
+            output_path: 출력 PDF 파일 경로
+            input_dir: 입력 이미지가 저장된 디렉토리
+            engine: PDFConverter 변환 엔진
+            codec: 페이지 코덱 지정 문자열 ('auto', 'lossless', 'raw')
+            workers: 페이지 압축 프로세스 수 (None이면 CPU 수)
+            target_bytes: 목표 PDF 크기 (바이트), 지정하면 코덱 설정을 자동 탐색
+            processor: 압축 전에 적용할 PageProcessor
+        """
+        super().__init__()
+        self.page_count = page_count
+        self.output_path = output_path
+        self.input_dir = input_dir
+        self.engine = engine
+        self.codec = codec
+        self.workers = workers
+        self.target_bytes = target_bytes
+        self.processor = processor
+        self.stats = {}
+
+    def run(self):
+        """PDF 변환 실행"""
+        success = PDFConverter.convert_images_to_pdf(
+            self.page_count,
+            self.output_path,
+            self.input_dir,
+            engine=self.engine,
+            stats=self.stats,
+            progress_callback=self.progress.emit,
+            codec=self.codec,
+            workers=self.workers,
+            target_bytes=self.target_bytes,
+            processor=self.processor
+        )
+        if not success:
+            self.error.emit(self.stats.get('error', '변환할 페이지가 없습니다'))
+        self.finished.emit(success)
@@ -3,62 +3,696 @@ PDF 변환 유틸리티 모듈
 """
 
 import os
+import json
+import time
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import fitz
 from PIL import Image
 
+from .codec import EncodedPage, PageCodec
+from .formats import IntermediateFormat
+from .spool import FrameSpool
+from ..utils.perf import PerfMonitor, PerfRecorder
+
 
 class PDFConverter:
     """PDF 변환기 클래스"""
-    
+
+    # PDF 페이지 크기 계산에 사용하는 해상도
+    DPI = 300.0
+
+    # 스트리밍 변환 시 디스크에 반영하기 전까지 메모리에 쌓아둘 최대 픽셀 데이터 (MB)
+    FLUSH_BUDGET_MB = 128
+
+    # 병렬 압축 시 워커당 동시에 처리 중인 최대 페이지 수
+    PARALLEL_WINDOW = 2
+
+    # 프로세스 풀 워커 안에서 재사용하는 입력 디렉토리별 페이지 읽기 정보
+    _worker_inputs = {}
+
     @staticmethod
-    def convert_images_to_pdf(page_count, output_path, input_dir="img"):
+    def convert_images_to_pdf(page_count, output_path, input_dir="img",
+                              engine="pymupdf", stats=None, progress_callback=None,
+                              codec="auto", workers=None, dedup=True,
+                              target_bytes=None, page_budget=None, processor=None):
         """
         캡처된 이미지들을 하나의 PDF 파일로 변환
-        
+
         Args:
             page_count: 변환할 페이지 수
             output_path: 출력 PDF 파일 경로
-            input_dir: 입력 이미지가 저장된 디렉토리
-            
+            input_dir: 입력 이미지(PNG 또는 프레임 스풀)가 저장된 디렉토리
+            engine: 'pymupdf'(페이지 단위 스트리밍) 또는 'pillow'(전체 로드 후 저장)
+            stats: 전달하면 변환 통계(pages, seconds, pages_per_sec, 변환 구간의 최대
+                메모리 사용량 peak_rss_mb와 시작 대비 증가량 rss_delta_mb,
+                단계별 시간 stages, 코덱별 통계 codecs, 중복 페이지 통계 dedup)를 채움,
+                실패 시 'error' 키에 오류 메시지를 기록
+            progress_callback: 페이지가 기록될 때마다 기록된 페이지 수로 호출되는 함수
+            codec: 페이지 코덱 지정 문자열 ('auto', 'auto:70', 'lossless', 'raw')
+                또는 PageCodec, pymupdf 엔진에서만 사용
+            workers: 페이지 압축 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 압축)
+            dedup: True면 픽셀이 같은 페이지는 이미지 객체 하나를 공유 (pymupdf 엔진)
+            target_bytes: 지정하면 PDF가 이 크기(바이트) 안에 들도록 표본 페이지로
+                코덱 설정을 탐색하여 codec 대신 사용 (결과는 stats['size_optimizer'])
+            page_budget: target_bytes 대신 페이지당 목표 바이트로 탐색
+            processor: 압축 전에 적용할 PageProcessor (페이지 크기는 processor.dpi 기준,
+                설정은 stats['processing']에 기록), 캡처 중 이미 후처리된 입력이면
+                같은 설정일 때 다시 적용하지 않고 다른 설정이면 실패
+
         Returns:
             bool: 변환 성공 여부
         """
+        start = time.perf_counter()
+        perf = PerfRecorder()
+        # 이 변환 구간의 메모리 사용량만 측정 (psutil이 있으면 워커 프로세스 포함)
+        monitor = PerfMonitor()
+        monitor.start()
+        writer_stats = {}
+        optimizer_report = None
+        page_codec = PageCodec.parse(codec)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        # 같은 경로에 새로 캡처한 입력일 수 있으므로 이전에 열어 둔 정보는 버림
+        PDFConverter.release_inputs(input_dir)
         try:
-            images = []
-            for i in range(page_count):
-                image_path = os.path.join(input_dir, f"page_{i+1}.png")
-                if os.path.exists(image_path):
-                    images.append(Image.open(image_path))
-            
-            if not images:
-                return False
-                
-            # 300 DPI 해상도로 PDF 생성
+            # 페이지마다 후처리는 한 번만: 캡처 중 처리된 입력은 기록된 해상도만 사용
+            processed = IntermediateFormat.read_processing(input_dir)
+            if processed is not None and processor:
+                if PDFConverter._describe(processor) != processed['stages']:
+                    raise ValueError("pages were already processed during capture "
+                                     "with different settings")
+                print("캡처 중 이미 후처리된 페이지이므로 다시 처리하지 않습니다")
+                processor = None
+            dpi = (processor.dpi if processor else None) or (processed or {}).get('dpi')
+
+            if processor is not None and processor.needs_fit:
+                # 책 전체에 같은 값을 쓰는 단계(여백 자르기)는 표본 페이지로 먼저 결정
+                with perf.measure('process_fit'):
+                    samples = (PDFConverter.read_page(input_dir, page_index) for page_index in
+                               PDFConverter.sample_indices(page_count, processor.sample_pages))
+                    processor.fit([page for page in samples if page is not None])
+
+            if (target_bytes or page_budget) and engine != "pillow":
+                # optimizer 모듈이 이 모듈을 사용하므로 필요할 때만 import
+                from .optimizer import SizeOptimizer
+                optimizer = SizeOptimizer(target_bytes, page_budget, workers=workers,
+                                          dpi=dpi, processor=processor)
+                with perf.measure('size_search'):
+                    page_codec, optimizer_report = optimizer.search(page_count, input_dir)
+
+            workers = max(1, min(workers, page_count))
+            if page_codec is None or engine == "pillow":
+                workers = 1
+            if engine == "pillow":
+                written = PDFConverter._convert_with_pillow(
+                    page_count, output_path, input_dir, perf, processor, dpi)
+                if progress_callback is not None and written:
+                    progress_callback(written)
+            else:
+                written = PDFConverter._convert_streaming(
+                    page_count, output_path, input_dir, progress_callback, perf,
+                    page_codec, writer_stats, workers, dedup, processor, dpi)
+        except Exception as e:
+            print(f"PDF 변환 중 오류 발생: {e}")
+            if stats is not None:
+                stats['error'] = str(e)
+            return False
+        finally:
+            # 표본 읽기(여백 자르기, 크기 탐색)로 열린 스풀 메모리 맵 해제
+            PDFConverter.release_inputs(input_dir)
+            monitor.stop()
+
+        elapsed = time.perf_counter() - start
+        peak_rss = monitor.peak_mb
+        rss_delta = monitor.delta_mb
+        result = {
+            'engine': engine,
+            'workers': workers,
+            'pages': written,
+            'seconds': round(elapsed, 3),
+            'pages_per_sec': round(written / elapsed, 2) if elapsed > 0 else 0.0,
+            'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+            'rss_delta_mb': round(rss_delta, 1) if rss_delta is not None else None,
+            'stages': perf.summary(),
+        }
+        result.update(writer_stats)
+        if processor:
+            result['processing'] = processor.describe()
+        elif processed is not None:
+            result['processed_at_capture'] = processed['stages']
+        if optimizer_report is not None:
+            achieved = os.path.getsize(output_path) if written else 0
+            optimizer_report['achieved_bytes'] = achieved
+            if target_bytes:
+                optimizer_report['met'] = achieved <= target_bytes
+            else:
+                optimizer_report['met'] = achieved <= page_budget * max(1, written)
+            result['size_optimizer'] = optimizer_report
+        if stats is not None:
+            stats.update(result)
+        if written:
+            print(f"PDF 변환 ({engine}): {written} 페이지, {result['pages_per_sec']} 페이지/초, "
+                  f"peak RSS {result['peak_rss_mb']} MB")
+        return written > 0
+
+    @staticmethod
+    def _convert_with_pillow(page_count, output_path, input_dir, perf, processor=None, dpi=None):
+        """Pillow save_all로 변환 (모든 페이지를 메모리에 유지)"""
+        images = []
+        pages = PDFConverter.iter_pages(page_count, input_dir)
+        if processor:
+            pages = PDFConverter._iter_processed_pages(pages, processor, perf)
+        with perf.measure('open'):
+            for _, page in pages:
+                if page is None:
+                    continue
+                images.append(Image.open(page) if isinstance(page, str) else page)
+
+        if not images:
+            return 0
+
+        # 300 DPI(후처리 단계가 있으면 그 해상도)로 PDF 생성
+        with perf.measure('pdf_save'):
             images[0].save(
                 output_path,
                 save_all=True,
                 append_images=images[1:],
-                resolution=300.0
+                resolution=dpi or PDFConverter.DPI
             )
-            
-            return True
-            
-        except Exception as e:
-            print(f"PDF 변환 중 오류 발생: {e}")
-            return False
-    
+        return len(images)
+
+    @staticmethod
+    def _convert_streaming(page_count, output_path, input_dir, progress_callback=None,
+                           perf=None, codec=None, writer_stats=None, workers=1, dedup=True,
+                           processor=None, dpi=None):
+        """
+        PyMuPDF로 페이지를 하나씩 추가하는 스트리밍 변환
+
+        workers가 2 이상이면 페이지 읽기와 압축을 프로세스 풀에서 처리하고,
+        작성기는 압축된 스트림을 페이지 순서대로 받아 기록만 한다.
+        writer_stats를 전달하면 코덱 통계(codecs)와 중복 페이지 통계(dedup)를 채운다.
+        """
+        writer = IncrementalPDFWriter(output_path, dpi=dpi, on_page=progress_callback,
+                                      perf=perf, codec=codec, dedup=dedup)
+        if workers > 1:
+            pages = PDFConverter._iter_encoded_pages(
+                page_count, input_dir, codec, workers, writer.perf, processor)
+        else:
+            pages = PDFConverter.iter_pages(page_count, input_dir)
+            if processor:
+                pages = PDFConverter._iter_processed_pages(pages, processor, writer.perf)
+        try:
+            for page_index, page in pages:
+                if page is None:
+                    writer.skip_page(page_index)
+                else:
+                    writer.add_page(page_index, page)
+            written = writer.finalize()
+        except Exception:
+            writer.abort()
+            raise
+        if writer_stats is not None:
+            if codec is not None:
+                writer_stats['codecs'] = writer.codec_stats
+            if dedup:
+                writer_stats['dedup'] = writer.dedup_stats
+        return written
+
+    @staticmethod
+    def _describe(processor):
+        """마커 파일에 기록된 형태(JSON)로 맞춘 후처리 설정 목록 (튜플은 리스트로)"""
+        return json.loads(json.dumps(processor.describe()))
+
+    @staticmethod
+    def iter_pages(page_count, input_dir="img"):
+        """
+        입력 디렉토리의 페이지를 순서대로 반환
+
+        프레임 스풀이 있으면 메모리 맵에서 이미지를 읽고, 없으면 작업 디렉토리에
+        기록된 중간 형식의 파일을 읽는다 (PNG/BMP/PPM은 경로, 그 밖의 형식은 이미지).
+
+        Args:
+            page_count: 페이지 수
+            input_dir: 입력 디렉토리
+
+        Yields:
+            tuple: (페이지 번호, 이미지 파일 경로 또는 PIL 이미지, 없는 페이지는 None)
+        """
+        if FrameSpool.exists(input_dir):
+            with FrameSpool.open(input_dir) as spool:
+                for i in range(page_count):
+                    yield i + 1, spool.read_image(i + 1)
+            return
+
+        fmt = IntermediateFormat.read_marker(input_dir)
+        for i in range(page_count):
+            image_path = fmt.page_path(input_dir, i + 1)
+            yield i + 1, fmt.load(image_path) if os.path.exists(image_path) else None
+
+    @staticmethod
+    def _iter_processed_pages(pages, processor, perf):
+        """
+        iter_pages()의 페이지에 후처리 단계 적용
+
+        Yields:
+            tuple: (페이지 번호, 처리된 PIL 이미지, 없는 페이지는 None)
+        """
+        for page_index, page in pages:
+            if page is not None:
+                with perf.measure('process'):
+                    if isinstance(page, str):
+                        with Image.open(page) as img:
+                            page = img.convert("RGB")
+                    page = processor.process(page)
+            yield page_index, page
+
+    @staticmethod
+    def _iter_encoded_pages(page_count, input_dir, codec, workers, perf, processor=None):
+        """
+        프로세스 풀에서 압축한 페이지를 페이지 순서대로 반환
+
+        메모리 사용량이 일정하도록 동시에 처리 중인 페이지 수를
+        workers * PARALLEL_WINDOW로 제한한다.
+
+        Yields:
+            tuple: (페이지 번호, EncodedPage, 없는 페이지는 None)
+        """
+        window = workers * PDFConverter.PARALLEL_WINDOW
+        pending = deque()
+        pool = PDFConverter.process_pool(workers)
+        try:
+            next_page = 1
+            while next_page <= page_count or pending:
+                while next_page <= page_count and len(pending) < window:
+                    future = pool.submit(PDFConverter._encode_page, input_dir, next_page,
+                                         codec, processor)
+                    pending.append((next_page, future))
+                    next_page += 1
+
+                page_index, future = pending.popleft()
+                with perf.measure('encode_wait'):
+                    encoded, seconds = future.result()
+                if encoded is not None:
+                    perf.record('page_encode', seconds)
+                yield page_index, encoded
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def process_pool(workers):
+        """
+        페이지 처리용 프로세스 풀 생성
+
+        fork는 캡처/GUI 스레드가 실행 중인 프로세스의 잠금 상태와 열려 있는 스풀
+        메모리 맵까지 복제하므로, 운영체제와 관계없이 spawn으로 워커를 시작한다.
+
+        Args:
+            workers: 워커 프로세스 수
+
+        Returns:
+            ProcessPoolExecutor: spawn 방식 프로세스 풀
+        """
+        return ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context('spawn'))
+
+    @staticmethod
+    def _encode_page(input_dir, page_index, codec, processor=None):
+        """
+        프로세스 풀 워커: 페이지 한 장을 읽어서 (후처리 후) 압축
+
+        Returns:
+            tuple: (EncodedPage 또는 없는 페이지면 None, 읽기+처리+압축 소요 시간(초))
+        """
+        start = time.perf_counter()
+        page = PDFConverter.read_page(input_dir, page_index)
+        if page is None:
+            return None, 0.0
+        if processor:
+            page = processor.process(page)
+        return codec.encode(page), time.perf_counter() - start
+
+    @staticmethod
+    def sample_indices(page_count, count):
+        """
+        책 전체에 고르게 퍼진 표본 페이지 번호
+
+        Args:
+            page_count: 전체 페이지 수
+            count: 표본 수
+
+        Returns:
+            list: 오름차순 페이지 번호 리스트
+        """
+        count = min(count, page_count)
+        if count <= 0:
+            return []
+        step = page_count / count
+        return sorted({int(step * i + step / 2) + 1 for i in range(count)})
+
+    @staticmethod
+    def count_pages(input_dir="img"):
+        """
+        입력 디렉토리에 저장된 마지막 페이지 번호 (캡처 결과만으로 변환할 때 사용)
+
+        Args:
+            input_dir: 입력 디렉토리 (스풀 또는 중간 형식 파일)
+
+        Returns:
+            int: 가장 큰 페이지 번호 (페이지가 없으면 0)
+        """
+        if FrameSpool.exists(input_dir):
+            with FrameSpool.open(input_dir) as spool:
+                return max(spool.pages, default=0)
+        fmt = IntermediateFormat.read_marker(input_dir)
+        if not os.path.isdir(input_dir):
+            return 0
+        last = 0
+        for name in os.listdir(input_dir):
+            stem, ext = os.path.splitext(name)
+            if ext == fmt.extension and stem.startswith('page_') and stem[5:].isdigit():
+                last = max(last, int(stem[5:]))
+        return last
+
+    @staticmethod
+    def read_page(input_dir, page_index):
+        """
+        입력 디렉토리에서 페이지 한 장을 이미지로 읽기
+
+        프로세스 풀 워커처럼 페이지를 하나씩 따로 읽는 곳에서 사용하며,
+        스풀이나 중간 형식 정보는 프로세스 안에서 한 번만 연다.
+
+        Args:
+            input_dir: 입력 디렉토리
+            page_index: 페이지 번호
+
+        Returns:
+            PIL.Image: 'RGB' 모드 이미지 (없는 페이지면 None)
+        """
+        source = PDFConverter._worker_inputs.get(input_dir)
+        if source is None:
+            if FrameSpool.exists(input_dir):
+                source = FrameSpool.open(input_dir)
+            else:
+                source = IntermediateFormat.read_marker(input_dir)
+            PDFConverter._worker_inputs[input_dir] = source
+
+        if isinstance(source, FrameSpool):
+            return source.read_image(page_index)
+        image_path = source.page_path(input_dir, page_index)
+        if not os.path.exists(image_path):
+            return None
+        page = source.load(image_path)
+        if isinstance(page, str):
+            with Image.open(page) as img:
+                return img.convert("RGB")
+        return page
+
+    @staticmethod
+    def release_inputs(input_dir):
+        """
+        read_page()가 열어 둔 입력 디렉토리 정보 해제
+
+        같은 프로세스에서 여러 작업 디렉토리를 차례로 변환할 때, 삭제된 스풀의
+        메모리 맵이 남아 디스크 공간을 잡고 있거나 다시 캡처한 스풀 대신 이전
+        스풀을 읽지 않도록 사용한다.
+        """
+        source = PDFConverter._worker_inputs.pop(input_dir, None)
+        if isinstance(source, FrameSpool):
+            source.close()
+
+    @staticmethod
+    def render_encoded(encoded, dpi=None):
+        """
+        압축된 페이지를 PDF에 기록했을 때 보이는 모습으로 렌더링 (품질 측정용)
+
+        Args:
+            encoded: EncodedPage
+            dpi: 페이지 크기 계산 해상도 (None이면 PDFConverter.DPI)
+
+        Returns:
+            PIL.Image: 원본 픽셀 크기의 'RGB' 이미지
+        """
+        dpi = dpi or PDFConverter.DPI
+        writer = IncrementalPDFWriter(None, dpi=dpi, dedup=False)
+        try:
+            writer._insert(1, encoded)
+            zoom = dpi / 72
+            pixmap = writer._doc[0].get_pixmap(matrix=fitz.Matrix(zoom, zoom),
+                                               colorspace=fitz.csRGB, alpha=False)
+            return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+        finally:
+            writer.abort()
+
+    @staticmethod
+    def _save_document(doc, output_path, incremental):
+        """문서를 압축 저장 (이미 파일로 저장된 문서는 증분 저장)"""
+        if incremental:
+            doc.save(output_path, incremental=True, deflate=True,
+                     encryption=fitz.PDF_ENCRYPT_KEEP)
+        else:
+            doc.save(output_path, deflate=True)
+
     @staticmethod
     def cleanup_temp_images(page_count, input_dir="img"):
         """
-        임시 이미지 파일들을 정리
-        
+        임시 이미지 파일들을 정리 (프레임 스풀은 파일 삭제 한 번으로 정리)
+
         Args:
             page_count: 정리할 페이지 수
             input_dir: 이미지가 저장된 디렉토리
         """
         try:
+            PDFConverter.release_inputs(input_dir)
+            FrameSpool.discard(input_dir)
+            fmt = IntermediateFormat.read_marker(input_dir)
             for i in range(page_count):
-                image_path = os.path.join(input_dir, f"page_{i+1}.png")
+                image_path = fmt.page_path(input_dir, i + 1)
                 if os.path.exists(image_path):
                     os.remove(image_path)
+            marker_path = os.path.join(input_dir, IntermediateFormat.MARKER_FILE)
+            if os.path.exists(marker_path):
+                os.remove(marker_path)
         except Exception as e:
-            print(f"임시 파일 정리 중 오류 발생: {e}")
\ No newline at end of file
+            print(f"임시 파일 정리 중 오류 발생: {e}")
+
+
+class IncrementalPDFWriter:
+    """
+    페이지가 준비되는 대로 PDF에 추가하는 PyMuPDF 기반 작성기
+
+    여러 인코더 워커가 순서와 상관없이 add_page()를 호출해도 페이지 번호
+    순서대로 문서에 삽입된다. PyMuPDF는 삽입된 이미지를 저장 시점까지
+    비압축 픽셀로 보관하므로, 쌓인 픽셀 데이터가 flush_budget_mb를 넘으면
+    문서를 증분 저장한 뒤 다시 열어서 메모리 사용량을 일정하게 유지한다.
+
+    codec을 지정하면 add_page()를 호출한 스레드에서 페이지를 분석/압축하고,
+    압축된 스트림을 그대로 이미지 XObject로 기록한다.
+
+    dedup이 켜져 있으면 픽셀 데이터 해시가 같은 페이지(빈 페이지, 반복되는
+    장 구분 페이지, 두 번 캡처된 페이지)는 처음 기록한 이미지 객체를 공유한다.
+    """
+
+    def __init__(self, output_path, dpi=None, flush_budget_mb=None, first_page=1,
+                 on_page=None, perf=None, codec=None, dedup=True):
+        """
+        Args:
+            output_path: 출력 PDF 파일 경로
+            dpi: 페이지 크기 계산 해상도 (None이면 PDFConverter.DPI)
+            flush_budget_mb: 증분 저장 전까지 보관할 최대 픽셀 데이터 (MB)
+            first_page: 첫 페이지 번호
+            on_page: 페이지가 삽입될 때마다 기록된 페이지 수로 호출되는 함수
+            perf: 단계별 시간을 기록할 PerfRecorder (page_encode, pdf_insert, pdf_save)
+            codec: 페이지 압축에 사용할 PageCodec (None이면 24비트 RGB로 삽입)
+            dedup: True면 내용이 같은 페이지끼리 이미지 객체 공유
+        """
+        self.output_path = output_path
+        self.dpi = dpi or PDFConverter.DPI
+        budget = flush_budget_mb or PDFConverter.FLUSH_BUDGET_MB
+        self._flush_bytes = budget * 1024 * 1024
+        self._doc = fitz.open()
+        self._closed = False
+        self._saved = False
+        self._pending_bytes = 0
+        self._next_page = first_page
+        self._waiting = {}
+        self._lock = threading.Lock()
+        self.on_page = on_page
+        self.perf = perf or PerfRecorder()
+        self.codec = codec
+        self.codec_stats = {'kinds': {}, 'codecs': {}, 'image_bytes': 0}
+        self.dedup = dedup
+        self.dedup_stats = {'unique_images': 0, 'duplicate_pages': 0, 'saved_bytes': 0,
+                            'duplicates': []}
+        self._images = {}
+        self.written = 0
+
+    def add_page(self, page_index, page):
+        """
+        페이지 이미지 추가 (앞 페이지가 아직 없으면 도착할 때까지 보류)
+
+        Args:
+            page_index: 페이지 번호
+            page: 페이지 이미지 파일 경로, PIL 이미지 또는 EncodedPage
+        """
+        digest = None
+        if self.codec is not None and not isinstance(page, EncodedPage):
+            # 압축은 잠금 밖에서 처리하여 여러 워커가 동시에 압축할 수 있게 함
+            with self.perf.measure('page_encode'):
+                if isinstance(page, str):
+                    with Image.open(page) as img:
+                        page = self.codec.encode(img)
+                else:
+                    page = self.codec.encode(page)
+        if isinstance(page, EncodedPage):
+            digest = page.digest
+        elif self.dedup:
+            with self.perf.measure('page_hash'):
+                if isinstance(page, str):
+                    with Image.open(page) as img:
+                        page = img.convert("RGB")
+                digest = PageCodec.digest(page)
+        with self._lock:
+            self._waiting[page_index] = (page, digest)
+            self._drain()
+
+    def skip_page(self, page_index):
+        """누락된 페이지를 건너뛰도록 표시"""
+        with self._lock:
+            self._waiting[page_index] = None
+            self._drain()
+
+    def finalize(self):
+        """
+        보류 중인 페이지를 모두 삽입하고 문서 저장
+
+        Returns:
+            int: PDF에 기록된 페이지 수
+        """
+        with self._lock:
+            try:
+                # 누락된 번호가 있어도 남은 페이지는 순서대로 기록
+                for page_index in sorted(self._waiting):
+                    page = self._waiting.pop(page_index)
+                    if page is not None:
+                        self._insert(page_index, *page)
+                if self.written:
+                    with self.perf.measure('pdf_save'):
+                        PDFConverter._save_document(self._doc, self.output_path, self._saved)
+            finally:
+                self._close()
+            return self.written
+
+    def abort(self):
+        """저장하지 않고 문서 닫기 (finalize()가 실패한 뒤 호출해도 안전)"""
+        with self._lock:
+            self._waiting.clear()
+            self._close()
+
+    def _close(self):
+        """문서를 한 번만 닫기"""
+        if not self._closed:
+            self._closed = True
+            self._doc.close()
+
+    def _drain(self):
+        """다음 순서의 페이지가 준비되어 있으면 연속으로 삽입"""
+        while self._next_page in self._waiting:
+            page_index = self._next_page
+            page = self._waiting.pop(page_index)
+            self._next_page += 1
+            if page is not None:
+                self._insert(page_index, *page)
+
+    def _insert(self, page_index, image, digest=None):
+        """
+        이미지 한 장(파일 경로, PIL 이미지 또는 EncodedPage)을 새 페이지로 삽입
+
+        Args:
+            page_index: 페이지 번호
+            image: 페이지 이미지
+            digest: 픽셀 데이터 해시 (같은 해시의 이미지가 이미 있으면 그 객체를 공유)
+        """
+        with self.perf.measure('pdf_insert'):
+            if isinstance(image, str):
+                with Image.open(image) as img:
+                    width, height = img.size
+            else:
+                width, height = image.size
+            page = self._doc.new_page(
+                width=width * 72 / self.dpi,
+                height=height * 72 / self.dpi
+            )
+            shared = self._images.get(digest) if self.dedup and digest else None
+            if shared is not None:
+                xref, first_page = shared
+                self._place_image(page, xref)
+            elif isinstance(image, EncodedPage):
+                xref = self._add_image_object(image)
+                self._place_image(page, xref)
+            elif isinstance(image, str):
+                xref = page.insert_image(page.rect, filename=image)
+            else:
+                pixmap = fitz.Pixmap(fitz.csRGB, width, height, image.convert("RGB").tobytes(), False)
+                xref = page.insert_image(page.rect, pixmap=pixmap)
+        self.written += 1
+
+        # 압축된 스트림은 그대로 보관되므로 압축 크기만 반영
+        stored_bytes = len(image.data) if isinstance(image, EncodedPage) else width * height * 3
+        if isinstance(image, EncodedPage):
+            self._count_codec(image, stored=shared is None)
+        if shared is not None:
+            self.dedup_stats['duplicate_pages'] += 1
+            self.dedup_stats['saved_bytes'] += stored_bytes
+            self.dedup_stats['duplicates'].append([page_index, first_page])
+        else:
+            if self.dedup and digest:
+                self._images[digest] = (xref, page_index)
+                self.dedup_stats['unique_images'] += 1
+            self._pending_bytes += stored_bytes
+        if self.on_page is not None:
+            self.on_page(self.written)
+
+        if self._pending_bytes >= self._flush_bytes:
+            with self.perf.measure('pdf_flush'):
+                PDFConverter._save_document(self._doc, self.output_path, self._saved)
+                self._saved = True
+                self._pending_bytes = 0
+                self._doc.close()
+                self._doc = fitz.open(self.output_path)
+
+    def _add_image_object(self, encoded):
+        """
+        압축된 스트림으로 이미지 XObject 생성
+
+        Returns:
+            int: 이미지 객체의 xref
+        """
+        doc = self._doc
+        xref = doc.get_new_xref()
+        doc.update_object(xref, "<<>>")
+        # compress=False: 이미 압축된 스트림을 그대로 기록하고 필터는 직접 지정
+        doc.update_stream(xref, encoded.data, new=True, compress=False)
+        for key, value in encoded.image_keys():
+            doc.xref_set_key(xref, key, value)
+        return xref
+
+    def _place_image(self, page, xref):
+        """이미지 객체(xref)를 페이지 전체 크기로 배치"""
+        doc = self._doc
+        content = f"q {page.rect.width:.4f} 0 0 {page.rect.height:.4f} 0 0 cm /Im0 Do Q"
+        content_xref = doc.get_new_xref()
+        doc.update_object(content_xref, "<<>>")
+        doc.update_stream(content_xref, content.encode('ascii'), new=True)
+        doc.xref_set_key(page.xref, "Resources", f"<</XObject<</Im0 {xref} 0 R>>>>")
+        doc.xref_set_key(page.xref, "Contents", f"{content_xref} 0 R")
+
+    def _count_codec(self, encoded, stored=True):
+        """페이지 종류/코덱별 통계 갱신 (image_bytes는 실제로 기록된 스트림만 합산)"""
+        stats = self.codec_stats
+        stats['kinds'][encoded.kind] = stats['kinds'].get(encoded.kind, 0) + 1
+        stats['codecs'][encoded.codec] = stats['codecs'].get(encoded.codec, 0) + 1
+        if stored:
+            stats['image_bytes'] += len(encoded.data)
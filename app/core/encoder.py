@@ -0,0 +1,160 @@
+"""
+캡처 프레임 인코딩 워커 풀 모듈
+"""
+
+import os
+import queue
+import threading
+
+from .formats import IntermediateFormat
+from .sources import Frame
+from .spool import FrameSpool
+from ..utils.perf import PerfRecorder
+
+
+class FrameEncoderPool:
+    """
+    캡처 스레드와 이미지 인코딩을 분리하는 생산자/소비자 파이프라인
+
+    캡처 스레드는 원본 프레임을 submit()으로 넘기기만 하고, 인코딩과
+    디스크 저장은 워커 스레드들이 처리한다. 큐 크기가 제한되어 있어
+    인코딩이 밀리면 submit()이 블록되므로 메모리 사용량이 일정하게 유지된다.
+
+    intermediate가 'spool'이면 인코딩 없이 메모리 맵 스풀에 원본 프레임을 기록하고,
+    그 밖의 형식(IntermediateFormat)은 페이지별 파일로 저장한다.
+    processor를 지정하면 저장 전에 워커 스레드에서 페이지 후처리를 적용한다.
+    """
+
+    def __init__(self, output_dir, workers=None, max_pending=8, on_encoded=None,
+                 perf=None, intermediate="png", expected_frames=None, processor=None):
+        """
+        Args:
+            output_dir: 인코딩된 이미지를 저장할 디렉토리
+            workers: 인코더 워커 수 (None이면 CPU 수 기반 자동 결정)
+            max_pending: 큐에 대기할 수 있는 최대 프레임 수
+            on_encoded: 페이지 저장 후 워커 스레드에서 호출되는 콜백
+                (page_index, page), page는 이미지 파일 경로 또는 PIL 이미지, 실패 시 None
+            perf: 단계별 시간을 기록할 PerfRecorder (convert, encode, write)
+            intermediate: 중간 저장 형식 지정 문자열 ('spool', 'png:1', 'bmp' 등)
+            expected_frames: 예상 프레임 수 (스풀 크기 확보에 사용)
+            processor: 저장 전에 적용할 PageProcessor (None이면 원본 그대로 저장)
+        """
+        self.output_dir = output_dir
+        self.on_encoded = on_encoded
+        self.perf = perf or PerfRecorder()
+        self.intermediate = intermediate
+        self._format = None if intermediate == "spool" else IntermediateFormat.parse(intermediate)
+        self.expected_frames = expected_frames
+        self.processor = processor
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._threads = []
+        self._errors = []
+        self._lock = threading.Lock()
+        self._spool = None
+        self.encoded_count = 0
+
+    def start(self):
+        """워커 스레드 시작"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.intermediate != "spool":
+            # 이전 세션의 스풀이 남아 있으면 변환기가 잘못 읽지 않도록 삭제
+            FrameSpool.discard(self.output_dir)
+        processing = None
+        if self.processor:
+            processing = {'stages': self.processor.describe(), 'dpi': self.processor.dpi}
+        IntermediateFormat.write_marker(self.output_dir, self.intermediate, processing)
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, page_index, frame):
+        """
+        프레임을 인코딩 큐에 추가 (큐가 가득 차면 대기)
+
+        Args:
+            page_index: 1부터 시작하는 페이지 번호
+            frame: 캡처된 Frame 객체
+        """
+        self._queue.put((page_index, frame))
+
+    def close(self):
+        """
+        남은 프레임을 모두 인코딩하고 워커 종료
+
+        Returns:
+            list: 인코딩 중 발생한 오류 메시지 리스트
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        return list(self._errors)
+
+    def _worker(self):
+        """큐에서 프레임을 꺼내 중간 형식으로 저장"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            page_index, frame = item
+            try:
+                if self.processor:
+                    with self.perf.measure('process'):
+                        frame = Frame.from_image(self.processor.process(frame.to_image()))
+                if self._format is None:
+                    page = self._write_spool(page_index, frame)
+                else:
+                    page = self._write_file(page_index, frame)
+                with self._lock:
+                    self.encoded_count += 1
+            except Exception as e:
+                page = None
+                with self._lock:
+                    self._errors.append(f"page {page_index}: {e}")
+
+            if self.on_encoded is not None:
+                try:
+                    self.on_encoded(page_index, page)
+                except Exception as e:
+                    with self._lock:
+                        self._errors.append(f"page {page_index} callback: {e}")
+
+    def _write_file(self, page_index, frame):
+        """
+        프레임을 중간 형식 파일로 저장
+
+        Returns:
+            str 또는 PIL.Image: 직접 열 수 있는 형식이면 파일 경로, 아니면 변환된 이미지
+        """
+        image_path = self._format.page_path(self.output_dir, page_index)
+        with self.perf.measure('convert'):
+            img = frame.to_image()
+        with self.perf.measure('encode'):
+            data = self._format.encode(img)
+        with self.perf.measure('write'):
+            with open(image_path, 'wb') as f:
+                f.write(data)
+        return image_path if self._format.openable else img
+
+    def _write_spool(self, page_index, frame):
+        """
+        원본 프레임을 스풀에 기록
+
+        Returns:
+            PIL.Image: PDF 작성 콜백이 있으면 변환된 이미지, 없으면 None
+        """
+        with self._lock:
+            if self._spool is None:
+                self._spool = FrameSpool.create(self.output_dir, frame.size, self.expected_frames)
+        with self.perf.measure('write'):
+            self._spool.write(page_index, frame)
+        if self.on_encoded is None:
+            return None
+        with self.perf.measure('convert'):
+            return frame.to_image()
@@ -0,0 +1,257 @@
+"""
+중간 저장 형식 모듈
+
+캡처된 프레임은 PDF로 변환되기 전까지 임시로 저장된다. 이 파일들은 다시
+읽히기만 하므로, 디스크 사용량과 CPU 사용량 사이에서 형식을 고를 수 있다.
+
+형식 지정 문자열:
+    spool   메모리 맵 원본 프레임 스풀 (무압축, 인코딩 없음)
+    png[:N] PNG, N은 compress_level (0~9, 생략 시 Pillow 기본값 6)
+    bmp     무압축 BMP
+    ppm     무압축 PPM
+    zraw[:N] zlib 압축 원본 RGB (N은 압축 레벨, 기본 1)
+    lz4     LZ4 압축 원본 RGB (lz4 패키지가 설치된 경우)
+"""
+
+import io
+import os
+import json
+import time
+import zlib
+import struct
+from PIL import Image
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+class IntermediateFormat:
+    """중간 저장 형식 (인코더/디코더)"""
+
+    # 작업 디렉토리에 기록하는 형식 표시 파일
+    MARKER_FILE = "intermediate.json"
+
+    # 원본 RGB 컨테이너 헤더: 매직, 너비, 높이
+    RAW_HEADER = struct.Struct('<4sII')
+    RAW_MAGIC = b'EBRG'
+
+    EXTENSIONS = {
+        'png': '.png',
+        'bmp': '.bmp',
+        'ppm': '.ppm',
+        'zraw': '.zraw',
+        'lz4': '.lz4raw',
+    }
+
+    def __init__(self, name, level=None):
+        """
+        Args:
+            name: 형식 이름 ('png', 'bmp', 'ppm', 'zraw', 'lz4')
+            level: 압축 레벨 (png, zraw에서 사용)
+        """
+        if name not in self.EXTENSIONS:
+            raise ValueError(f"Unknown intermediate format: {name}")
+        if name == 'lz4' and lz4_frame is None:
+            raise ValueError("lz4 format requires the 'lz4' package")
+        self.name = name
+        self.level = level
+        self.extension = self.EXTENSIONS[name]
+
+    @property
+    def spec(self):
+        """형식 지정 문자열"""
+        return self.name if self.level is None else f"{self.name}:{self.level}"
+
+    @property
+    def openable(self):
+        """PIL/PyMuPDF가 파일을 직접 열 수 있는 형식인지 여부"""
+        return self.name in ('png', 'bmp', 'ppm')
+
+    @classmethod
+    def parse(cls, spec):
+        """
+        형식 지정 문자열 해석
+
+        Args:
+            spec: 'png', 'png:1', 'zraw:3' 등 ('spool'은 FrameSpool이 처리하므로 제외)
+
+        Returns:
+            IntermediateFormat: 형식 객체
+        """
+        name, _, level = spec.partition(':')
+        if level:
+            return cls(name, int(level))
+        if name == 'zraw':
+            return cls(name, 1)
+        return cls(name)
+
+    @classmethod
+    def available(cls):
+        """
+        현재 환경에서 사용 가능한 형식 지정 문자열 목록
+
+        Returns:
+            list: 형식 지정 문자열 리스트
+        """
+        specs = ['spool', 'png:1', 'png', 'bmp', 'ppm', 'zraw:1']
+        if lz4_frame is not None:
+            specs.append('lz4')
+        return specs
+
+    def page_path(self, directory, page_index):
+        """페이지 파일 경로"""
+        return os.path.join(directory, f"page_{page_index}{self.extension}")
+
+    def encode(self, image):
+        """
+        이미지를 형식에 맞게 인코딩
+
+        Args:
+            image: 'RGB' 모드 PIL 이미지
+
+        Returns:
+            bytes: 인코딩된 데이터
+        """
+        if self.name in ('zraw', 'lz4'):
+            header = self.RAW_HEADER.pack(self.RAW_MAGIC, image.width, image.height)
+            pixels = image.tobytes()
+            if self.name == 'zraw':
+                return header + zlib.compress(pixels, self.level)
+            return header + lz4_frame.compress(pixels)
+
+        buffer = io.BytesIO()
+        if self.name == 'png':
+            if self.level is None:
+                image.save(buffer, "PNG")
+            else:
+                image.save(buffer, "PNG", compress_level=self.level)
+        elif self.name == 'bmp':
+            image.save(buffer, "BMP")
+        else:
+            image.save(buffer, "PPM")
+        return buffer.getvalue()
+
+    def decode(self, data):
+        """
+        인코딩된 데이터를 이미지로 복원
+
+        Args:
+            data: encode()가 만든 데이터
+
+        Returns:
+            PIL.Image: 'RGB' 모드 이미지
+        """
+        if self.name in ('zraw', 'lz4'):
+            magic, width, height = self.RAW_HEADER.unpack_from(data)
+            if magic != self.RAW_MAGIC:
+                raise ValueError("Invalid raw frame header")
+            payload = memoryview(data)[self.RAW_HEADER.size:]
+            if self.name == 'zraw':
+                pixels = zlib.decompress(payload)
+            else:
+                pixels = lz4_frame.decompress(payload)
+            return Image.frombytes("RGB", (width, height), pixels)
+
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        return image
+
+    def load(self, path):
+        """
+        페이지 파일 읽기
+
+        Returns:
+            str 또는 PIL.Image: 직접 열 수 있는 형식이면 경로, 아니면 복원된 이미지
+        """
+        if self.openable:
+            return path
+        with open(path, 'rb') as f:
+            return self.decode(f.read())
+
+    @staticmethod
+    def write_marker(directory, spec, processing=None):
+        """
+        작업 디렉토리에 사용 중인 형식 기록
+
+        Args:
+            directory: 작업 디렉토리
+            spec: 형식 지정 문자열
+            processing: 캡처 중 이미 적용한 후처리 {'stages': 단계 설정 목록, 'dpi': 해상도}
+                (변환 단계에서 같은 페이지를 다시 처리하지 않도록 기록)
+        """
+        marker = {'intermediate': spec}
+        if processing is not None:
+            marker['processing'] = processing
+        with open(os.path.join(directory, IntermediateFormat.MARKER_FILE), 'w', encoding='utf-8') as f:
+            json.dump(marker, f)
+
+    @staticmethod
+    def read_processing(directory):
+        """
+        캡처 중 적용된 후처리 기록 읽기
+
+        Returns:
+            dict: {'stages', 'dpi'} (후처리 없이 저장되었으면 None)
+        """
+        path = os.path.join(directory, IntermediateFormat.MARKER_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('processing')
+
+    @staticmethod
+    def read_marker(directory):
+        """
+        작업 디렉토리에 기록된 형식 읽기
+
+        Returns:
+            IntermediateFormat: 기록된 형식 (표시 파일이 없으면 PNG)
+        """
+        path = os.path.join(directory, IntermediateFormat.MARKER_FILE)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                spec = json.load(f).get('intermediate', 'png')
+            if spec != 'spool':
+                return IntermediateFormat.parse(spec)
+        return IntermediateFormat('png')
+
+    @staticmethod
+    def benchmark(images, specs=None):
+        """
+        형식별 인코딩/디코딩 시간과 페이지당 크기 측정
+
+        Args:
+            images: 측정에 사용할 'RGB' PIL 이미지 리스트
+            specs: 측정할 형식 지정 문자열 리스트 (None이면 사용 가능한 전체, spool 제외)
+
+        Returns:
+            list: 형식별 {format, encode_ms, decode_ms, bytes_per_page, ratio} 딕셔너리
+        """
+        specs = specs or [spec for spec in IntermediateFormat.available() if spec != 'spool']
+        raw_bytes = sum(image.width * image.height * 3 for image in images) / max(1, len(images))
+        results = []
+        for spec in specs:
+            fmt = IntermediateFormat.parse(spec)
+            encode_time = decode_time = 0.0
+            total_bytes = 0
+            for image in images:
+                start = time.perf_counter()
+                data = fmt.encode(image)
+                encode_time += time.perf_counter() - start
+                total_bytes += len(data)
+                start = time.perf_counter()
+                fmt.decode(data)
+                decode_time += time.perf_counter() - start
+
+            count = max(1, len(images))
+            bytes_per_page = total_bytes / count
+            results.append({
+                'format': spec,
+                'encode_ms': round(encode_time * 1000 / count, 2),
+                'decode_ms': round(decode_time * 1000 / count, 2),
+                'bytes_per_page': int(bytes_per_page),
+                'ratio': round(bytes_per_page / raw_bytes, 4) if raw_bytes else 0.0,
+            })
+        return results
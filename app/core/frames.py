@@ -0,0 +1,52 @@
+"""
+캡처 프레임 비교 유틸리티 모듈
+"""
+
+from PIL import Image, ImageChops
+
+
+class FrameComparator:
+    """축소 그레이스케일 썸네일 기반 프레임 비교 클래스"""
+
+    # 썸네일 긴 변 길이 (픽셀)
+    SIGNATURE_SIZE = 256
+
+    @staticmethod
+    def signature(frame, size=None):
+        """
+        프레임의 축소 썸네일(시그니처) 생성
+
+        BOX 필터로 축소하므로 안티앨리어싱 노이즈는 평균되어 사라지고,
+        페이지 내용 변화만 남는다. 그레이스케일 변환은 축소 후에 수행하고,
+        프레임의 RGB 이미지는 캐시되어 인코더에서 그대로 재사용된다.
+
+        Args:
+            frame: 캡처된 Frame 객체
+            size: 썸네일 긴 변 길이 (None이면 기본값)
+
+        Returns:
+            PIL.Image: 'L' 모드 썸네일 이미지
+        """
+        size = size or FrameComparator.SIGNATURE_SIZE
+        width, height = frame.size
+        scale = size / max(width, height)
+        thumb_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        thumb = frame.to_image().resize(thumb_size, Image.Resampling.BOX)
+        return thumb.convert("L")
+
+    @staticmethod
+    def differs(sig_a, sig_b, tolerance=2):
+        """
+        두 시그니처가 다른 프레임인지 판정
+
+        Args:
+            sig_a, sig_b: signature()로 만든 썸네일
+            tolerance: 같은 프레임으로 간주할 최대 픽셀 차이 (0~255)
+
+        Returns:
+            bool: 프레임이 다르면 True
+        """
+        if sig_a is None or sig_b is None or sig_a.size != sig_b.size:
+            return True
+        _, max_diff = ImageChops.difference(sig_a, sig_b).getextrema()
+        return max_diff > tolerance
@@ -0,0 +1,586 @@
+"""
+여러 책 일괄 변환 작업 큐 모듈
+
+작업(책 한 권)은 영역 프로필, 페이지 수, 출력 경로, 코덱/후처리 설정을 가지며
+JSON 파일에 저장되므로 프로그램을 다시 실행해도 남은 작업부터 이어서 처리한다.
+
+JobScheduler는 화면 캡처를 현재 스레드에서 한 권씩 실행하고, 캡처가 끝난 책의
+PDF 변환은 프로세스 풀로 넘긴 뒤 바로 다음 책의 캡처를 시작한다. N번째 책을
+변환하는 동안 N+1번째 책을 캡처하므로 캡처 장비가 변환을 기다리며 쉬지 않는다.
+변환 워커 프로세스는 이 모듈을 다시 불러오므로, 캡처에만 쓰는 Qt와 mss는
+캡처할 때 불러온다.
+"""
+
+import os
+import json
+import time
+import shutil
+import threading
+from concurrent.futures import wait, FIRST_COMPLETED
+
+from .converter import PDFConverter
+from .processing import PageProcessor, SpreadSplitter
+from ..utils.perf import PerfRecorder
+
+
+class JobQueue:
+    """
+    JSON 파일에 저장되는 변환 작업 큐
+
+    파일 구조:
+        profiles: 이름별 영역 프로필 (region, monitor, delay 등 캡처 설정)
+        jobs: 작업 리스트 (id, output, profile, settings, status, attempts, history 등)
+
+    작업 설정은 DEFAULTS, 프로필, 작업 자체 설정 순으로 덮어써서 결정한다.
+    상태가 바뀔 때마다 파일을 새로 써서 (임시 파일 후 교체) 중간에 종료되어도
+    마지막 상태가 남는다.
+    """
+
+    # 작업 상태
+    PENDING = 'pending'
+    CAPTURING = 'capturing'
+    CAPTURED = 'captured'
+    CONVERTING = 'converting'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    # 작업 설정 기본값 (키 이름은 명령줄 옵션과 같음)
+    DEFAULTS = {
+        'region': None,
+        'monitor': 0,
+        'pages': None,
+        'delay': 0.5,
+        'start_delay': 0.0,
+        'wait_stable': False,
+        'auto_stop': False,
+        'retry_missed': False,
+        'spread': None,
+        'intermediate': 'spool',
+        'encoder_workers': None,
+        'replay': None,
+        'record': None,
+        'codec': 'auto',
+        'engine': 'pymupdf',
+        'workers': None,
+        'target_mb': None,
+        'no_dedup': False,
+        'keep_temp': False,
+        'paper': None,
+        'dpi': 300.0,
+        'crop': None,
+        'cleanup': False,
+        'threshold': False,
+    }
+
+    # 작업당 기본 최대 시도 횟수 (캡처와 변환 시도를 합친 수)
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, path):
+        """
+        Args:
+            path: 큐 JSON 파일 경로 (없으면 첫 저장 때 생성)
+        """
+        self.path = path
+        self.profiles = {}
+        self.jobs = []
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """파일에서 프로필과 작업 읽기"""
+        with self._lock:
+            if not os.path.exists(self.path):
+                return
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.profiles = data.get('profiles', {})
+            self.jobs = data.get('jobs', [])
+
+    def save(self):
+        """프로필과 작업을 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'profiles': self.profiles, 'jobs': self.jobs}, f,
+                          ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+
+    @staticmethod
+    def check_settings(settings):
+        """알 수 없는 설정 키가 있으면 ValueError"""
+        unknown = sorted(set(settings) - set(JobQueue.DEFAULTS))
+        if unknown:
+            raise ValueError(f"Unknown job settings: {', '.join(unknown)}")
+
+    def set_profile(self, name, settings):
+        """
+        영역 프로필 저장 (같은 이름이 있으면 교체)
+
+        Args:
+            name: 프로필 이름
+            settings: 캡처 설정 딕셔너리 (region, monitor, delay 등)
+        """
+        self.check_settings(settings)
+        with self._lock:
+            self.profiles[name] = dict(settings)
+            self.save()
+
+    def add(self, output, profile=None, name=None, max_attempts=None, **settings):
+        """
+        작업 추가
+
+        Args:
+            output: 출력 PDF 경로
+            profile: 사용할 영역 프로필 이름
+            name: 작업 이름 (None이면 출력 파일 이름)
+            max_attempts: 최대 시도 횟수 (None이면 MAX_ATTEMPTS)
+            **settings: 프로필을 덮어쓸 작업 설정 (pages, codec 등)
+
+        Returns:
+            dict: 추가된 작업
+        """
+        self.check_settings(settings)
+        with self._lock:
+            if profile is not None and profile not in self.profiles:
+                raise ValueError(f"Unknown profile: {profile}")
+            now = time.strftime('%Y-%m-%dT%H:%M:%S')
+            job = {
+                'id': max([job['id'] for job in self.jobs] or [0]) + 1,
+                'name': name or os.path.splitext(os.path.basename(output))[0],
+                'output': output,
+                'profile': profile,
+                'settings': dict(settings),
+                'status': self.PENDING,
+                'attempts': 0,
+                'max_attempts': max_attempts or self.MAX_ATTEMPTS,
+                'pages': 0,
+                'work_dir': None,
+                'error': None,
+                'history': [],
+                'report': None,
+                'created': now,
+                'updated': now,
+            }
+            self.jobs.append(job)
+            self.save()
+            return dict(job)
+
+    def get(self, job_id):
+        """
+        작업 조회
+
+        Returns:
+            dict: 작업 (없으면 None)
+        """
+        with self._lock:
+            for job in self.jobs:
+                if job['id'] == job_id:
+                    return job
+        return None
+
+    def settings_for(self, job):
+        """
+        기본값, 프로필, 작업 설정을 합친 실제 설정
+
+        Returns:
+            dict: DEFAULTS의 모든 키를 가진 설정 딕셔너리
+        """
+        settings = dict(self.DEFAULTS)
+        settings.update(self.profiles.get(job['profile']) or {})
+        settings.update(job['settings'])
+        return settings
+
+    def update(self, job_id, **fields):
+        """
+        작업 필드를 바꾸고 저장
+
+        Returns:
+            dict: 바뀐 작업
+        """
+        with self._lock:
+            job = self.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            job.update(fields)
+            job['updated'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+            self.save()
+            return job
+
+    def next_job(self, status):
+        """
+        해당 상태의 첫 작업 (추가된 순서)
+
+        Returns:
+            dict: 작업 (없으면 None)
+        """
+        with self._lock:
+            for job in self.jobs:
+                if job['status'] == status:
+                    return job
+        return None
+
+    def recover(self):
+        """
+        중간에 종료된 작업 복구
+
+        캡처 중이던 작업은 처음부터 다시 캡처하고, 변환 중이던 작업은 캡처
+        결과가 남아 있으므로 변환만 다시 한다.
+        """
+        with self._lock:
+            for job in self.jobs:
+                if job['status'] == self.CAPTURING:
+                    job['status'] = self.PENDING
+                elif job['status'] == self.CONVERTING:
+                    job['status'] = self.CAPTURED
+            self.save()
+
+    def retry(self, job_ids=None):
+        """
+        실패한 작업을 다시 대기 상태로 (시도 횟수 초기화)
+
+        Args:
+            job_ids: 다시 시도할 작업 번호 리스트 (None이면 실패한 작업 전체)
+
+        Returns:
+            int: 대기 상태로 바꾼 작업 수
+        """
+        count = 0
+        with self._lock:
+            for job in self.jobs:
+                if job['status'] == self.FAILED and (job_ids is None or job['id'] in job_ids):
+                    job.update(status=self.PENDING, attempts=0, error=None)
+                    count += 1
+            self.save()
+        return count
+
+
+class JobScheduler:
+    """
+    캡처와 변환을 겹쳐 실행하는 작업 큐 스케줄러
+
+    캡처는 화면과 키 입력을 쓰므로 한 번에 한 권만 현재 스레드에서 실행하고,
+    변환은 convert_workers개의 프로세스에서 실행한다. 한 번에 변환하는 책은
+    convert_workers권을 넘지 않으며, 캡처가 끝난 책이 변환 자리를 기다리는
+    동안에는 작업 디렉토리가 디스크에 쌓이지 않도록 다음 캡처를 시작하지 않는다.
+
+    실패한 단계는 작업의 max_attempts까지 다시 시도하며 (변환 실패는 캡처
+    결과를 그대로 두고 변환만 다시), 작업이 끝나거나 최종 실패하면 PDF 옆
+    <파일명>.perf.json에 작업 리포트를 저장한다.
+    """
+
+    def __init__(self, queue, convert_workers=1, work_root=None):
+        """
+        Args:
+            queue: JobQueue
+            convert_workers: 동시에 변환할 책 수 (변환 프로세스 수)
+            work_root: 작업별 임시 디렉토리의 상위 디렉토리 (None이면 큐 파일 옆 <이름>_work)
+        """
+        self.queue = queue
+        self.convert_workers = max(1, convert_workers)
+        self.work_root = work_root or os.path.splitext(queue.path)[0] + '_work'
+        self._stop = threading.Event()
+        self._summary = {'done': 0, 'failed': 0}
+
+    def stop(self):
+        """진행 중인 캡처와 변환이 끝나면 새 작업을 시작하지 않고 종료"""
+        self._stop.set()
+
+    def run(self):
+        """
+        대기 중인 작업을 모두 처리
+
+        Returns:
+            dict: {done, failed, seconds} 실행 요약
+        """
+        start = time.perf_counter()
+        self.queue.recover()
+        self._summary = {'done': 0, 'failed': 0}
+        converting = {}
+        with PDFConverter.process_pool(self.convert_workers) as pool:
+            while True:
+                self._collect(converting, block=False)
+                if self._stop.is_set():
+                    if not converting:
+                        break
+                    self._collect(converting, block=True)
+                    continue
+
+                # 캡처가 끝난 작업(이전 실행에서 남은 것, 변환 재시도)을 먼저 변환하되,
+                # 변환 중인 책이 convert_workers권이면 자리가 날 때까지 기다림
+                # (풀에 쌓아 두지 않고, 다음 책 캡처도 시작하지 않음)
+                job = self.queue.next_job(JobQueue.CAPTURED)
+                if job is not None:
+                    if len(converting) >= self.convert_workers:
+                        self._collect(converting, block=True)
+                    else:
+                        self._submit(pool, converting, job)
+                    continue
+
+                job = self.queue.next_job(JobQueue.PENDING)
+                if job is None:
+                    if not converting:
+                        break
+                    self._collect(converting, block=True)
+                    continue
+
+                self._capture(job)
+
+        summary = dict(self._summary)
+        summary['seconds'] = round(time.perf_counter() - start, 3)
+        return summary
+
+    def _capture(self, job):
+        """작업 하나를 캡처 (현재 스레드)"""
+        job_id = job['id']
+        work_dir = job['work_dir'] or os.path.join(self.work_root, f"job_{job_id}")
+        job = self.queue.update(job_id, status=JobQueue.CAPTURING, work_dir=work_dir,
+                                attempts=job['attempts'] + 1, error=None)
+        print(f"[job {job_id}] {job['name']}: 캡처 시작 ({job['attempts']}번째 시도)")
+
+        started = time.perf_counter()
+        pages = 0
+        try:
+            pages, report = self.capture(self.queue.settings_for(job), work_dir)
+            PerfRecorder.write_report(self._capture_report_path(job_id), report)
+            error = None if pages else "no pages captured"
+        except Exception as e:
+            error = str(e)
+        self._record(job_id, 'capture', started, error)
+
+        if error:
+            self._fail(job_id, 'capture', error)
+            return
+        self.queue.update(job_id, status=JobQueue.CAPTURED, pages=pages)
+        print(f"[job {job_id}] 캡처 완료: {pages} 페이지")
+
+    def _submit(self, pool, converting, job):
+        """캡처가 끝난 작업의 변환을 프로세스 풀에 제출"""
+        job_id = job['id']
+        settings = self.queue.settings_for(job)
+        page_count = job['pages'] or PDFConverter.count_pages(job['work_dir'])
+        if job['history'] and job['history'][-1]['stage'] == 'convert':
+            # 변환만 다시 시도하는 경우도 시도 횟수에 포함
+            job = self.queue.update(job_id, attempts=job['attempts'] + 1)
+        self.queue.update(job_id, status=JobQueue.CONVERTING, pages=page_count)
+
+        # 변환 프로세스 수만큼 나누고 캡처용으로 CPU 하나를 남김
+        workers = settings['workers'] or max(
+            1, ((os.cpu_count() or 2) - 1) // self.convert_workers)
+        target_mb = settings['target_mb']
+        options = {
+            'engine': settings['engine'],
+            'codec': settings['codec'],
+            'workers': workers,
+            'dedup': not settings['no_dedup'],
+            'target_bytes': int(target_mb * 1024 * 1024) if target_mb else None,
+            'keep_temp': settings['keep_temp'],
+        }
+        # 여백 자르기가 없으면 capture()에서 이미 후처리했으므로 변환에는 넘기지 않음
+        processor = self.processor_for(settings) if settings['crop'] else None
+        future = pool.submit(JobScheduler._convert_job, job['output'], job['work_dir'],
+                             page_count, processor, options)
+        converting[future] = (job_id, time.perf_counter())
+        print(f"[job {job_id}] 변환 시작: {page_count} 페이지 -> {job['output']}")
+
+    def _collect(self, converting, block):
+        """
+        끝난 변환 결과 반영
+
+        Args:
+            converting: 제출된 변환 {future: (작업 번호, 시작 시각)}
+            block: True면 변환 하나가 끝날 때까지 대기
+        """
+        if not converting:
+            return
+        if block:
+            finished, _ = wait(list(converting), return_when=FIRST_COMPLETED)
+        else:
+            finished = [future for future in converting if future.done()]
+
+        for future in finished:
+            job_id, started = converting.pop(future)
+            try:
+                success, stats = future.result()
+                error = None if success else stats.get('error', "conversion failed")
+            except Exception as e:
+                stats, error = None, str(e)
+            self._record(job_id, 'convert', started, error)
+
+            if error:
+                self._fail(job_id, 'convert', error, stats)
+                continue
+            self.queue.update(job_id, status=JobQueue.DONE, error=None)
+            self._write_report(job_id, stats)
+            self._summary['done'] += 1
+            print(f"[job {job_id}] 완료: {self.queue.get(job_id)['output']}")
+
+    def _record(self, job_id, stage, started, error):
+        """작업 이력에 단계 결과 추가"""
+        job = self.queue.get(job_id)
+        history = job['history'] + [{
+            'stage': stage,
+            'attempt': job['attempts'],
+            'seconds': round(time.perf_counter() - started, 3),
+            'error': error,
+            'finished': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }]
+        self.queue.update(job_id, history=history)
+
+    def _fail(self, job_id, stage, error, stats=None):
+        """
+        단계 실패 처리: 시도 횟수가 남았으면 다시 대기, 아니면 실패로 기록
+
+        변환 실패는 캡처 결과가 남아 있으므로 변환 단계부터 다시 시도한다.
+        """
+        job = self.queue.get(job_id)
+        print(f"[job {job_id}] {stage} 실패: {error}")
+        if job['attempts'] < job['max_attempts']:
+            retry_status = JobQueue.CAPTURED if stage == 'convert' else JobQueue.PENDING
+            self.queue.update(job_id, status=retry_status, error=error)
+            return
+        self.queue.update(job_id, status=JobQueue.FAILED, error=error)
+        self._write_report(job_id, stats)
+        self._summary['failed'] += 1
+
+    def _write_report(self, job_id, conversion):
+        """PDF 옆 <파일명>.perf.json에 작업 리포트 저장"""
+        job = self.queue.get(job_id)
+        capture = None
+        capture_path = self._capture_report_path(job_id)
+        if os.path.exists(capture_path):
+            with open(capture_path, encoding='utf-8') as f:
+                capture = json.load(f)
+        report = {
+            'job': job_id,
+            'name': job['name'],
+            'output': job['output'],
+            'status': job['status'],
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'attempts': job['attempts'],
+            'history': job['history'],
+            'settings': self.queue.settings_for(job),
+            'capture': capture,
+            'conversion': conversion,
+        }
+        report_path = os.path.splitext(job['output'])[0] + '.perf.json'
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+        if PerfRecorder.write_report(report_path, report):
+            self.queue.update(job_id, report=report_path)
+        if job['status'] == JobQueue.DONE and os.path.exists(capture_path):
+            os.remove(capture_path)
+
+    def _capture_report_path(self, job_id):
+        """작업 디렉토리 밖에 두는 캡처 리포트 경로 (변환 후 작업 디렉토리가 삭제되므로)"""
+        return os.path.join(self.work_root, f"job_{job_id}.capture.json")
+
+    @staticmethod
+    def processor_for(settings):
+        """
+        작업 설정에 맞는 PageProcessor
+
+        'screen' 용지는 캡처 모니터의 배율로 축소한다 (변환 프로세스에서는
+        모니터를 조회하지 않도록 여기서 배율을 정함).
+
+        Returns:
+            PageProcessor: 처리할 것이 없으면 None
+        """
+        paper = settings['paper']
+        scale = None
+        if paper == 'screen':
+            from ..utils.monitor import MonitorManager
+            monitor = MonitorManager.get_monitor(settings['monitor'])
+            scale = monitor.get('scale', 1.0) if monitor else 1.0
+            paper = None
+        return PageProcessor.build(paper=paper, dpi=settings['dpi'], crop=settings['crop'],
+                                   cleanup=settings['cleanup'],
+                                   threshold=settings['threshold'], source_scale=scale)
+
+    @staticmethod
+    def capture(settings, work_dir):
+        """
+        작업 설정으로 CaptureThread를 현재 스레드에서 실행
+
+        GUI와 같이 여백 자르기는 표본 페이지가 필요하므로 변환 단계에서 처리하고,
+        그 밖의 후처리는 캡처 중 인코더 워커에서 적용한다. PDF는 변환 프로세스가
+        작성하므로 캡처 중 PDF 작성은 하지 않는다.
+
+        Args:
+            settings: JobQueue.settings_for()가 돌려준 설정
+            work_dir: 중간 저장 디렉토리
+
+        Returns:
+            tuple: (저장된 페이지 수, 캡처 성능 리포트)
+        """
+        from .capture import CaptureThread
+        from .sources import ReplayFrameSource, ReplayPageTurner
+
+        source = turner = None
+        region = settings['region']
+        monitor = settings['monitor']
+        if settings['replay']:
+            source = ReplayFrameSource(settings['replay'])
+            turner = ReplayPageTurner(source)
+            # 재생 프레임은 영역과 모니터 위치를 쓰지 않음
+            region = region or (0, 0, 0, 0)
+            monitor = {'top': 0, 'left': 0}
+        if region is None:
+            raise ValueError("region is required")
+        if settings['pages'] is None and not settings['auto_stop']:
+            raise ValueError("pages is required unless auto_stop is set")
+        if settings['start_delay']:
+            time.sleep(settings['start_delay'])
+
+        # 이전 시도에서 남은 파일은 버리고 새로 캡처
+        shutil.rmtree(work_dir, ignore_errors=True)
+        spread = settings['spread']
+        thread = CaptureThread(
+            *region, settings['pages'], monitor, settings['delay'],
+            encoder_workers=settings['encoder_workers'],
+            wait_stable=settings['wait_stable'],
+            auto_stop=settings['auto_stop'],
+            retry_missed=settings['retry_missed'],
+            source=source,
+            turner=turner,
+            work_dir=work_dir,
+            intermediate=settings['intermediate'],
+            codec=settings['codec'],
+            processor=None if settings['crop'] else JobScheduler.processor_for(settings),
+            spread=SpreadSplitter(rtl=spread == 'rtl') if spread else None,
+            record_dir=settings['record']
+        )
+        result = {'pages': 0, 'report': None}
+        thread.timings.connect(lambda report: result.update(report=report))
+        thread.pages_captured.connect(lambda count: result.update(pages=count))
+        thread.run()
+        return result['pages'], result['report']
+
+    @staticmethod
+    def _convert_job(output, work_dir, page_count, processor, options):
+        """
+        프로세스 풀 워커: 작업 디렉토리 하나를 PDF로 변환
+
+        Returns:
+            tuple: (성공 여부, 변환 통계 딕셔너리)
+        """
+        # 같은 디렉토리를 다시 캡처한 경우 이 프로세스에 남은 이전 스풀을 읽지 않도록 해제
+        PDFConverter.release_inputs(work_dir)
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        stats = {}
+        try:
+            success = PDFConverter.convert_images_to_pdf(
+                page_count, output, work_dir,
+                engine=options['engine'],
+                stats=stats,
+                codec=options['codec'],
+                workers=options['workers'],
+                dedup=options['dedup'],
+                target_bytes=options['target_bytes'],
+                processor=processor)
+        finally:
+            PDFConverter.release_inputs(work_dir)
+        if success and not options['keep_temp']:
+            PDFConverter.cleanup_temp_images(page_count, work_dir)
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return success, stats
@@ -0,0 +1,220 @@
+"""
+목표 크기 PDF 최적화 모듈
+
+배포용 PDF는 파일 크기 제한이 있는 경우가 많다. 책 전체를 여러 번 다시
+인코딩하는 대신, 표본 페이지 몇 장으로 품질/해상도 후보별 크기와 화질을
+병렬로 측정하고, 목표 크기 안에 들어가는 후보 중 화질이 가장 좋은 것을 고른다.
+"""
+
+import os
+import math
+import time
+import numpy as np
+
+from .codec import PageCodec
+from .converter import PDFConverter
+
+
+class SizeOptimizer:
+    """
+    목표 파일 크기에 맞는 PageCodec 설정 탐색기
+
+    표본 페이지마다 LADDER의 모든 후보를 프로세스 풀에서 압축하고, PDF로
+    렌더링한 결과와 원본의 PSNR을 계산한다. 글자 페이지는 축소하거나 JPEG로
+    바꾸면 오히려 커지는 경우가 있어 크기가 품질 순서대로 줄지 않으므로,
+    페이지당 평균 크기가 예산 안에 드는 후보 중 평균 PSNR이 가장 높은 것을
+    선택한다 (예산 안에 드는 후보가 없으면 가장 작은 후보).
+    """
+
+    # (JPEG 품질, 저장 배율, 글자 페이지도 JPEG 사용, 글자 페이지 1비트 변환)
+    LADDER = (
+        (90, 1.0, False, False),
+        (75, 1.0, False, False),
+        (60, 1.0, False, False),
+        (75, 1.0, False, True),
+        (60, 0.85, False, True),
+        (50, 0.75, False, True),
+        (60, 0.85, True, False),
+        (50, 0.7, True, False),
+        (40, 0.5, True, False),
+        (40, 0.5, False, True),
+    )
+
+    # 표본 페이지 수
+    SAMPLE_PAGES = 8
+
+    # PDF 구조(페이지 객체, 내용 스트림, 교차 참조)에 드는 페이지당 대략적인 바이트
+    PAGE_OVERHEAD_BYTES = 250
+
+    # 표본 추정 오차를 감안하여 예산의 이 비율까지만 사용
+    SAFETY_MARGIN = 0.9
+
+    def __init__(self, target_bytes=None, page_budget=None, sample_pages=None,
+                 workers=None, dpi=None, processor=None):
+        """
+        Args:
+            target_bytes: 목표 PDF 파일 크기 (바이트)
+            page_budget: 페이지당 목표 바이트 (target_bytes 대신 사용 가능)
+            sample_pages: 표본 페이지 수 (None이면 SAMPLE_PAGES)
+            workers: 탐색 프로세스 수 (None이면 CPU 수)
+            dpi: 페이지 크기 계산 해상도 (None이면 processor.dpi 또는 PDFConverter.DPI)
+            processor: 압축 전에 적용할 PageProcessor (변환과 같은 이미지로 측정)
+        """
+        if not target_bytes and not page_budget:
+            raise ValueError("target_bytes or page_budget is required")
+        self.target_bytes = target_bytes
+        self.page_budget = page_budget
+        self.sample_pages = sample_pages or self.SAMPLE_PAGES
+        self.workers = workers or os.cpu_count() or 1
+        self.processor = processor
+        self.dpi = dpi or (processor.dpi if processor else None) or PDFConverter.DPI
+
+    @staticmethod
+    def codec_for(level):
+        """
+        후보 번호에 해당하는 PageCodec
+
+        Args:
+            level: LADDER 인덱스
+
+        Returns:
+            PageCodec: 해당 후보의 코덱
+        """
+        quality, scale, prefer_jpeg, threshold_text = SizeOptimizer.LADDER[level]
+        return PageCodec(jpeg_quality=quality, scale=scale, prefer_jpeg=prefer_jpeg,
+                         threshold_text=threshold_text)
+
+    def budget_for(self, page_count):
+        """
+        페이지당 이미지 바이트 예산
+
+        Args:
+            page_count: 전체 페이지 수
+
+        Returns:
+            float: 페이지당 사용할 수 있는 이미지 바이트
+        """
+        if self.page_budget:
+            budget = self.page_budget
+        else:
+            budget = self.target_bytes / max(1, page_count) - self.PAGE_OVERHEAD_BYTES
+        return budget * self.SAFETY_MARGIN
+
+    def search(self, page_count, input_dir="img"):
+        """
+        표본 페이지로 후보별 크기/화질을 측정하고 목표에 맞는 후보 선택
+
+        Args:
+            page_count: 전체 페이지 수
+            input_dir: 입력 디렉토리 (스풀 또는 중간 형식 파일)
+
+        Returns:
+            tuple: (선택된 PageCodec, 탐색 리포트 딕셔너리)
+        """
+        start = time.perf_counter()
+        samples = self.pick_samples(page_count, input_dir)
+        if not samples:
+            raise ValueError("No pages to sample")
+
+        tasks = [(page_index, level) for level in range(len(self.LADDER))
+                 for page_index in samples]
+        results = {}
+        workers = max(1, min(self.workers, len(tasks)))
+        if workers > 1:
+            with PDFConverter.process_pool(workers) as pool:
+                futures = [pool.submit(SizeOptimizer._evaluate, input_dir, page_index, level,
+                                       self.dpi, self.processor)
+                           for page_index, level in tasks]
+                for (page_index, level), future in zip(tasks, futures):
+                    results[page_index, level] = future.result()
+        else:
+            for page_index, level in tasks:
+                results[page_index, level] = self._evaluate(input_dir, page_index, level,
+                                                            self.dpi, self.processor)
+
+        budget = self.budget_for(page_count)
+        candidates = []
+        for level, (quality, scale, prefer_jpeg, threshold_text) in enumerate(self.LADDER):
+            sizes = [results[page_index, level][0] for page_index in samples]
+            psnrs = [results[page_index, level][1] for page_index in samples]
+            bytes_per_page = sum(sizes) / len(sizes)
+            candidates.append({
+                'level': level,
+                'jpeg_quality': quality,
+                'scale': scale,
+                'prefer_jpeg': prefer_jpeg,
+                'threshold_text': threshold_text,
+                'bytes_per_page': int(bytes_per_page),
+                'estimated_bytes': int((bytes_per_page + self.PAGE_OVERHEAD_BYTES) * page_count),
+                'mean_psnr_db': round(sum(psnrs) / len(psnrs), 2),
+                'min_psnr_db': round(min(psnrs), 2),
+                'fits': bytes_per_page <= budget,
+            })
+
+        fitting = [c for c in candidates if c['fits']]
+        if fitting:
+            chosen = max(fitting, key=lambda c: (c['mean_psnr_db'], -c['bytes_per_page']))
+        else:
+            chosen = min(candidates, key=lambda c: c['bytes_per_page'])
+        codec = self.codec_for(chosen['level'])
+        report = {
+            'target_bytes': self.target_bytes,
+            'page_budget_bytes': int(budget),
+            'sample_pages': samples,
+            'search_seconds': round(time.perf_counter() - start, 3),
+            'candidates': candidates,
+            'chosen_level': chosen['level'],
+            'chosen_codec': codec.spec,
+            'estimated_bytes': chosen['estimated_bytes'],
+        }
+        return codec, report
+
+    def pick_samples(self, page_count, input_dir):
+        """
+        책 전체에 고르게 퍼진 표본 페이지 선택 (없는 페이지와 중복 페이지 제외)
+
+        Returns:
+            list: 표본 페이지 번호 리스트
+        """
+        samples = []
+        digests = set()
+        for page_index in PDFConverter.sample_indices(page_count, self.sample_pages):
+            image = PDFConverter.read_page(input_dir, page_index)
+            if image is None:
+                continue
+            digest = PageCodec.digest(image)
+            if digest not in digests:
+                digests.add(digest)
+                samples.append(page_index)
+        return samples
+
+    @staticmethod
+    def _evaluate(input_dir, page_index, level, dpi, processor=None):
+        """
+        프로세스 풀 워커: 한 페이지를 한 후보 설정으로 압축하고 화질 측정
+
+        Returns:
+            tuple: (압축된 스트림 바이트 수, 원본 대비 PSNR(dB))
+        """
+        image = PDFConverter.read_page(input_dir, page_index)
+        if processor:
+            image = processor.process(image)
+        encoded = SizeOptimizer.codec_for(level).encode(image)
+        rendered = PDFConverter.render_encoded(encoded, dpi)
+        return len(encoded.data), SizeOptimizer.psnr(image, rendered)
+
+    @staticmethod
+    def psnr(original, rendered):
+        """
+        두 이미지의 PSNR (dB, 완전히 같으면 99)
+
+        렌더링 결과가 반올림으로 1픽셀 다를 수 있으므로 겹치는 영역만 비교한다.
+        """
+        a = np.asarray(original.convert('RGB'), dtype=np.float32)
+        b = np.asarray(rendered.convert('RGB'), dtype=np.float32)
+        height = min(a.shape[0], b.shape[0])
+        width = min(a.shape[1], b.shape[1])
+        mse = np.mean((a[:height, :width] - b[:height, :width]) ** 2)
+        if mse == 0:
+            return 99.0
+        return min(99.0, 10 * math.log10(255.0 ** 2 / mse))
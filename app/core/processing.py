@@ -0,0 +1,830 @@
+"""
+페이지 후처리 모듈
+
+캡처된 페이지 이미지를 중간 저장이나 PDF 압축 전에 변환하는 단계들을 제공한다.
+PageProcessor는 단계들을 순서대로 적용하며, 설정값만 가지므로 인코더 워커
+스레드나 변환 프로세스 풀로 그대로 넘길 수 있다. 책 전체에 같은 값을 쓰는
+단계(여백 자르기)는 처리 전에 표본 페이지로 fit()을 한 번 호출해야 한다.
+
+모든 단계는 'RGB' 이미지를 받아 'RGB' 이미지를 돌려준다.
+"""
+
+import time
+import numpy as np
+from PIL import Image
+
+from .codec import PageCodec
+
+
+def _longest_run(flags):
+    """
+    True가 연속된 가장 긴 구간
+
+    Returns:
+        tuple: (시작, 끝) 인덱스 (끝은 포함하지 않음, 없으면 None)
+    """
+    padded = np.concatenate(([0], flags.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[::2], edges[1::2]
+    if not len(starts):
+        return None
+    longest = int(np.argmax(ends - starts))
+    return int(starts[longest]), int(ends[longest])
+
+
+def _histogram_percentile(histogram, percent):
+    """256단계 히스토그램에서 백분위 값 계산"""
+    cumulative = np.cumsum(histogram)
+    return int(np.searchsorted(cumulative, cumulative[-1] * percent / 100.0))
+
+
+class ResampleStage:
+    """
+    목표 DPI/용지 크기에 맞춘 해상도 축소 단계
+
+    Retina/4K 화면에서는 mss가 2배 크기의 장치 픽셀을 돌려주므로, 용지 크기와
+    목표 DPI로 필요한 픽셀 수를 계산하여 그 안에 들어가도록 축소한다.
+    확대는 하지 않으므로 원본이 더 작으면 그대로 두며, 이 경우 PDF 페이지는
+    용지보다 작아진다.
+    """
+
+    # 용지 크기 (mm, 세로 방향)
+    PAPER_SIZES_MM = {
+        'A4': (210.0, 297.0),
+        'A5': (148.0, 210.0),
+        'A6': (105.0, 148.0),
+        'B5': (176.0, 250.0),
+        'B6': (125.0, 176.0),
+        'Letter': (215.9, 279.4),
+        'Legal': (215.9, 355.6),
+    }
+
+    # 큰 배율로 줄일 때 먼저 정수배 박스 축소를 하여 LANCZOS 계산량을 줄임
+    REDUCING_GAP = 3.0
+
+    def __init__(self, dpi=300.0, paper=None, source_scale=None):
+        """
+        Args:
+            dpi: 목표 해상도 (PDF 페이지 크기 계산에도 사용)
+            paper: 용지 이름('A5' 등) 또는 'WxH' mm 문자열, (w, h) mm 튜플
+            source_scale: 화면 배율 (예: Retina 2.0), 용지 없이 배율만큼 축소할 때 사용
+        """
+        self.dpi = dpi
+        self.paper = paper
+        self.paper_mm = self.parse_paper(paper) if paper else None
+        self.source_scale = source_scale
+
+    @staticmethod
+    def parse_paper(paper):
+        """
+        용지 크기 해석
+
+        Args:
+            paper: 'A4', 'B6', '148x210' 또는 (w, h) 튜플
+
+        Returns:
+            tuple: (너비, 높이) mm
+        """
+        if isinstance(paper, (tuple, list)):
+            return float(paper[0]), float(paper[1])
+        for name, size in ResampleStage.PAPER_SIZES_MM.items():
+            if name.lower() == paper.lower():
+                return size
+        width, sep, height = paper.lower().partition('x')
+        if not sep:
+            raise ValueError(f"Unknown paper size: {paper}")
+        return float(width), float(height)
+
+    def target_size(self, size):
+        """
+        축소 후 픽셀 크기
+
+        Args:
+            size: 원본 (width, height)
+
+        Returns:
+            tuple: 목표 (width, height) (축소가 필요 없으면 원본 크기)
+        """
+        width, height = size
+        if self.paper_mm is not None:
+            paper_w, paper_h = self.paper_mm
+            # 가로로 긴 페이지는 용지도 가로 방향으로 맞춤
+            if (width > height) != (paper_w > paper_h):
+                paper_w, paper_h = paper_h, paper_w
+            factor = min(paper_w / 25.4 * self.dpi / width,
+                         paper_h / 25.4 * self.dpi / height)
+        elif self.source_scale:
+            factor = 1.0 / self.source_scale
+        else:
+            return size
+        target = max(1, round(width * factor)), max(1, round(height * factor))
+        # 반올림 오차로 1픽셀만 줄어드는 축소는 화질만 잃으므로 하지 않음
+        if factor >= 1.0 or (width - target[0] <= 1 and height - target[1] <= 1):
+            return size
+        return target
+
+    def process(self, image):
+        """
+        이미지 축소
+
+        Args:
+            image: PIL 이미지
+
+        Returns:
+            PIL.Image: 축소된 이미지 (필요 없으면 원본)
+        """
+        size = self.target_size(image.size)
+        if size == image.size:
+            return image
+        return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=self.REDUCING_GAP)
+
+    def describe(self):
+        """리포트용 설정 딕셔너리"""
+        return {'stage': 'resample', 'dpi': self.dpi, 'paper': self.paper,
+                'source_scale': self.source_scale}
+
+
+class CropStage:
+    """
+    여백/테두리 자동 자르기 단계
+
+    선택한 캡처 영역에는 보통 뷰어 메뉴, 페이지 그림자, 넓은 여백이 포함된다.
+    가운데 영역의 가장 흔한 색을 종이 색으로 보고, 행/열 투영으로 종이 비율이
+    높은 가장 긴 구간을 페이지 영역으로 찾은 뒤, 그 안에서 종이 색이 아닌
+    픽셀(글자, 그림)이 있는 행/열의 경계에 margin을 더해 자른다.
+
+    기본값은 표본 페이지들의 내용 영역을 합친 하나의 영역으로 책 전체를
+    자르며(fit() 필요), per_page가 True면 페이지마다 따로 찾는다.
+    페이지별 자르기는 페이지 크기가 달라지므로 프레임 스풀과 함께 쓸 수 없다.
+    """
+
+    ANALYSIS_STEP = 2
+
+    # 종이 색과 채널별 차이가 이 값 이내인 픽셀을 종이로 판정
+    BACKGROUND_TOLERANCE = 24
+
+    # 종이 픽셀 비율이 이 값 이상인 행/열을 페이지 영역으로 판정
+    PAGE_RATIO = 0.2
+
+    # 페이지 폭(높이) 대비 이 비율 이상의 내용 픽셀이 있는 행(열)을 내용으로 판정
+    MIN_INK_RATIO = 0.002
+
+    # fit()에 사용할 표본 페이지 수
+    SAMPLE_PAGES = 12
+
+    def __init__(self, per_page=False, margin=16, box=None):
+        """
+        Args:
+            per_page: True면 페이지마다 내용 영역을 따로 찾음
+            margin: 내용 영역 바깥에 남길 여백 (픽셀)
+            box: 책 전체에 적용할 (left, top, right, bottom), None이면 fit()으로 결정
+        """
+        self.per_page = per_page
+        self.margin = margin
+        self.box = tuple(box) if box else None
+
+    @property
+    def needs_fit(self):
+        """처리 전에 fit()이 필요한지 여부"""
+        return not self.per_page and self.box is None
+
+    @property
+    def variable_size(self):
+        """페이지마다 출력 크기가 달라질 수 있는지 여부"""
+        return self.per_page
+
+    def detect(self, image):
+        """
+        페이지 영역과 내용 영역 찾기
+
+        Args:
+            image: 'RGB' PIL 이미지
+
+        Returns:
+            tuple: (페이지 영역, 여백을 더한 내용 영역) 각각 (left, top, right, bottom),
+                페이지를 찾지 못하면 None, 빈 페이지면 내용 영역이 None
+        """
+        step = self.ANALYSIS_STEP
+        rgb = np.asarray(image)[::step, ::step]
+        height, width = rgb.shape[:2]
+        if not height or not width:
+            return None
+
+        # 종이 색: 가운데 영역에서 가장 흔한 색 (16단계 양자화)
+        center = rgb[height // 4:height - height // 4, width // 4:width - width // 4]
+        packed = self._pack(center)
+        mode = int(np.argmax(np.bincount(packed.ravel(), minlength=4096)))
+        background = center[packed == mode].mean(axis=0)
+        paper = self._paper_mask(rgb, background)
+
+        rows = _longest_run(paper.mean(axis=1) >= self.PAGE_RATIO)
+        if rows is None:
+            return None
+        top, bottom = rows
+        cols = _longest_run(paper[top:bottom].mean(axis=0) >= self.PAGE_RATIO)
+        if cols is None:
+            return None
+        left, right = cols
+        page_box = self._scale_box((left, top, right, bottom), image.size)
+
+        ink = ~paper[top:bottom, left:right]
+        ink_rows = np.flatnonzero(ink.sum(axis=1) >= max(1, self.MIN_INK_RATIO * ink.shape[1]))
+        ink_cols = np.flatnonzero(ink.sum(axis=0) >= max(1, self.MIN_INK_RATIO * ink.shape[0]))
+        if not len(ink_rows) or not len(ink_cols):
+            return page_box, None
+        content = self._scale_box((left + ink_cols[0], top + ink_rows[0],
+                                   left + ink_cols[-1] + 1, top + ink_rows[-1] + 1), image.size)
+        content_box = (max(page_box[0], content[0] - self.margin),
+                       max(page_box[1], content[1] - self.margin),
+                       min(page_box[2], content[2] + self.margin),
+                       min(page_box[3], content[3] + self.margin))
+        return page_box, content_box
+
+    @classmethod
+    def page_at(cls, pixels, x, y, window=30):
+        """
+        클릭한 위치를 포함하는 페이지 영역 찾기 (좌표 선택 화면의 한 번 클릭 감지용)
+
+        클릭 주변에서 가장 흔한 색을 종이 색으로 보고, 클릭한 행/열을 포함하는
+        종이 비율이 높은 구간을 찾는다. 처음에는 클릭 주변 열만 보고 행 구간을
+        찾은 뒤 열 구간, 다시 행 구간 순서로 좁혀서 화면에서 페이지가 좁게
+        보여도 찾을 수 있게 한다.
+
+        Args:
+            pixels: (height, width, 3 이상) uint8 배열 (채널 순서 무관)
+            x, y: 클릭 위치 (픽셀)
+            window: 종이 색을 추정할 클릭 주변 반경 (픽셀)
+
+        Returns:
+            tuple: (left, top, right, bottom), 찾지 못하면 None
+        """
+        rgb = pixels[..., :3]
+        height, width = rgb.shape[:2]
+        if not (0 <= x < width and 0 <= y < height):
+            return None
+        around = rgb[max(0, y - window):y + window + 1, max(0, x - window):x + window + 1]
+        packed = cls._pack(around)
+        mode = int(np.argmax(np.bincount(packed.ravel(), minlength=4096)))
+        background = around[packed == mode].mean(axis=0)
+        paper = cls._paper_mask(rgb, background)
+
+        def run_containing(flags, index):
+            # index가 속한 True 구간 (index 자체가 False면 None)
+            if not flags[index]:
+                return None
+            breaks = np.flatnonzero(~flags)
+            before = breaks[breaks < index]
+            after = breaks[breaks > index]
+            return (int(before[-1]) + 1 if len(before) else 0,
+                    int(after[0]) if len(after) else len(flags))
+
+        left, right = max(0, x - width // 8), min(width, x + width // 8 + 1)
+        top, bottom = 0, height
+        for _ in range(2):
+            rows = run_containing(paper[:, left:right].mean(axis=1) >= cls.PAGE_RATIO, y)
+            if rows is None:
+                return None
+            top, bottom = rows
+            cols = run_containing(paper[top:bottom].mean(axis=0) >= cls.PAGE_RATIO, x)
+            if cols is None:
+                return None
+            left, right = cols
+        return left, top, right, bottom
+
+    @classmethod
+    def _paper_mask(cls, rgb, background):
+        """
+        종이 색과 채널별 차이가 BACKGROUND_TOLERANCE 이내인 픽셀 마스크
+
+        채널마다 256단계 판정표를 만들어 인덱싱하므로 큰 정수 배열을 만들지 않는다.
+        """
+        levels = np.arange(256)
+        mask = None
+        for c in range(3):
+            table = np.abs(levels - background[c]) <= cls.BACKGROUND_TOLERANCE
+            channel = table[rgb[..., c]]
+            mask = channel if mask is None else mask & channel
+        return mask
+
+    @staticmethod
+    def _pack(rgb):
+        """채널별 상위 4비트를 12비트 색 번호로 묶음"""
+        quantized = (rgb >> 4).astype(np.int32)
+        return (quantized[..., 0] << 8) | (quantized[..., 1] << 4) | quantized[..., 2]
+
+    def _scale_box(self, box, size):
+        """표본 좌표의 영역을 원본 픽셀 좌표로 변환"""
+        step = self.ANALYSIS_STEP
+        left, top, right, bottom = (int(v) * step for v in box)
+        return left, top, min(size[0], right), min(size[1], bottom)
+
+    def fit(self, images):
+        """
+        표본 페이지들의 내용 영역을 합쳐서 책 전체에 적용할 영역 결정
+
+        페이지를 찾지 못한 표본(전면 사진 등)과 빈 페이지는 제외하며,
+        남는 표본이 없으면 자르지 않는다.
+
+        Args:
+            images: 표본 'RGB' PIL 이미지 리스트
+        """
+        boxes = []
+        for image in images:
+            detected = self.detect(image)
+            if detected is not None and detected[1] is not None:
+                boxes.append(detected[1])
+        if boxes:
+            self.box = (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                        max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+    def process(self, image):
+        """
+        여백 자르기
+
+        Args:
+            image: 'RGB' PIL 이미지
+
+        Returns:
+            PIL.Image: 잘라낸 이미지 (자를 영역이 없으면 원본)
+        """
+        if self.per_page:
+            detected = self.detect(image)
+            if detected is None:
+                return image
+            box = detected[1] or detected[0]
+        else:
+            box = self.box
+            if box is None:
+                return image
+            box = (box[0], box[1], min(image.width, box[2]), min(image.height, box[3]))
+        if box == (0, 0, image.width, image.height):
+            return image
+        return image.crop(box)
+
+    def describe(self):
+        """리포트용 설정 딕셔너리"""
+        return {'stage': 'crop', 'per_page': self.per_page, 'margin': self.margin,
+                'box': list(self.box) if self.box else None}
+
+
+class SpreadSplitter:
+    """
+    두 쪽 펼침 화면 분할
+
+    한 번의 캡처에 두 페이지가 함께 보이는 뷰어에서 캡처 프레임을 왼쪽/오른쪽
+    페이지로 나누고, 읽는 순서(rtl이면 오른쪽 페이지 먼저)대로 돌려준다.
+    gutter가 'auto'면 가운데 근처에서 열별 밝기 표준편차가 가장 낮은 값에 가까운
+    열들 중 가장 길게 이어진 구간(글자가 없는 안쪽 여백이나 접힌 선)의 중앙을
+    분할 위치로 사용한다.
+    """
+
+    # 가운데에서 좌우로 폭의 이 비율 안에서만 분할 위치를 찾음
+    SEARCH_RATIO = 0.15
+
+    ANALYSIS_STEP = 4
+
+    # 열별 표준편차를 폭의 이 비율 크기 창으로 평활화
+    SMOOTH_RATIO = 0.005
+
+    # 최솟값에서 (중앙값 - 최솟값)의 이 비율 이내인 열을 같은 안쪽 여백 구간으로 봄
+    GUTTER_TOLERANCE = 0.1
+
+    def __init__(self, gutter='auto', rtl=False):
+        """
+        Args:
+            gutter: 'auto'(자동 탐색), 'center'(정확히 절반) 또는 폭 대비 위치(0~1)
+            rtl: True면 오른쪽 페이지를 먼저 내보냄 (오른쪽에서 왼쪽으로 읽는 책)
+        """
+        if gutter not in ('auto', 'center') and not 0.0 < float(gutter) < 1.0:
+            raise ValueError(f"Invalid gutter position: {gutter}")
+        self.gutter = gutter
+        self.rtl = rtl
+
+    @property
+    def variable_size(self):
+        """두 페이지의 크기가 다를 수 있는지 여부 ('center'만 같은 크기 보장)"""
+        return self.gutter != 'center'
+
+    def find_gutter(self, pixels):
+        """
+        분할 위치 찾기
+
+        Args:
+            pixels: (height, width, 채널) uint8 배열 (RGB 또는 BGRA, 1번 채널 사용)
+
+        Returns:
+            int: 분할 열 위치
+        """
+        width = pixels.shape[1]
+        if self.gutter == 'center':
+            return width // 2
+        if self.gutter != 'auto':
+            return int(round(width * float(self.gutter)))
+
+        start = int(width * (0.5 - self.SEARCH_RATIO))
+        end = int(width * (0.5 + self.SEARCH_RATIO)) + 1
+        band = pixels[::self.ANALYSIS_STEP, start:end, 1].astype(np.float32)
+        profile = band.std(axis=0)
+        window = max(1, int(width * self.SMOOTH_RATIO))
+        if window > 1:
+            profile = np.convolve(profile, np.ones(window) / window, mode='same')
+
+        lowest = profile.min()
+        limit = lowest + (np.median(profile) - lowest) * self.GUTTER_TOLERANCE
+        run_start, run_end = _longest_run(profile <= limit)
+        return start + (run_start + run_end) // 2
+
+    def _boxes(self, size, gutter):
+        """읽는 순서대로 정렬된 두 페이지 영역"""
+        width, height = size
+        if self.gutter == 'center':
+            half = width // 2
+            boxes = [(0, 0, half, height), (half, 0, half * 2, height)]
+        else:
+            boxes = [(0, 0, gutter, height), (gutter, 0, width, height)]
+        return boxes[::-1] if self.rtl else boxes
+
+    def split_frame(self, frame):
+        """
+        캡처 프레임을 두 페이지 프레임으로 분할 (PIL 변환 없이 원본 버퍼에서 처리)
+
+        Args:
+            frame: 캡처된 Frame
+
+        Returns:
+            list: 읽는 순서대로 정렬된 Frame 두 개
+        """
+        pixels = frame.pixels()
+        gutter = self.find_gutter(pixels)
+        return [frame.crop(box) for box in self._boxes(frame.size, gutter)]
+
+    def split(self, image):
+        """
+        이미지를 두 페이지로 분할
+
+        Args:
+            image: 'RGB' PIL 이미지
+
+        Returns:
+            list: 읽는 순서대로 정렬된 PIL 이미지 두 개
+        """
+        gutter = self.find_gutter(np.asarray(image))
+        return [image.crop(box) for box in self._boxes(image.size, gutter)]
+
+    def describe(self):
+        """리포트용 설정 딕셔너리"""
+        return {'gutter': self.gutter, 'rtl': self.rtl}
+
+
+class WhitenStage:
+    """
+    배경 흰색 처리 단계
+
+    전자책 뷰어의 미색/세피아 배경은 채널 값이 달라 유채색 페이지로 판정되고,
+    배경 잡음 때문에 압축도 잘 되지 않는다. 표본 픽셀의 채널별 백분위로 배경색을
+    추정하고, 배경이 흰색이 되도록 채널별 이득을 곱한 뒤 흰색에 가까운 값은
+    255로 맞춘다. 배경이 어둡거나(다크 모드) 고른 배경이 없는 사진 페이지는
+    그대로 둔다.
+    """
+
+    # 배경색 추정에 사용하는 채널별 백분위와 표본 간격
+    BACKGROUND_PERCENTILE = 90
+    ANALYSIS_STEP = 4
+
+    # 배경색과 채널별 차이가 BACKGROUND_TOLERANCE 이내인 픽셀이 이 비율 미만이면 처리 안 함
+    BACKGROUND_TOLERANCE = 24
+    MIN_BACKGROUND_RATIO = 0.4
+
+    # 배경 밝기(채널 최솟값)가 이 값보다 어두우면 처리 안 함
+    MIN_BACKGROUND_LEVEL = 128
+
+    def __init__(self, white_tolerance=16):
+        """
+        Args:
+            white_tolerance: 이득 적용 후 255 - white_tolerance 이상인 값을 255로 맞춤
+        """
+        self.white_tolerance = white_tolerance
+
+    def background(self, image):
+        """
+        배경색 추정
+
+        Args:
+            image: 'RGB' PIL 이미지
+
+        Returns:
+            numpy.ndarray: 채널별 배경 값 (흰색 처리 대상이 아니면 None)
+        """
+        rgb = np.asarray(image)[::self.ANALYSIS_STEP, ::self.ANALYSIS_STEP].reshape(-1, 3)
+        if not len(rgb):
+            return None
+        background = np.array([
+            _histogram_percentile(np.bincount(rgb[:, c], minlength=256),
+                                  self.BACKGROUND_PERCENTILE)
+            for c in range(3)
+        ])
+        if background.min() < self.MIN_BACKGROUND_LEVEL:
+            return None
+        near = np.all(np.abs(rgb.astype(np.int16) - background) <= self.BACKGROUND_TOLERANCE,
+                      axis=1)
+        if np.count_nonzero(near) / len(near) < self.MIN_BACKGROUND_RATIO:
+            return None
+        return background
+
+    def process(self, image):
+        """
+        배경을 흰색으로 변환
+
+        Args:
+            image: 'RGB' PIL 이미지
+
+        Returns:
+            PIL.Image: 처리된 이미지 (대상이 아니면 원본)
+        """
+        background = self.background(image)
+        if background is None:
+            return image
+        levels = np.arange(256, dtype=np.float32)
+        lut = np.clip(np.rint(levels[None, :] * (255.0 / background[:, None])), 0, 255)
+        lut[lut >= 255 - self.white_tolerance] = 255
+        return image.point(lut.astype(np.uint8).ravel().tolist())
+
+    def describe(self):
+        """리포트용 설정 딕셔너리"""
+        return {'stage': 'whiten', 'white_tolerance': self.white_tolerance}
+
+
+class ContrastStage:
+    """
+    대비 정규화 단계
+
+    밝기 히스토그램의 양 끝 백분위를 0과 255로 늘려서 흐린 글자를 진하게 한다.
+    모든 채널에 같은 변환을 적용하므로 색조는 유지된다.
+    """
+
+    ANALYSIS_STEP = 4
+
+    # 양 끝 값의 차이가 이보다 작으면(빈 페이지 등) 처리 안 함
+    MIN_RANGE = 64
+
+    def __init__(self, low_percent=0.5, high_percent=99.5):
+        """
+        Args:
+            low_percent: 0으로 맞출 어두운 쪽 백분위
+            high_percent: 255로 맞출 밝은 쪽 백분위
+        """
+        self.low_percent = low_percent
+        self.high_percent = high_percent
+
+    def process(self, image):
+        """
+        대비 정규화
+
+        Args:
+            image: 'RGB' PIL 이미지
+
+        Returns:
+            PIL.Image: 처리된 이미지 (대상이 아니면 원본)
+        """
+        gray = np.asarray(image)[::self.ANALYSIS_STEP, ::self.ANALYSIS_STEP, 1]
+        histogram = np.bincount(gray.ravel(), minlength=256)
+        low = _histogram_percentile(histogram, self.low_percent)
+        high = _histogram_percentile(histogram, self.high_percent)
+        if high - low < self.MIN_RANGE or (low == 0 and high == 255):
+            return image
+        levels = np.arange(256, dtype=np.float32)
+        lut = np.clip(np.rint((levels - low) * (255.0 / (high - low))), 0, 255)
+        return image.point(lut.astype(np.uint8).tolist() * 3)
+
+    def describe(self):
+        """리포트용 설정 딕셔너리"""
+        return {'stage': 'contrast', 'low_percent': self.low_percent,
+                'high_percent': self.high_percent}
+
+
+class ThresholdStage:
+    """
+    글자 페이지 흑백 변환 단계
+
+    유채색이 없고 사진이 아닌 페이지를 임계값으로 흑백 변환하여 PDF 압축에서
+    1비트(CCITT G4) 경로를 사용할 수 있게 한다. 임계값을 지정하지 않으면
+    페이지마다 히스토그램에서 Otsu 방법으로 계산한다.
+
+    화면 글꼴의 서브픽셀 렌더링은 글자 가장자리에 색 번짐을 남기므로,
+    유채색 판정은 PageCodec보다 느슨한 기준을 사용한다.
+    """
+
+    ANALYSIS_STEP = 2
+
+    # 채널 간 차이가 CHROMA_TOLERANCE보다 큰 픽셀이 이 비율을 넘으면 컬러 페이지
+    CHROMA_TOLERANCE = 48
+    COLOR_PIXEL_RATIO = 0.01
+
+    def __init__(self, level=None):
+        """
+        Args:
+            level: 고정 임계값 (None이면 페이지별 Otsu 임계값)
+        """
+        self.level = level
+        self._codec = PageCodec()
+
+    @staticmethod
+    def otsu_level(histogram):
+        """
+        클래스 간 분산이 최대인 임계값
+
+        Args:
+            histogram: 256단계 밝기 히스토그램
+
+        Returns:
+            int: 임계값 (이 값보다 밝으면 흰색)
+        """
+        histogram = histogram.astype(np.float64)
+        weight = np.cumsum(histogram)
+        total = weight[-1]
+        mean = np.cumsum(histogram * np.arange(256))
+        background = total - weight
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (mean[-1] * weight - mean * total) ** 2 / (weight * background)
+        variance[~np.isfinite(variance)] = 0
+        return int(np.argmax(variance))
+
+    def process(self, image):
+        """
+        글자 페이지 흑백 변환
+
+        Args:
+            image: 'RGB' PIL 이미지
+
+        Returns:
+            PIL.Image: 흑백(0/255) 'RGB' 이미지 (글자 페이지가 아니면 원본)
+        """
+        rgb = np.asarray(image)
+        sample = rgb[::self.ANALYSIS_STEP, ::self.ANALYSIS_STEP]
+        chroma = sample.max(axis=2) - sample.min(axis=2)
+        color_ratio = np.count_nonzero(chroma > self.CHROMA_TOLERANCE) / max(1, chroma.size)
+        if color_ratio > self.COLOR_PIXEL_RATIO or self._codec.is_photo(image):
+            return image
+        gray = rgb[..., 1]
+        level = self.level
+        if level is None:
+            level = self.otsu_level(np.bincount(gray.ravel(), minlength=256))
+        bilevel = np.where(gray > level, np.uint8(255), np.uint8(0))
+        return Image.fromarray(bilevel, 'L').convert('RGB')
+
+    def describe(self):
+        """리포트용 설정 딕셔너리"""
+        return {'stage': 'threshold', 'level': self.level}
+
+
+class PageProcessor:
+    """페이지 후처리 단계 묶음"""
+
+    def __init__(self, stages=None):
+        """
+        Args:
+            stages: 순서대로 적용할 단계 리스트 (process(image) 메서드를 가진 객체)
+        """
+        self.stages = list(stages or [])
+
+    @classmethod
+    def build(cls, paper=None, dpi=300.0, crop=None, cleanup=False, threshold=False,
+              source_scale=None):
+        """
+        옵션 값으로 후처리 단계 구성 (GUI와 명령줄에서 같은 순서로 사용)
+
+        Args:
+            paper: 용지 이름 또는 'WxH' mm (None이면 용지 맞춤 없음)
+            dpi: 목표 해상도
+            crop: None(자르지 않음), 'book'(책 전체 동일), 'page'(페이지별)
+            cleanup: True면 배경 흰색 보정과 대비 정규화
+            threshold: True면 글자 페이지 흑백 변환
+            source_scale: 용지 대신 화면 배율만큼 축소할 때의 배율 (1 이하면 무시)
+
+        Returns:
+            PageProcessor: 처리할 단계가 없으면 None
+        """
+        if crop not in (None, 'book', 'page'):
+            raise ValueError(f"Unknown crop mode: {crop}")
+        stages = []
+        if crop:
+            stages.append(CropStage(per_page=crop == 'page'))
+        if paper:
+            stages.append(ResampleStage(dpi, paper))
+        elif source_scale and source_scale > 1.0:
+            stages.append(ResampleStage(dpi, source_scale=source_scale))
+        if cleanup:
+            stages += [WhitenStage(), ContrastStage()]
+        if threshold:
+            stages.append(ThresholdStage())
+        return cls(stages) if stages else None
+
+    @property
+    def dpi(self):
+        """단계에서 지정한 PDF 페이지 해상도 (없으면 None)"""
+        for stage in reversed(self.stages):
+            dpi = getattr(stage, 'dpi', None)
+            if dpi:
+                return dpi
+        return None
+
+    def process(self, image):
+        """
+        모든 단계를 순서대로 적용
+
+        Args:
+            image: PIL 이미지
+
+        Returns:
+            PIL.Image: 처리된 이미지
+        """
+        for stage in self.stages:
+            image = stage.process(image)
+        return image
+
+    def describe(self):
+        """
+        리포트용 단계 설정 목록
+
+        Returns:
+            list: 단계별 설정 딕셔너리 리스트
+        """
+        return [stage.describe() for stage in self.stages]
+
+    def __bool__(self):
+        return bool(self.stages)
+
+    @property
+    def needs_fit(self):
+        """fit()이 필요한 단계가 있는지 여부"""
+        return any(getattr(stage, 'needs_fit', False) for stage in self.stages)
+
+    @property
+    def variable_size(self):
+        """페이지마다 출력 크기가 달라질 수 있는지 여부 (프레임 스풀 사용 불가)"""
+        return any(getattr(stage, 'variable_size', False) for stage in self.stages)
+
+    @property
+    def sample_pages(self):
+        """fit()에 사용할 표본 페이지 수"""
+        return max([getattr(stage, 'SAMPLE_PAGES', 0) for stage in self.stages] or [0])
+
+    def fit(self, images):
+        """
+        표본 페이지로 책 전체에 같은 값을 쓰는 단계의 설정 결정
+
+        앞 단계까지 처리한 표본으로 각 단계를 맞추므로 실제 처리 순서와 같은
+        이미지를 보고 결정한다.
+
+        Args:
+            images: 표본 'RGB' PIL 이미지 리스트
+        """
+        images = list(images)
+        for stage in self.stages:
+            if not self.needs_fit:
+                break
+            if getattr(stage, 'needs_fit', False):
+                stage.fit(images)
+            images = [stage.process(image) for image in images]
+
+    def benchmark(self, images):
+        """
+        단계별 처리 시간과 처리량 측정
+
+        각 단계는 앞 단계까지 처리된 이미지를 입력으로 받으므로 실제 파이프라인과
+        같은 조건으로 측정된다.
+
+        Args:
+            images: 측정에 사용할 'RGB' PIL 이미지 리스트
+
+        Returns:
+            list: 단계별 {stage, ms_per_page, mp_per_sec} 딕셔너리 (마지막은 전체 'total')
+        """
+        results = []
+        total_time = 0.0
+        total_pixels = 0
+        for stage in self.stages:
+            elapsed = 0.0
+            pixels = 0
+            outputs = []
+            for image in images:
+                pixels += image.width * image.height
+                start = time.perf_counter()
+                outputs.append(stage.process(image))
+                elapsed += time.perf_counter() - start
+            images = outputs
+            total_time += elapsed
+            total_pixels = total_pixels or pixels
+            results.append(self._benchmark_row(stage.describe()['stage'], elapsed, pixels,
+                                               len(outputs)))
+        results.append(self._benchmark_row('total', total_time, total_pixels, len(images)))
+        return results
+
+    @staticmethod
+    def _benchmark_row(name, elapsed, pixels, count):
+        """benchmark() 결과 한 줄 (입력 픽셀 기준 초당 메가픽셀)"""
+        return {
+            'stage': name,
+            'ms_per_page': round(elapsed * 1000 / max(1, count), 2),
+            'mp_per_sec': round(pixels / 1e6 / elapsed, 1) if elapsed > 0 else 0.0,
+        }
@@ -0,0 +1,367 @@
+"""
+프레임 소스 및 페이지 넘김 백엔드 모듈
+
+캡처 루프는 FrameSource에서 프레임을 가져오고 PageTurner로 페이지를 넘긴다.
+실제 화면용(mss/pyautogui) 백엔드 외에, 디렉토리나 녹화된 세션을 재생하는
+백엔드를 제공하여 디스플레이 없이도 캡처 루프를 측정/검증할 수 있다.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import platform
+import numpy as np
+from PIL import Image
+from mss import mss
+
+
+SESSION_FILE = "session.json"
+IMAGE_EXTENSIONS = ('.png', '.bmp', '.ppm', '.jpg', '.jpeg', '.tif', '.tiff')
+
+
+class Frame:
+    """
+    캡처된 한 프레임
+
+    mss가 돌려주는 BGRA 원본 버퍼를 복사하지 않고 그대로 보관하며,
+    PIL 이미지가 필요할 때 BGRX 디코더로 한 번만 변환한다.
+    """
+
+    def __init__(self, size, raw):
+        """
+        Args:
+            size: (width, height) 튜플
+            raw: BGRA 32비트 픽셀 버퍼 (bytes, bytearray 또는 memoryview)
+        """
+        self.size = size
+        self.raw = raw
+        self._image = None
+
+    @classmethod
+    def from_image(cls, image):
+        """PIL 이미지로부터 프레임 생성 (변환된 RGB 이미지는 to_image()용으로 보관)"""
+        rgb = image.convert("RGB")
+        frame = cls(rgb.size, rgb.tobytes("raw", "BGRX"))
+        frame._image = rgb
+        return frame
+
+    @classmethod
+    def from_screenshot(cls, screenshot):
+        """mss 스크린샷의 원본 버퍼를 감싸는 프레임 생성 (복사 없음)"""
+        return cls(screenshot.size, memoryview(screenshot.raw))
+
+    def pixels(self):
+        """
+        원본 버퍼를 복사 없이 (height, width, 4) BGRA 배열로 보기
+
+        Returns:
+            numpy.ndarray: 읽기 전용 uint8 배열
+        """
+        width, height = self.size
+        return np.frombuffer(self.raw, dtype=np.uint8).reshape(height, width, 4)
+
+    def crop(self, box):
+        """
+        원본 버퍼에서 영역을 잘라낸 새 프레임 (PIL 변환 없이 한 번만 복사)
+
+        Args:
+            box: (left, top, right, bottom)
+
+        Returns:
+            Frame: 잘라낸 프레임
+        """
+        left, top, right, bottom = box
+        # tobytes()는 연속되지 않은 슬라이스도 C 순서 바이트로 바로 복사함
+        return Frame((right - left, bottom - top),
+                     self.pixels()[top:bottom, left:right].tobytes())
+
+    def to_image(self):
+        """
+        RGB PIL 이미지로 변환 (결과는 캐시되어 여러 번 호출해도 한 번만 변환)
+
+        Returns:
+            PIL.Image: 'RGB' 모드 이미지
+        """
+        if self._image is None:
+            self._image = Image.frombuffer("RGB", self.size, self.raw, "raw", "BGRX", 0, 1)
+        return self._image
+
+    @property
+    def rgb(self):
+        """RGB 24비트 픽셀 바이트 (호환용, 복사본 생성)"""
+        return self.to_image().tobytes()
+
+
+class FrameSource:
+    """프레임 소스 기본 클래스 (컨텍스트 매니저로 사용)"""
+
+    def open(self):
+        """소스 열기 (캡처 스레드 안에서 호출됨)"""
+
+    def close(self):
+        """소스 닫기"""
+
+    def grab(self):
+        """
+        현재 화면 프레임 반환
+
+        Returns:
+            Frame: 캡처된 프레임
+        """
+        raise NotImplementedError
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PageTurner:
+    """페이지 넘김 기본 클래스"""
+
+    def turn(self):
+        """다음 페이지로 넘김"""
+        raise NotImplementedError
+
+
+class MssFrameSource(FrameSource):
+    """mss 기반 실제 화면 캡처 소스"""
+
+    def __init__(self, region):
+        """
+        Args:
+            region: 캡처 영역 {'top', 'left', 'width', 'height'} (전역 좌표)
+        """
+        self.region = region
+        self._sct = None
+
+    def open(self):
+        self._sct = mss()
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+    def grab(self):
+        return Frame.from_screenshot(self._sct.grab(self.region))
+
+
+class PyAutoGuiPageTurner(PageTurner):
+    """pyautogui 키 입력 기반 페이지 넘김 (크로스 플랫폼 호환)"""
+
+    def __init__(self, key='right'):
+        """
+        Args:
+            key: 페이지 넘김에 사용할 키
+        """
+        # 디스플레이가 없는 환경에서도 모듈을 불러올 수 있도록 지연 import
+        import pyautogui
+        self._pyautogui = pyautogui
+        self.key = key
+
+        # 플랫폼별 pyautogui 설정
+        if platform.system() == "Darwin":  # macOS
+            # macOS에서 보안 권한 처리
+            pyautogui.FAILSAFE = True
+            pyautogui.PAUSE = 0.1
+        elif platform.system() == "Windows":
+            # Windows에서 DPI 인식 설정
+            pyautogui.FAILSAFE = True
+            pyautogui.PAUSE = 0.1
+
+    def turn(self):
+        self._pyautogui.press(self.key)
+
+
+class ReplayFrameSource(FrameSource):
+    """
+    이미지 디렉토리 또는 녹화된 세션을 재생하는 프레임 소스
+
+    ReplayPageTurner로 페이지를 넘기면 render_latency(또는 녹화된 지연 시간)가
+    지날 때까지 이전 페이지를 계속 반환하여 리더 앱의 렌더링 지연을 흉내낸다.
+    마지막 페이지 이후에는 같은 프레임을 반복한다.
+    """
+
+    def __init__(self, path, render_latency=0.0, preload=True):
+        """
+        Args:
+            path: 이미지 디렉토리 또는 세션 디렉토리 (session.json 포함)
+            render_latency: 페이지 넘김 후 새 페이지가 보일 때까지의 지연 (초)
+            preload: True면 모든 프레임을 미리 디코딩하여 메모리에 보관
+        """
+        self.path = path
+        self.render_latency = render_latency
+        self.preload = preload
+        self.files, self.latencies = self._load_index(path)
+        if not self.files:
+            raise ValueError(f"No frames found in {path}")
+        self.index = 0
+        self._turned_at = None
+        self._cache = {}
+
+    @staticmethod
+    def _load_index(path):
+        """세션 파일 또는 디렉토리의 이미지 목록 로드"""
+        session_path = os.path.join(path, SESSION_FILE)
+        if os.path.exists(session_path):
+            with open(session_path, encoding="utf-8") as f:
+                session = json.load(f)
+            files = [os.path.join(path, item['file']) for item in session['frames']]
+            latencies = [item.get('latency') for item in session['frames']]
+            return files, latencies
+
+        def natural_key(name):
+            return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+
+        names = sorted((name for name in os.listdir(path)
+                        if name.lower().endswith(IMAGE_EXTENSIONS)), key=natural_key)
+        return [os.path.join(path, name) for name in names], [None] * len(names)
+
+    def open(self):
+        self.index = 0
+        self._turned_at = None
+        if self.preload:
+            for i in range(len(self.files)):
+                self._frame(i)
+
+    def close(self):
+        self._cache.clear()
+
+    def advance(self):
+        """다음 프레임으로 이동 (ReplayPageTurner에서 호출)"""
+        if self.index < len(self.files) - 1:
+            self.index += 1
+            self._turned_at = time.monotonic()
+
+    def grab(self):
+        index = self.index
+        if self._turned_at is not None and index > 0:
+            latency = self.latencies[index]
+            if latency is None:
+                latency = self.render_latency
+            if time.monotonic() - self._turned_at < latency:
+                index -= 1
+        return self._frame(index)
+
+    def _frame(self, index):
+        frame = self._cache.get(index)
+        if frame is None:
+            with Image.open(self.files[index]) as img:
+                frame = Frame.from_image(img)
+            if self.preload:
+                self._cache[index] = frame
+            else:
+                self._cache = {index: frame}
+        return frame
+
+
+class ReplayPageTurner(PageTurner):
+    """ReplayFrameSource의 다음 프레임으로 넘기는 페이지 넘김"""
+
+    def __init__(self, source):
+        """
+        Args:
+            source: ReplayFrameSource 인스턴스
+        """
+        self.source = source
+
+    def turn(self):
+        self.source.advance()
+
+
+class RecordingFrameSource(FrameSource):
+    """
+    다른 소스를 감싸 실제 세션의 프레임과 타이밍을 녹화하는 소스
+
+    페이지 넘김 사이에 마지막으로 보인 프레임(렌더링이 끝난 화면)만 PNG로 저장하고,
+    직전 페이지 넘김 이후 그 프레임이 처음 보이기까지 걸린 시간을 session.json에
+    기록한다. 렌더링 중간 프레임은 저장하지 않으므로 녹화된 세션은 페이지 하나당
+    프레임 하나가 되어 ReplayFrameSource로 그대로 재생할 수 있다.
+    """
+
+    def __init__(self, source, output_dir):
+        """
+        Args:
+            source: 녹화할 원본 FrameSource
+            output_dir: 세션을 저장할 디렉토리
+        """
+        self.source = source
+        self.output_dir = output_dir
+        self._frames = []
+        self._saved_digest = None
+        self._turned_at = None
+        self._pending = None
+
+    def open(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._frames = []
+        self._saved_digest = None
+        self._turned_at = None
+        self._pending = None
+        self.source.open()
+
+    def close(self):
+        self._flush()
+        self.source.close()
+        session = {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'frames': self._frames,
+        }
+        with open(os.path.join(self.output_dir, SESSION_FILE), 'w', encoding="utf-8") as f:
+            json.dump(session, f, indent=2)
+
+    def mark_turn(self):
+        """
+        페이지 넘김 시각 기록 (RecordingPageTurner에서 호출)
+
+        넘기기 전에 마지막으로 보인 프레임을 이전 페이지로 저장한다.
+        """
+        self._flush()
+        self._turned_at = time.monotonic()
+
+    def grab(self):
+        frame = self.source.grab()
+        digest = hashlib.blake2b(frame.raw, digest_size=16).digest()
+        if self._pending is None or digest != self._pending[1]:
+            # 내용이 바뀐 시각을 그 프레임의 렌더링 지연으로 기록
+            latency = None
+            if self._turned_at is not None:
+                latency = round(time.monotonic() - self._turned_at, 4)
+            self._pending = (frame, digest, latency)
+        return frame
+
+    def _flush(self):
+        """마지막으로 보인 프레임이 이미 저장한 페이지와 다르면 저장"""
+        if self._pending is None:
+            return
+        frame, digest, latency = self._pending
+        self._pending = None
+        if digest == self._saved_digest:
+            # 페이지가 넘어가지 않은 경우: 같은 페이지를 다시 저장하지 않음
+            return
+        self._saved_digest = digest
+        name = f"frame_{len(self._frames) + 1}.png"
+        frame.to_image().save(os.path.join(self.output_dir, name), "PNG", compress_level=1)
+        self._frames.append({'file': name, 'latency': latency})
+
+
+class RecordingPageTurner(PageTurner):
+    """다른 PageTurner를 감싸 페이지 넘김 시각을 녹화 소스에 전달"""
+
+    def __init__(self, turner, recorder):
+        """
+        Args:
+            turner: 원본 PageTurner
+            recorder: RecordingFrameSource 인스턴스
+        """
+        self.turner = turner
+        self.recorder = recorder
+
+    def turn(self):
+        self.turner.turn()
+        self.recorder.mark_turn()
@@ -0,0 +1,194 @@
+"""
+메모리 맵 기반 원본 프레임 스풀 모듈
+
+한 세션의 프레임은 모두 같은 크기이므로, 페이지마다 PNG 파일을 만드는 대신
+고정 간격(stride)의 BGRA 원본 프레임을 하나의 파일에 이어서 기록한다.
+파일은 메모리 맵으로 열어 쓰고 읽으며, 정리는 파일 두 개 삭제로 끝난다.
+"""
+
+import os
+import json
+import mmap
+import threading
+from PIL import Image
+
+
+class FrameSpool:
+    """고정 크기 원본 프레임을 저장하는 메모리 맵 스풀"""
+
+    DATA_FILE = "frames.raw"
+    INDEX_FILE = "frames.json"
+
+    # 파일을 한 번에 늘리는 최대 크기 (바이트)
+    # NTFS처럼 희소 파일을 쓰지 않는 파일 시스템은 늘린 크기만큼 디스크를 바로
+    # 차지하므로, 프레임 수가 아니라 바이트 기준의 작은 단위로 늘린다.
+    GROW_BYTES = 256 * 1024 * 1024
+
+    # 프레임당 바이트 수 (BGRA)
+    BYTES_PER_PIXEL = 4
+
+    def __init__(self, directory, size, writable, expected_frames=None):
+        """
+        직접 생성하지 말고 create() 또는 open()을 사용
+
+        Args:
+            directory: 스풀 파일이 위치한 디렉토리
+            size: 프레임 크기 (width, height)
+            writable: 쓰기 모드 여부
+            expected_frames: 예상 프레임 수 (파일을 이보다 크게 늘리지 않음)
+        """
+        self.directory = directory
+        self.size = tuple(size)
+        self.stride = self.size[0] * self.size[1] * self.BYTES_PER_PIXEL
+        self.writable = writable
+        self.expected_frames = expected_frames
+        self.pages = set()
+        self._file = None
+        self._map = None
+        self._capacity = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, directory, size, expected_frames=None):
+        """
+        새 스풀 생성 (기존 스풀은 덮어씀)
+
+        Args:
+            directory: 스풀 디렉토리
+            size: 프레임 크기 (width, height)
+            expected_frames: 예상 프레임 수 (파일을 늘리는 상한, 넘으면 계속 늘림)
+
+        Returns:
+            FrameSpool: 쓰기 모드 스풀
+        """
+        os.makedirs(directory, exist_ok=True)
+        FrameSpool.discard(directory)
+        spool = cls(directory, size, writable=True, expected_frames=expected_frames)
+        spool._file = open(os.path.join(directory, cls.DATA_FILE), 'w+b')
+        spool._resize(spool._next_capacity(1))
+        return spool
+
+    @classmethod
+    def open(cls, directory):
+        """
+        기록이 끝난 스풀을 읽기 전용으로 열기
+
+        Args:
+            directory: 스풀 디렉토리
+
+        Returns:
+            FrameSpool: 읽기 모드 스풀
+        """
+        with open(os.path.join(directory, cls.INDEX_FILE), encoding='utf-8') as f:
+            index = json.load(f)
+        spool = cls(directory, (index['width'], index['height']), writable=False)
+        spool.pages = set(index['pages'])
+        spool._file = open(os.path.join(directory, cls.DATA_FILE), 'rb')
+        spool._capacity = os.path.getsize(spool._file.name) // spool.stride
+        if spool._capacity:
+            spool._map = mmap.mmap(spool._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return spool
+
+    @staticmethod
+    def exists(directory):
+        """디렉토리에 완성된 스풀이 있는지 확인"""
+        return (os.path.exists(os.path.join(directory, FrameSpool.INDEX_FILE)) and
+                os.path.exists(os.path.join(directory, FrameSpool.DATA_FILE)))
+
+    @staticmethod
+    def discard(directory):
+        """디렉토리의 스풀 파일 삭제"""
+        for name in (FrameSpool.INDEX_FILE, FrameSpool.DATA_FILE):
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def write(self, page_index, frame):
+        """
+        프레임 기록 (여러 워커 스레드에서 호출 가능)
+
+        Args:
+            page_index: 1부터 시작하는 페이지 번호
+            frame: 캡처된 Frame 객체 (BGRA raw 버퍼)
+        """
+        if tuple(frame.size) != self.size:
+            raise ValueError(f"Frame size {frame.size} does not match spool size {self.size}")
+        offset = (page_index - 1) * self.stride
+        with self._lock:
+            if page_index > self._capacity:
+                self._resize(self._next_capacity(page_index))
+            self._map[offset:offset + self.stride] = frame.raw
+            self.pages.add(page_index)
+
+    def read_image(self, page_index):
+        """
+        기록된 프레임을 RGB 이미지로 읽기
+
+        메모리 맵 영역을 중간 bytes 복사 없이 BGRX 디코더에 넘기며, 디코더가 픽셀을
+        새 RGB 이미지로 한 번 복사한다 (반환된 이미지는 스풀을 닫은 뒤에도 유효).
+
+        Args:
+            page_index: 페이지 번호
+
+        Returns:
+            PIL.Image: 'RGB' 모드 이미지 (기록되지 않은 페이지면 None)
+        """
+        if page_index not in self.pages:
+            return None
+        offset = (page_index - 1) * self.stride
+        view = memoryview(self._map)[offset:offset + self.stride]
+        try:
+            return Image.frombuffer("RGB", self.size, view, "raw", "BGRX", 0, 1)
+        finally:
+            view.release()
+
+    def close(self):
+        """스풀 닫기 (쓰기 모드면 실제 기록된 크기로 줄이고 인덱스 저장)"""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file is None:
+                return
+            if self.writable:
+                last_page = max(self.pages, default=0)
+                self._file.truncate(last_page * self.stride)
+                index = {
+                    'width': self.size[0],
+                    'height': self.size[1],
+                    'stride': self.stride,
+                    'format': 'BGRA',
+                    'pages': sorted(self.pages),
+                }
+                with open(os.path.join(self.directory, self.INDEX_FILE), 'w', encoding='utf-8') as f:
+                    json.dump(index, f)
+            self._file.close()
+            self._file = None
+
+    def _next_capacity(self, page_index):
+        """
+        page_index 프레임을 기록하기 위해 늘릴 용량
+
+        GROW_BYTES만큼 늘리되, 예상 프레임 수 안의 페이지면 예상 프레임 수를 넘지 않는다.
+
+        Returns:
+            int: 새 용량 (프레임 수)
+        """
+        capacity = max(page_index, self._capacity + max(1, self.GROW_BYTES // self.stride))
+        if self.expected_frames and page_index <= self.expected_frames:
+            capacity = min(capacity, self.expected_frames)
+        return capacity
+
+    def _resize(self, capacity):
+        """파일과 메모리 맵을 capacity 프레임 크기로 확장"""
+        if self._map is not None:
+            self._map.close()
+        self._file.truncate(capacity * self.stride)
+        self._map = mmap.mmap(self._file.fileno(), capacity * self.stride)
+        self._capacity = capacity
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
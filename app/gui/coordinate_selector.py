@@ -1,13 +1,21 @@
 """
 좌표 선택 오버레이 모듈
 드래그 선택과 십자선, 실시간 픽셀 표시 기능 제공
+
+오버레이를 열 때(호출한 창을 숨긴 뒤) 선택된 모니터를 한 번만 캡처해 두고, 확대 영역은 그 스냅샷을
+잘라서 표시한다. 화면 갱신은 마우스 이동 이벤트에서 바뀐 영역(십자선, 선택 영역)만
+다시 그린다. 드래그 없이 페이지 안을 클릭하면 스냅샷에서 페이지 영역을 찾아
+제안하고, 방향키로 조정한 뒤 Enter로 확정한다.
 """
 
 import platform
+import numpy as np
 from PyQt6.QtWidgets import (QWidget, QApplication, QLabel, QVBoxLayout, 
                             QHBoxLayout, QFrame)
 from PyQt6.QtCore import Qt, QRect, QPoint, pyqtSignal, QTimer
-from PyQt6.QtGui import QPainter, QPen, QColor, QPixmap, QFont, QCursor
+from PyQt6.QtGui import QPainter, QPen, QColor, QPixmap, QFont, QCursor, QImage
+
+from ..core.processing import CropStage
 
 
 class CoordinateSelector(QWidget):
@@ -24,12 +32,22 @@ class CoordinateSelector(QWidget):
         self.current_pos = QPoint(0, 0)
         self.is_selecting = False
         self.zoom_factor = 3
+        self.snapshot = None
+        self._snapshot_pixels = None
+        self._painted_rects = []
+        # 클릭으로 감지한 영역을 방향키로 조정하는 중인지 여부
+        self.adjusting = False
         
         # 선택된 모니터 정보 설정
         self.setup_monitor_info()
         
+        # 오버레이가 화면에 나타나기 전에 모니터를 한 번 캡처
+        # (호출하는 쪽은 자신의 창을 먼저 숨긴 뒤 이 위젯을 생성해야 함)
+        self.capture_snapshot()
+        
         self.init_ui()
-        self.setup_timer()
+        # 타이머 대신 마우스 이동 이벤트로 갱신 (버튼을 누르지 않아도 이벤트 수신)
+        self.setMouseTracking(True)
         
     def setup_monitor_info(self):
         """선택된 모니터 정보 설정"""
@@ -41,6 +59,28 @@ class CoordinateSelector(QWidget):
             
         print(f"Selected monitor {self.selected_monitor_index}: {self.current_monitor}")
         
+    def find_screen(self):
+        """선택된 모니터에 해당하는 QScreen (찾지 못하면 주 화면)"""
+        # MonitorManager가 조회한 Qt 화면 이름으로 먼저 찾음
+        name = self.current_monitor.get('name')
+        for screen in QApplication.screens():
+            if name and screen.name() == name:
+                return screen
+        center = QPoint(self.current_monitor['left'] + self.current_monitor['width'] // 2,
+                        self.current_monitor['top'] + self.current_monitor['height'] // 2)
+        return QApplication.screenAt(center) or QApplication.primaryScreen()
+        
+    def capture_snapshot(self):
+        """선택된 모니터 전체를 한 번 캡처하여 확대 영역과 영역 감지에 사용"""
+        self.snapshot_screen = self.find_screen()
+        if self.snapshot_screen is None:
+            return
+        pixmap = self.snapshot_screen.grabWindow(0)
+        if not pixmap.isNull():
+            self.snapshot = pixmap
+            # 영역 감지용 픽셀 배열은 새 스냅샷에서 다시 변환
+            self._snapshot_pixels = None
+            
     def calculate_full_screen_area(self):
         """현재 선택된 모니터의 전체 영역 계산"""
         return QRect(
@@ -185,7 +225,9 @@ class CoordinateSelector(QWidget):
         
         # 사용법 안내
         help_layout = QHBoxLayout()
-        self.help_label = QLabel("드래그: 영역 선택 | ESC: 취소")
+        self.help_label = QLabel("드래그: 영역 선택 | 클릭: 페이지 자동 감지\n"
+                                 "방향키: 이동 (Shift: 10픽셀) | Ctrl+방향키: 크기 | "
+                                 "Enter: 확정 | ESC: 취소")
         self.help_label.setStyleSheet("color: #aaa; font-size: 9px;")
         help_layout.addWidget(self.help_label)
         layout.addLayout(help_layout)
@@ -202,22 +244,19 @@ class CoordinateSelector(QWidget):
         # 패널 위치 설정 (우상단)
         self.info_panel.move(self.width() - 300, 20)
         
-    def setup_timer(self):
-        """마우스 추적 타이머 설정"""
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_mouse_info)
-        self.timer.start(16)  # 60 FPS
+    def update_mouse_info(self, widget_pos=None):
+        """
+        마우스 정보 업데이트
         
-    def update_mouse_info(self):
-        """마우스 정보 업데이트"""
+        Args:
+            widget_pos: 위젯 좌표의 마우스 위치 (None이면 현재 커서 위치)
+        """
         if not self.isVisible():
             return
             
-        # 전역 마우스 위치
-        global_pos = QCursor.pos()
-        
-        # 위젯 상대 좌표로 변환
-        widget_pos = self.mapFromGlobal(global_pos)
+        if widget_pos is None:
+            widget_pos = self.mapFromGlobal(QCursor.pos())
+        global_pos = self.mapToGlobal(widget_pos)
         local_x = widget_pos.x()
         local_y = widget_pos.y()
         
@@ -265,50 +304,55 @@ class CoordinateSelector(QWidget):
                 
             self.info_panel.move(panel_x, panel_y)
         
-        self.update()
+        self.update_overlay()
+        
+    def overlay_rects(self):
+        """
+        현재 십자선과 선택 영역이 그려지는 영역
+        
+        Returns:
+            list: 다시 그려야 할 QRect 리스트
+        """
+        x, y = self.current_pos.x(), self.current_pos.y()
+        rects = [QRect(x - 1, 0, 3, self.height()), QRect(0, y - 1, self.width(), 3)]
+        if self.selection_start and (self.selection_end or self.is_selecting):
+            end_pos = self.selection_end if self.selection_end else self.current_pos
+            # 테두리 두께와 모서리 핸들 크기만큼 여유
+            rects.append(QRect(self.selection_start, end_pos).normalized().adjusted(-5, -5, 5, 5))
+        return rects
+        
+    def update_overlay(self):
+        """이전에 그린 영역과 새로 그릴 영역만 다시 그리도록 요청"""
+        rects = self.overlay_rects()
+        for rect in self._painted_rects + rects:
+            self.update(rect)
+        self._painted_rects = rects
         
     def update_zoom_view(self, global_x, global_y):
-        """확대 뷰 업데이트 (크로스 플랫폼 호환)"""
+        """확대 뷰 업데이트 (열 때 캡처한 스냅샷에서 잘라서 표시)"""
         try:
-            # 마우스 위치에 해당하는 스크린 찾기
-            target_screen = None
-            for screen in QApplication.screens():
-                if screen.geometry().contains(global_x, global_y):
-                    target_screen = screen
-                    break
-            
-            # 해당하는 스크린이 없으면 primary 사용
-            if not target_screen:
-                target_screen = QApplication.primaryScreen()
-            
-            if target_screen:
+            if self.snapshot is not None:
                 zoom_size = 50  # 확대 영역 크기 증가
                 
-                # 캡처 영역 계산 (스크린 상대 좌표로)
-                screen_geometry = target_screen.geometry()
-                relative_x = global_x - screen_geometry.x()
-                relative_y = global_y - screen_geometry.y()
+                # 스냅샷은 장치 픽셀 단위이므로 화면 배율을 곱해서 위치 계산
+                screen_geometry = self.snapshot_screen.geometry()
+                ratio = self.snapshot.devicePixelRatio()
+                relative_x = round((global_x - screen_geometry.x()) * ratio)
+                relative_y = round((global_y - screen_geometry.y()) * ratio)
+                size = round(zoom_size * ratio)
                 
                 capture_rect = QRect(
-                    relative_x - zoom_size//2,
-                    relative_y - zoom_size//2,
-                    zoom_size,
-                    zoom_size
+                    relative_x - size//2,
+                    relative_y - size//2,
+                    size,
+                    size
                 )
                 
                 # 화면 경계 체크
-                screen_rect = QRect(0, 0, screen_geometry.width(), screen_geometry.height())
-                capture_rect = capture_rect.intersected(screen_rect)
+                capture_rect = capture_rect.intersected(self.snapshot.rect())
                 
                 if not capture_rect.isEmpty():
-                    # 해당 스크린에서 스크린샷 캡처
-                    pixmap = target_screen.grabWindow(
-                        0, 
-                        capture_rect.x(), 
-                        capture_rect.y(),
-                        capture_rect.width(), 
-                        capture_rect.height()
-                    )
+                    pixmap = self.snapshot.copy(capture_rect)
                     
                     if not pixmap.isNull():
                         # 정확한 크기로 스케일링 (잘림 방지)
@@ -350,15 +394,16 @@ class CoordinateSelector(QWidget):
             self.selection_start = event.pos()
             self.selection_end = None
             self.is_selecting = True
+            self.adjusting = False
             self.grabMouse()  # 마우스 캡처
             
     def mouseMoveEvent(self, event):
-        """마우스 이동 중"""
+        """마우스 이동 중 (버튼을 누르지 않은 이동도 포함)"""
         event.accept()
         
         if self.is_selecting and self.selection_start:
             self.selection_end = event.pos()
-            self.update()
+        self.update_mouse_info(event.pos())
             
     def mouseReleaseEvent(self, event):
         """마우스 클릭 종료"""
@@ -370,7 +415,7 @@ class CoordinateSelector(QWidget):
         if event.button() == Qt.MouseButton.LeftButton and self.is_selecting:
             self.selection_end = event.pos()
             self.is_selecting = False
-            self.update()
+            self.update_mouse_info(event.pos())
             
             # 드래그가 완료되면 자동으로 확정 (최소 크기 체크)
             if self.selection_start and self.selection_end:
@@ -380,12 +425,96 @@ class CoordinateSelector(QWidget):
                 if width >= 5 and height >= 5:
                     # 0.5초 후 자동 확정 (사용자가 결과를 볼 수 있도록)
                     QTimer.singleShot(500, self.confirm_selection)
-                else:
-                    # 너무 작은 영역은 선택 취소
+                elif not self.detect_page_region(event.pos()):
+                    # 클릭한 곳에서 페이지를 찾지 못하면 선택 취소
                     self.selection_start = None
                     self.selection_end = None
-                    self.update()
+                    self.update_overlay()
+            
+    def snapshot_pixels(self):
+        """
+        스냅샷 픽셀 배열 (처음 요청할 때 한 번만 변환)
+        
+        Returns:
+            numpy.ndarray: (height, width, 4) BGRA 배열, 스냅샷이 없으면 None
+        """
+        if self._snapshot_pixels is None and self.snapshot is not None:
+            image = self.snapshot.toImage().convertToFormat(QImage.Format.Format_RGB32)
+            bits = image.constBits()
+            bits.setsize(image.sizeInBytes())
+            rows = np.frombuffer(bits, dtype=np.uint8).reshape(
+                image.height(), image.bytesPerLine() // 4, 4)
+            self._snapshot_pixels = rows[:, :image.width()].copy()
+        return self._snapshot_pixels
+        
+    def detect_page_region(self, pos):
+        """
+        클릭한 위치의 페이지 영역을 스냅샷에서 찾아 선택 영역으로 제안
+        
+        메인 윈도우를 숨긴 뒤 생성 시 캡처한 스냅샷만 사용하므로, 프로그램 창이나
+        오버레이가 감지 결과에 섞이지 않는다.
+        
+        Args:
+            pos: 위젯 좌표의 클릭 위치
+            
+        Returns:
+            bool: 영역을 찾았는지 여부
+        """
+        pixels = self.snapshot_pixels()
+        if pixels is None:
+            return False
+        # 위젯 좌표 -> 스냅샷 장치 픽셀 좌표
+        ratio = self.snapshot.devicePixelRatio()
+        origin = self.snapshot_screen.geometry().topLeft()
+        global_pos = self.mapToGlobal(pos)
+        region = CropStage.page_at(pixels, round((global_pos.x() - origin.x()) * ratio),
+                                   round((global_pos.y() - origin.y()) * ratio))
+        if region is None:
+            return False
+        left, top, right, bottom = region
+        top_left = self.mapFromGlobal(QPoint(origin.x() + round(left / ratio),
+                                             origin.y() + round(top / ratio)))
+        bottom_right = self.mapFromGlobal(QPoint(origin.x() + round(right / ratio),
+                                                 origin.y() + round(bottom / ratio)))
+        self.selection_start = top_left
+        self.selection_end = bottom_right
+        self.adjusting = True
+        self.update_mouse_info(pos)
+        return True
+        
+    def nudge_selection(self, key, modifiers):
+        """
+        방향키로 선택 영역 이동 또는 크기 조정
+        
+        Args:
+            key: 눌린 방향키
+            modifiers: Shift면 10픽셀 단위, Ctrl이면 오른쪽/아래 모서리만 이동
             
+        Returns:
+            bool: 처리한 키인지 여부
+        """
+        offsets = {
+            Qt.Key.Key_Left: (-1, 0),
+            Qt.Key.Key_Right: (1, 0),
+            Qt.Key.Key_Up: (0, -1),
+            Qt.Key.Key_Down: (0, 1),
+        }
+        if key not in offsets or not (self.selection_start and self.selection_end):
+            return False
+        step = 10 if modifiers & Qt.KeyboardModifier.ShiftModifier else 1
+        dx, dy = offsets[key][0] * step, offsets[key][1] * step
+        rect = QRect(self.selection_start, self.selection_end).normalized()
+        if modifiers & Qt.KeyboardModifier.ControlModifier:
+            self.selection_start = rect.topLeft()
+            self.selection_end = QPoint(max(rect.left() + 1, rect.right() + dx),
+                                        max(rect.top() + 1, rect.bottom() + dy))
+        else:
+            self.selection_start = rect.topLeft() + QPoint(dx, dy)
+            self.selection_end = rect.bottomRight() + QPoint(dx, dy)
+        self.adjusting = True
+        self.update_mouse_info(self.current_pos)
+        return True
+        
     def keyPressEvent(self, event):
         """키보드 이벤트"""
         if event.key() == Qt.Key.Key_Escape:
@@ -393,6 +522,11 @@ class CoordinateSelector(QWidget):
             # ESC 시 좌표 선택 취소 시그널 발생
             self.coordinates_selected.emit(-1, -1, -1, -1)  # 취소를 나타내는 특수 값
             self.close()
+        elif event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and self.adjusting:
+            event.accept()
+            self.confirm_selection()
+        elif not self.is_selecting and self.nudge_selection(event.key(), event.modifiers()):
+            event.accept()
         else:
             event.ignore()
             
@@ -480,8 +614,8 @@ class CoordinateSelector(QWidget):
         if hasattr(self, 'is_selecting') and self.is_selecting:
             self.releaseMouse()
             
-        # 타이머 정리
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        # 스냅샷 메모리 해제
+        self.snapshot = None
+        self._snapshot_pixels = None
             
         super().closeEvent(event)
\ No newline at end of file
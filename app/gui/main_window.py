@@ -7,13 +7,14 @@ import time
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
                             QPushButton, QLabel, QSpinBox, QFileDialog, 
                             QHBoxLayout, QLineEdit, QGridLayout, QComboBox,
-                            QProgressBar, QDoubleSpinBox)
-from PyQt6.QtCore import Qt
+                            QProgressBar, QDoubleSpinBox, QCheckBox, QApplication)
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
 import pyautogui
 
-from ..core import CaptureThread, PDFConverter
-from ..utils import MonitorManager
+from ..core import (CaptureThread, ConvertThread, PDFConverter, IntermediateFormat,
+                    PageProcessor, SpreadSplitter)
+from ..utils import MonitorManager, PerfRecorder
 from .components import UISection, StyleManager
 from .coordinate_selector import CoordinateSelector
 
@@ -21,16 +22,31 @@ from .coordinate_selector import CoordinateSelector
 class MainWindow(QMainWindow):
     """메인 프로그램 창"""
     
+    # 진행률 표시 갱신 주기 (밀리초), 스레드 시그널은 이 주기로 모아서 반영
+    PROGRESS_REFRESH_MS = 100
+    # 메인 윈도우를 숨긴 뒤 좌표 선택 창을 열기까지 대기 (밀리초), 창 관리자의 숨김 반영 시간
+    SELECTOR_DELAY_MS = 200
+    
     def __init__(self):
         super().__init__()
         self.output_dir = os.getcwd()
         self.output_filename = 'output.pdf'
         self.coords = {'x1': 0, 'y1': 0, 'x2': 0, 'y2': 0}
         self.monitor_offset = {'top': 0, 'left': 0}
+        # 모니터 구성은 MonitorManager 캐시를 공유하고, 화면 변경 시그널로 갱신
+        MonitorManager.watch_screens()
+        MonitorManager.add_listener(self.on_monitors_changed)
         self.monitors = MonitorManager.get_monitors()
         self.monitor_offset = MonitorManager.get_monitor_offset(0)
+        self.captured_pages = 0
+        self.capture_report = None
+        self._pending_progress = None
         self.initUI()
         
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(self.PROGRESS_REFRESH_MS)
+        self.progress_timer.timeout.connect(self.refresh_progress)
+        
     def initUI(self):
         """UI 초기화"""
         self.setWindowTitle('eBook PDF 변환기')
@@ -91,6 +107,65 @@ class MainWindow(QMainWindow):
         filename_layout.addWidget(self.filename_input)
         filename_layout.addWidget(QLabel('.pdf'))
         save_layout.addLayout(filename_layout)
+        
+        # 캡처와 동시에 PDF 작성 (캡처 종료 후 변환 대기 시간 제거)
+        self.incremental_pdf_check = QCheckBox('캡처하면서 PDF 작성')
+        self.incremental_pdf_check.setChecked(True)
+        save_layout.addWidget(self.incremental_pdf_check)
+        
+        # 페이지별 코덱 선택 (흑백/회색조/팔레트/컬러), 체크 시 손실 압축 사용 안 함
+        self.lossless_check = QCheckBox('무손실 압축 (JPEG/흑백 변환 사용 안 함)')
+        save_layout.addWidget(self.lossless_check)
+        
+        # 목표 파일 크기: 표본 페이지로 화질/해상도를 탐색 (캡처 후 변환 단계에서 적용)
+        target_layout = QHBoxLayout()
+        target_layout.addWidget(QLabel("목표 PDF 크기:"))
+        self.target_size_spin = QSpinBox()
+        self.target_size_spin.setRange(0, 100000)
+        self.target_size_spin.setValue(0)
+        self.target_size_spin.setSuffix(' MB')
+        self.target_size_spin.setSpecialValueText('제한 없음')
+        self.target_size_spin.setMinimumWidth(100)
+        target_layout.addWidget(self.target_size_spin)
+        target_layout.addStretch()
+        save_layout.addLayout(target_layout)
+        
+        # 용지 크기/DPI: 고해상도 화면 캡처를 인쇄에 필요한 픽셀 수로 축소
+        paper_layout = QHBoxLayout()
+        paper_layout.addWidget(QLabel("용지 크기:"))
+        self.paper_combo = QComboBox()
+        self.paper_combo.addItems(['원본', '화면 배율 보정', 'A4', 'A5', 'B5', 'B6', 'Letter'])
+        paper_layout.addWidget(self.paper_combo)
+        self.dpi_spin = QSpinBox()
+        self.dpi_spin.setRange(72, 1200)
+        self.dpi_spin.setValue(int(PDFConverter.DPI))
+        self.dpi_spin.setSuffix(' DPI')
+        paper_layout.addWidget(self.dpi_spin)
+        paper_layout.addStretch()
+        save_layout.addLayout(paper_layout)
+        
+        # 여백 자동 자르기: 표본 페이지가 필요하므로 캡처 후 변환 단계에서 적용
+        crop_layout = QHBoxLayout()
+        crop_layout.addWidget(QLabel("여백 자르기:"))
+        self.crop_combo = QComboBox()
+        self.crop_combo.addItems(['자르지 않음', '책 전체 동일', '페이지별'])
+        crop_layout.addWidget(self.crop_combo)
+        crop_layout.addStretch()
+        save_layout.addLayout(crop_layout)
+        
+        # 미색/세피아 배경 흰색 처리와 대비 정규화 (압축률 향상)
+        self.cleanup_check = QCheckBox('배경 흰색 처리 및 대비 보정')
+        save_layout.addWidget(self.cleanup_check)
+        self.threshold_check = QCheckBox('글자 페이지 흑백 변환')
+        save_layout.addWidget(self.threshold_check)
+        
+        # 임시 저장 형식 (디스크 사용량과 CPU 사용량 절충)
+        format_layout = QHBoxLayout()
+        format_layout.addWidget(QLabel("임시 저장 형식:"))
+        self.intermediate_combo = QComboBox()
+        self.intermediate_combo.addItems(IntermediateFormat.available())
+        format_layout.addWidget(self.intermediate_combo)
+        save_layout.addLayout(format_layout)
         main_layout.addWidget(save_section)
 
     def _setup_page_section(self, main_layout):
@@ -117,6 +192,27 @@ class MainWindow(QMainWindow):
         page_content.addWidget(self.delay_spin)
         
         page_layout.addLayout(page_content)
+        
+        # 안정화 대기: 딜레이를 최대 대기 시간으로 사용
+        self.wait_stable_check = QCheckBox('화면이 안정되면 바로 캡처 (딜레이는 최대 대기 시간)')
+        page_layout.addWidget(self.wait_stable_check)
+        
+        # 마지막 페이지 자동 감지: 페이지 수는 상한으로만 사용
+        self.auto_stop_check = QCheckBox('마지막 페이지 자동 감지 (페이지 수는 최대값)')
+        page_layout.addWidget(self.auto_stop_check)
+        
+        # 페이지 넘김 누락 시 키 재입력
+        self.retry_missed_check = QCheckBox('페이지가 넘어가지 않으면 키 재입력')
+        page_layout.addWidget(self.retry_missed_check)
+        
+        # 두 쪽 펼침 화면: 한 번 캡처해서 안쪽 여백을 찾아 두 페이지로 저장
+        spread_layout = QHBoxLayout()
+        spread_layout.addWidget(QLabel('보기 방식:'))
+        self.spread_combo = QComboBox()
+        self.spread_combo.addItems(['한 쪽', '두 쪽 펼침 (왼쪽부터)', '두 쪽 펼침 (오른쪽부터)'])
+        spread_layout.addWidget(self.spread_combo)
+        spread_layout.addStretch()
+        page_layout.addLayout(spread_layout)
         main_layout.addWidget(page_section)
 
     def _setup_coord_section(self, main_layout):
@@ -228,12 +324,18 @@ class MainWindow(QMainWindow):
         except ValueError:
             pass
             
-    def update_monitor_list(self):
+    def update_monitor_list(self, selected_index=0):
         """모니터 목록 업데이트"""
         self.monitor_combo.clear()
         for i, m in enumerate(self.monitors):
             self.monitor_combo.addItem(MonitorManager.get_monitor_info_text(i, m))
-        self.monitor_combo.setCurrentIndex(0)
+        self.monitor_combo.setCurrentIndex(min(max(selected_index, 0), len(self.monitors) - 1))
+        
+    def on_monitors_changed(self):
+        """모니터 연결/분리나 배치 변경 시 목록과 오프셋 갱신"""
+        self.monitors = MonitorManager.get_monitors()
+        self.update_monitor_list(self.monitor_combo.currentIndex())
+        self.monitor_changed(self.monitor_combo.currentIndex())
                 
     def monitor_changed(self, index):
         """모니터 변경 시 오프셋 업데이트"""
@@ -246,7 +348,24 @@ class MainWindow(QMainWindow):
         selected_monitor_index = self.monitor_combo.currentIndex()
         print(f"Starting coordinate selection on monitor {selected_monitor_index}")
         
-        # 선택된 모니터 정보 전달
+        # 메인 윈도우를 먼저 숨김 (선택 창의 스냅샷에 찍히지 않도록)
+        self.hide()
+        
+        # 창이 화면에서 실제로 사라질 때까지 기다린 뒤 선택 창 생성
+        QTimer.singleShot(self.SELECTOR_DELAY_MS,
+                          lambda: self.open_coordinate_selector(selected_monitor_index))
+        
+    def open_coordinate_selector(self, selected_monitor_index):
+        """
+        메인 윈도우가 숨겨진 뒤 좌표 선택 창 생성 및 표시
+        
+        Args:
+            selected_monitor_index: 선택할 모니터 인덱스
+        """
+        # 숨김 처리가 끝나도록 남은 이벤트 처리
+        QApplication.processEvents()
+        
+        # 선택된 모니터 정보 전달 (생성 시 스냅샷 캡처)
         self.coordinate_selector = CoordinateSelector(self.monitors, selected_monitor_index)
         self.coordinate_selector.coordinates_selected.connect(self.on_coordinates_selected)
         
@@ -257,9 +376,6 @@ class MainWindow(QMainWindow):
         self.coordinate_selector.activateWindow()
         self.coordinate_selector.raise_()
         self.coordinate_selector.setFocus()
-        
-        # 메인 윈도우 임시 숨김
-        self.hide()
     
     def on_coordinates_selected(self, x1, y1, x2, y2):
         """좌표 선택 완료 시 호출 (모니터 상대 좌표를 받음)"""
@@ -337,47 +453,161 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(0)
         self.progress_bar.setFormat('캡처 준비 중...')
         
+        output_pdf = os.path.join(self.output_dir, self.output_filename)
         self.capture_thread = CaptureThread(
             self.coords['x1'], 
             self.coords['y1'],
             self.coords['x2'], 
             self.coords['y2'],
             self.page_spin.value(),
-            self.monitor_offset,
-            self.delay_spin.value()
+            self.monitor_combo.currentIndex(),
+            self.delay_spin.value(),
+            wait_stable=self.wait_stable_check.isChecked(),
+            auto_stop=self.auto_stop_check.isChecked(),
+            retry_missed=self.retry_missed_check.isChecked(),
+            pdf_path=output_pdf if self.use_incremental_pdf() else None,
+            intermediate=self.intermediate_combo.currentText(),
+            codec=self.get_codec(),
+            processor=None if self.process_on_convert() else self.get_processor(),
+            spread=self.get_spread()
         )
         
+        self.captured_pages = 0
+        self.capture_report = None
+        self.convert_thread = None
         self.capture_thread.progress.connect(self.update_progress)
+        self.capture_thread.timings.connect(self.set_capture_report)
+        self.capture_thread.pages_captured.connect(self.set_captured_pages)
         self.capture_thread.finished.connect(self.finish_capture)
         self.capture_thread.start()
+        self.progress_timer.start()
         self.start_btn.setEnabled(False)
         
+    def get_codec(self):
+        """선택된 페이지 코덱 지정 문자열"""
+        return 'lossless' if self.lossless_check.isChecked() else 'auto'
+        
+    def get_processor(self):
+        """선택된 용지/DPI와 보정 옵션에 맞춘 페이지 후처리 (처리할 것이 없으면 None)"""
+        paper = self.paper_combo.currentText()
+        scale = None
+        if paper == '화면 배율 보정':
+            # Retina/HiDPI 모니터의 장치 픽셀을 논리 픽셀 크기로 축소
+            monitor = MonitorManager.get_monitor(self.monitor_combo.currentIndex())
+            scale = monitor.get('scale', 1.0) if monitor else 1.0
+        return PageProcessor.build(
+            paper=None if paper in ('원본', '화면 배율 보정') else paper,
+            dpi=self.dpi_spin.value(),
+            crop=(None, 'book', 'page')[self.crop_combo.currentIndex()],
+            cleanup=self.cleanup_check.isChecked(),
+            threshold=self.threshold_check.isChecked(),
+            source_scale=scale)
+        
+    def get_spread(self):
+        """선택된 펼침 분할 설정 (한 쪽 보기면 None)"""
+        mode = self.spread_combo.currentIndex()
+        if mode == 0:
+            return None
+        return SpreadSplitter(rtl=mode == 2)
+        
+    def process_on_convert(self):
+        """후처리를 캡처 중 대신 변환 단계에서 적용할지 여부 (여백 자르기는 표본 페이지 필요)"""
+        return self.crop_combo.currentIndex() > 0
+        
+    def get_target_bytes(self):
+        """목표 PDF 크기 (바이트, 제한 없으면 None)"""
+        megabytes = self.target_size_spin.value()
+        return megabytes * 1024 * 1024 if megabytes else None
+        
+    def use_incremental_pdf(self):
+        """캡처 중 PDF 작성 여부 (목표 크기나 여백 자르기는 변환 단계에서 표본을 봐야 하므로 제외)"""
+        return (self.incremental_pdf_check.isChecked() and self.get_target_bytes() is None
+                and not self.process_on_convert())
+        
     def update_progress(self, value):
-        """진행 상황 업데이트"""
-        percent = int((value / self.page_spin.value()) * 100)
+        """캡처 진행 상황 기록 (화면 반영은 refresh_progress에서)"""
+        self._pending_progress = ('진행중', value, self.page_spin.value())
+        
+    def update_convert_progress(self, value):
+        """PDF 변환 진행 상황 기록 (화면 반영은 refresh_progress에서)"""
+        self._pending_progress = ('PDF 변환 중', value, self.captured_pages)
+        
+    def refresh_progress(self):
+        """마지막으로 기록된 진행 상황을 프로그레스바에 반영"""
+        if self._pending_progress is None:
+            return
+        label, value, total = self._pending_progress
+        self._pending_progress = None
+        percent = int((value / total) * 100) if total else 0
         self.progress_bar.setValue(percent)
-        status_text = f'진행중: {value}/{self.page_spin.value()} 페이지 ({percent}%)'
-        self.progress_bar.setFormat(status_text)
-        self.progress_bar.setStyleSheet(StyleManager.get_normal_progressbar_style())
+        self.progress_bar.setFormat(f'{label}: {value}/{total} 페이지 ({percent}%)')
+        
+    def stop_progress_updates(self):
+        """남은 진행 상황을 반영하고 주기적 갱신 중지"""
+        self.refresh_progress()
+        self.progress_timer.stop()
+
+    def set_capture_report(self, report):
+        """캡처 성능 리포트 저장"""
+        self.capture_report = report
+
+    def set_captured_pages(self, count):
+        """실제로 캡처된 페이지 수 저장"""
+        self.captured_pages = count
 
     def finish_capture(self):
         """캡처 완료 후 PDF 변환"""
-        self.start_btn.setEnabled(True)
+        self.refresh_progress()
+        if self.capture_thread.pdf_path:
+            # 캡처 중 이미 PDF가 작성됨
+            self.finish_pdf(self.capture_thread.pdf_path, self.capture_thread.pdf_pages > 0)
+            return
         self.progress_bar.setFormat('PDF 변환 중...')
         self.convert_to_pdf()
         
     def convert_to_pdf(self):
-        """캡처된 이미지들을 PDF로 변환"""
+        """캡처된 이미지들을 백그라운드 스레드에서 PDF로 변환"""
         output_pdf = os.path.join(self.output_dir, self.output_filename)
-        success = PDFConverter.convert_images_to_pdf(
-            self.page_spin.value(), 
-            output_pdf
+        # 캡처 중 이미 후처리했으면 다시 적용하지 않음 (해상도는 작업 디렉토리 기록 사용)
+        processor = self.get_processor() if self.process_on_convert() else None
+        self.convert_thread = ConvertThread(self.captured_pages, output_pdf,
+                                            codec=self.get_codec(),
+                                            target_bytes=self.get_target_bytes(),
+                                            processor=processor)
+        self.convert_thread.progress.connect(self.update_convert_progress)
+        self.convert_thread.error.connect(self.show_convert_error)
+        self.convert_thread.finished.connect(
+            lambda success: self.finish_pdf(output_pdf, success)
         )
+        self.convert_thread.start()
+        
+    def show_convert_error(self, message):
+        """PDF 변환 오류 출력"""
+        print(f"PDF conversion failed: {message}")
         
+    def finish_pdf(self, output_pdf, success):
+        """PDF 생성 결과 표시, 성능 리포트 저장 및 임시 파일 정리"""
+        self.stop_progress_updates()
+        self.start_btn.setEnabled(True)
+        self.save_perf_report(output_pdf)
         if success:
-            self.progress_bar.setFormat(f'완료! {output_pdf} 생성됨')
+            PDFConverter.cleanup_temp_images(self.captured_pages)
+            self.progress_bar.setFormat(f'완료! {output_pdf} 생성됨 ({self.captured_pages} 페이지)')
         else:
             self.progress_bar.setFormat('PDF 변환 실패')
+            self.progress_bar.setStyleSheet(StyleManager.get_error_progressbar_style())
+            
+    def save_perf_report(self, output_pdf):
+        """캡처/변환 단계별 시간을 PDF 옆에 JSON 리포트로 저장"""
+        report = {
+            'output': output_pdf,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'capture': self.capture_report,
+            'conversion': self.convert_thread.stats if self.convert_thread else None,
+        }
+        report_path = os.path.splitext(output_pdf)[0] + '.perf.json'
+        if PerfRecorder.write_report(report_path, report):
+            print(f"Performance report saved: {report_path}")
             
     def select_save_dir(self):
         """저장 경로 선택"""
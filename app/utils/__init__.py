@@ -1,7 +1,30 @@
 """
 유틸리티 모듈
+
+하위 모듈은 이름을 처음 사용할 때 불러온다 (성능 측정만 쓰는 변환 워커가
+mss를 불러오지 않도록).
 """
 
-from .monitor import MonitorManager
+import importlib
+
+# 공개 이름 -> 정의된 하위 모듈
+_EXPORTS = {
+    'MonitorManager': 'monitor',
+    'PerfMonitor': 'perf',
+    'PerfRecorder': 'perf',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['MonitorManager']
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + __all__)
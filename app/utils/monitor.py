@@ -2,17 +2,165 @@
 모니터 관리 유틸리티 모듈 (크로스 플랫폼 호환)
 """
 
+import sys
 import platform
+import threading
 from mss import mss
 
 
 class MonitorManager:
-    """모니터 관리 클래스"""
+    """
+    모니터 관리 클래스
+    
+    모니터 구성(위치/크기, 화면 배율, 이름)은 처음 요청할 때 한 번 조회하여
+    캐시하고, GUI, 좌표 선택 화면, 캡처 스레드가 같은 캐시를 사용한다.
+    watch_screens()를 호출하면 Qt의 화면 추가/제거/변경 시그널에서 캐시를
+    무효화하고 등록된 리스너를 호출한다.
+    """
+    
+    _topology = None
+    _lock = threading.Lock()
+    _listeners = []
+    _watching = False
+    
+    @staticmethod
+    def get_monitors(refresh=False):
+        """
+        사용 가능한 모니터 정보를 반환 (캐시된 구성, 크로스 플랫폼 호환)
+        
+        Args:
+            refresh: True면 캐시를 무시하고 다시 조회
+        
+        Returns:
+            list: 모니터 정보 리스트 (첫 번째 항목 제외), 각 항목은
+                left, top, width, height, scale(화면 배율), name 키를 가진 딕셔너리 복사본
+        """
+        with MonitorManager._lock:
+            if MonitorManager._topology is None or refresh:
+                MonitorManager._topology = MonitorManager._enumerate()
+            return [dict(monitor) for monitor in MonitorManager._topology]
+    
+    @staticmethod
+    def get_monitor(monitor_index):
+        """
+        지정된 모니터 정보 (캐시된 구성)
+        
+        Args:
+            monitor_index: 모니터 인덱스 (0부터 시작)
+            
+        Returns:
+            dict: 모니터 정보 (없는 인덱스면 None)
+        """
+        monitors = MonitorManager.get_monitors()
+        if 0 <= monitor_index < len(monitors):
+            return monitors[monitor_index]
+        return None
+    
+    @staticmethod
+    def invalidate():
+        """캐시된 모니터 구성을 버리고 리스너에 변경 알림"""
+        with MonitorManager._lock:
+            MonitorManager._topology = None
+            listeners = list(MonitorManager._listeners)
+        for listener in listeners:
+            try:
+                listener()
+            except Exception as e:
+                print(f"Monitor listener error: {e}")
+    
+    @staticmethod
+    def add_listener(callback):
+        """모니터 구성이 바뀔 때 인자 없이 호출될 함수 등록"""
+        with MonitorManager._lock:
+            MonitorManager._listeners.append(callback)
+    
+    @staticmethod
+    def remove_listener(callback):
+        """등록된 리스너 제거"""
+        with MonitorManager._lock:
+            if callback in MonitorManager._listeners:
+                MonitorManager._listeners.remove(callback)
+    
+    @staticmethod
+    def watch_screens():
+        """
+        Qt 화면 시그널에 캐시 무효화 연결 (QGuiApplication 생성 후 한 번 호출)
+        
+        모니터를 연결/분리하거나 해상도, 배율, 배치를 바꾸면 캐시가 무효화된다.
+        """
+        from PyQt6.QtGui import QGuiApplication
+        app = QGuiApplication.instance()
+        if app is None or MonitorManager._watching:
+            return
+        MonitorManager._watching = True
+        app.screenAdded.connect(MonitorManager._on_screen_added)
+        app.screenRemoved.connect(lambda screen: MonitorManager.invalidate())
+        for screen in app.screens():
+            MonitorManager._watch_screen(screen)
+    
+    @staticmethod
+    def _on_screen_added(screen):
+        """새 화면의 변경 시그널을 연결하고 캐시 무효화"""
+        MonitorManager._watch_screen(screen)
+        MonitorManager.invalidate()
+    
+    @staticmethod
+    def _watch_screen(screen):
+        """화면 배치/배율 변경 시그널 연결"""
+        screen.geometryChanged.connect(lambda geometry: MonitorManager.invalidate())
+        screen.logicalDotsPerInchChanged.connect(lambda dpi: MonitorManager.invalidate())
+    
+    @staticmethod
+    def _enumerate():
+        """mss로 모니터를 조회하고 Qt 화면 정보(배율, 이름)를 덧붙임"""
+        monitors = [dict(monitor) for monitor in MonitorManager._enumerate_mss()]
+        screens = MonitorManager._qt_screens()
+        for index, monitor in enumerate(monitors):
+            screen = MonitorManager._match_screen(monitor, screens)
+            monitor['scale'] = float(screen.devicePixelRatio()) if screen is not None else 1.0
+            name = screen.name() if screen is not None else ''
+            monitor['name'] = name or MonitorManager.get_display_name(index)
+        return monitors
     
     @staticmethod
-    def get_monitors():
+    def _qt_screens():
         """
-        사용 가능한 모니터 정보를 반환 (크로스 플랫폼 호환)
+        Qt 화면 목록 (Qt 애플리케이션이 실행 중일 때만)
+        
+        헤드리스 실행에서 GUI 라이브러리를 불러오지 않도록 이미 import된 경우만 사용한다.
+        """
+        qtgui = sys.modules.get('PyQt6.QtGui')
+        if qtgui is None or qtgui.QGuiApplication.instance() is None:
+            return []
+        return qtgui.QGuiApplication.screens()
+    
+    @staticmethod
+    def _match_screen(monitor, screens):
+        """
+        mss 모니터에 해당하는 Qt 화면 찾기
+        
+        mss 좌표는 플랫폼에 따라 논리 좌표(macOS) 또는 장치 픽셀(Windows)이므로
+        두 가지를 모두 비교하고, 맞는 것이 없으면 모니터 중앙을 포함하는 화면을 사용한다.
+        """
+        target = (monitor['left'], monitor['top'], monitor['width'], monitor['height'])
+        for screen in screens:
+            geometry = screen.geometry()
+            ratio = screen.devicePixelRatio()
+            logical = (geometry.x(), geometry.y(), geometry.width(), geometry.height())
+            physical = tuple(round(value * ratio) for value in logical)
+            if target in (logical, physical):
+                return screen
+        center_x = monitor['left'] + monitor['width'] // 2
+        center_y = monitor['top'] + monitor['height'] // 2
+        for screen in screens:
+            if screen.geometry().contains(center_x, center_y):
+                return screen
+        return None
+    
+    @staticmethod
+    def _enumerate_mss():
+        """
+        mss로 모니터 목록 조회 (크로스 플랫폼 호환)
         
         Returns:
             list: 모니터 정보 리스트 (첫 번째 항목 제외)
@@ -51,9 +199,8 @@ class MonitorManager:
         Returns:
             dict: {'top': int, 'left': int} 형태의 오프셋 정보
         """
-        monitors = MonitorManager.get_monitors()
-        if 0 <= monitor_index < len(monitors):
-            monitor = monitors[monitor_index]
+        monitor = MonitorManager.get_monitor(monitor_index)
+        if monitor is not None:
             return {
                 'top': monitor['top'],
                 'left': monitor['left']
@@ -61,23 +208,37 @@ class MonitorManager:
         return {'top': 0, 'left': 0}
     
     @staticmethod
-    def get_monitor_info_text(monitor_index, monitor):
+    def get_display_name(monitor_index):
         """
-        모니터 정보를 텍스트로 반환 (크로스 플랫폼 호환)
+        플랫폼별 모니터 표시 이름
         
         Args:
             monitor_index: 모니터 인덱스
-            monitor: 모니터 정보 딕셔너리
             
         Returns:
-            str: 모니터 정보 텍스트
+            str: 표시 이름
         """
-        # 플랫폼별 모니터 이름 지정
         if platform.system() == "Darwin":  # macOS
-            display_name = f"디스플레이 {monitor_index + 1}"
+            return f"디스플레이 {monitor_index + 1}"
         elif platform.system() == "Windows":
-            display_name = f"모니터 {monitor_index + 1}"
+            return f"모니터 {monitor_index + 1}"
         else:  # Linux
-            display_name = f"화면 {monitor_index + 1}"
+            return f"화면 {monitor_index + 1}"
+    
+    @staticmethod
+    def get_monitor_info_text(monitor_index, monitor):
+        """
+        모니터 정보를 텍스트로 반환 (크로스 플랫폼 호환)
+        
+        Args:
+            monitor_index: 모니터 인덱스
+            monitor: 모니터 정보 딕셔너리
             
-        return f"{display_name}: {monitor['width']}x{monitor['height']}"
\ No newline at end of file
+        Returns:
+            str: 모니터 정보 텍스트
+        """
+        text = f"{MonitorManager.get_display_name(monitor_index)}: {monitor['width']}x{monitor['height']}"
+        scale = monitor.get('scale', 1.0)
+        if scale != 1.0:
+            text += f" ({scale * 100:.0f}%)"
+        return text
\ No newline at end of file
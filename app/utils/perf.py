@@ -0,0 +1,255 @@
+"""
+성능 측정 유틸리티 모듈 (크로스 플랫폼 호환)
+"""
+
+import json
+import time
+import platform
+import threading
+from contextlib import contextmanager
+
+
+class PerfMonitor:
+    """
+    프로세스 자원 사용량 측정 클래스
+
+    인스턴스를 with 블록(또는 start()/stop())으로 사용하면 그 구간 동안 현재
+    메모리 사용량을 주기적으로 확인하여 구간 안의 최대값을 기록한다. psutil이
+    설치되어 있으면 프로세스 풀 워커 같은 자식 프로세스의 메모리도 합산한다.
+    """
+
+    # 구간 측정 시 메모리 사용량 확인 간격 (초)
+    SAMPLE_INTERVAL = 0.05
+
+    def __init__(self, interval=None):
+        """
+        Args:
+            interval: 메모리 사용량 확인 간격 (초, None이면 SAMPLE_INTERVAL)
+        """
+        self.interval = interval or self.SAMPLE_INTERVAL
+        self.start_mb = None
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """구간 측정 시작 (시작 시점 사용량을 기준으로 기록)"""
+        self.start_mb = self.rss_mb()
+        self.peak_mb = self.start_mb
+        if self.start_mb is None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        구간 측정 종료
+
+        Returns:
+            float: 구간 안의 최대 메모리 사용량 (MB, 측정할 수 없으면 None)
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self._update_peak()
+        return self.peak_mb
+
+    @property
+    def delta_mb(self):
+        """구간 시작 대비 최대 메모리 증가량 (MB, 측정할 수 없으면 None)"""
+        if self.start_mb is None or self.peak_mb is None:
+            return None
+        return self.peak_mb - self.start_mb
+
+    def _sample_loop(self):
+        """측정 스레드: 종료될 때까지 주기적으로 최대값 갱신"""
+        while not self._stop.wait(self.interval):
+            self._update_peak()
+
+    def _update_peak(self):
+        current = self.rss_mb()
+        if current is not None and (self.peak_mb is None or current > self.peak_mb):
+            self.peak_mb = current
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @staticmethod
+    def rss_mb(include_children=True):
+        """
+        현재 메모리 사용량(RSS)을 반환
+
+        psutil이 있으면 자식 프로세스까지 합산하고, 없으면 현재 프로세스만 측정한다.
+
+        Args:
+            include_children: True면 자식 프로세스의 사용량도 합산 (psutil 필요)
+
+        Returns:
+            float: MB 단위 RSS (측정할 수 없으면 None)
+        """
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+
+        try:
+            if psutil is not None:
+                process = psutil.Process()
+                total = process.memory_info().rss
+                if include_children:
+                    for child in process.children(recursive=True):
+                        try:
+                            total += child.memory_info().rss
+                        except psutil.Error:
+                            # 측정 중 종료된 워커
+                            pass
+                return total / (1024 * 1024)
+
+            if platform.system() == "Windows":
+                counters = PerfMonitor._windows_memory_counters()
+                return counters.WorkingSetSize / (1024 * 1024) if counters else None
+
+            if platform.system() == "Linux":
+                import resource
+                with open("/proc/self/statm") as f:
+                    resident_pages = int(f.read().split()[1])
+                return resident_pages * resource.getpagesize() / (1024 * 1024)
+
+            # 그 밖의 운영체제는 psutil 없이 현재 사용량을 알 수 없음
+            return None
+        except Exception as e:
+            print(f"Memory measurement error: {e}")
+            return None
+
+    @staticmethod
+    def _windows_memory_counters():
+        """Windows 현재 프로세스의 PROCESS_MEMORY_COUNTERS (실패하면 None)"""
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD),
+                ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(
+                handle, ctypes.byref(counters), counters.cb):
+            return None
+        return counters
+
+
+class PerfRecorder:
+    """
+    단계별 소요 시간 수집기 (스레드 안전)
+
+    단계 이름별로 측정값을 모아 통계와 히스토그램을 만든다.
+    """
+
+    # 히스토그램 구간 상한 (밀리초)
+    HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self):
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        """
+        측정값 추가
+
+        Args:
+            stage: 단계 이름 (예: 'grab', 'encode')
+            seconds: 소요 시간 (초)
+        """
+        with self._lock:
+            self._samples.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def measure(self, stage):
+        """with 블록의 소요 시간을 stage로 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def summary(self):
+        """
+        단계별 통계 반환
+
+        Returns:
+            dict: {단계: {count, total_s, mean_ms, p50_ms, p90_ms, p99_ms, max_ms, histogram}}
+                histogram은 '<=N ms' 구간별 개수이며 마지막 구간은 '>N ms'
+        """
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+
+        result = {}
+        for stage, values in samples.items():
+            if not values:
+                continue
+            ms = [value * 1000 for value in values]
+            histogram = {}
+            index = 0
+            for bucket in self.HISTOGRAM_BUCKETS_MS:
+                count = 0
+                while index < len(ms) and ms[index] <= bucket:
+                    count += 1
+                    index += 1
+                histogram[f"<={bucket}ms"] = count
+            histogram[f">{self.HISTOGRAM_BUCKETS_MS[-1]}ms"] = len(ms) - index
+
+            result[stage] = {
+                'count': len(ms),
+                'total_s': round(sum(values), 4),
+                'mean_ms': round(sum(ms) / len(ms), 3),
+                'p50_ms': round(self._percentile(ms, 50), 3),
+                'p90_ms': round(self._percentile(ms, 90), 3),
+                'p99_ms': round(self._percentile(ms, 99), 3),
+                'max_ms': round(ms[-1], 3),
+                'histogram': histogram,
+            }
+        return result
+
+    @staticmethod
+    def _percentile(sorted_values, percent):
+        """정렬된 값 목록의 백분위수 (nearest-rank)"""
+        rank = max(1, -(-len(sorted_values) * percent // 100))
+        return sorted_values[int(rank) - 1]
+
+    @staticmethod
+    def write_report(path, report):
+        """
+        성능 리포트를 JSON 파일로 저장
+
+        Args:
+            path: 저장 경로
+            report: 리포트 딕셔너리
+
+        Returns:
+            bool: 저장 성공 여부
+        """
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            return True
+        except Exception as e:
+            print(f"Performance report error: {e}")
+            return False
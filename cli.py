@@ -0,0 +1,621 @@
+"""
+이북 PDF 변환기 명령줄 실행
+
+GUI 없이 화면 캡처와 PDF 변환을 실행하거나 측정한다. 옵션은 명령줄 또는
+JSON 설정 파일(--config)로 지정하며, 같은 옵션이 둘 다 있으면 명령줄 값을
+사용한다. Qt 위젯은 만들지 않고, 필요한 모듈은 명령을 실행할 때 하위 모듈에서
+직접 불러온다. --help와 옵션 오류는 바로 응답하고, 변환(convert, bench)은 Qt와
+mss 없이 NumPy와 PyMuPDF만으로 실행된다 (Qt와 mss는 캡처할 때만 필요).
+
+명령:
+    capture  지정한 영역을 캡처하여 작업 디렉토리에 저장 (--output이면 캡처하면서 PDF 작성)
+    convert  작업 디렉토리의 캡처 결과를 PDF로 변환
+    run      캡처 후 PDF 변환 (GUI의 캡처 시작과 같은 흐름)
+    bench    작업 디렉토리의 페이지로 임시 저장 형식, 후처리, PDF 변환 성능 측정
+    queue    여러 책 일괄 변환 작업 큐 (profile, add, list, run, retry)
+
+사용 예:
+    python cli.py capture --region 100,80,1300,1680 --pages 300 --delay 0.4
+    python cli.py convert --work-dir img --output book.pdf --target-mb 50
+    python cli.py run --config book.json --output book.pdf
+    python cli.py bench --work-dir img --report bench.json
+    python cli.py queue profile kindle --region 100,80,1300,1680 --delay 0.4 --wait-stable
+    python cli.py queue add --profile kindle --pages 300 --output books/a.pdf
+    python cli.py queue run
+
+설정 파일은 옵션 이름을 키로 쓰는 JSON 객체이다 ('-' 대신 '_'도 가능):
+    {"region": [100, 80, 1300, 1680], "pages": 300, "delay": 0.4,
+     "wait_stable": true, "auto_stop": true, "paper": "A5", "cleanup": true}
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+
+
+def parse_region(text):
+    """
+    캡처 영역 해석
+
+    Args:
+        text: 'x1,y1,x2,y2' 문자열 또는 네 정수의 리스트
+
+    Returns:
+        tuple: (x1, y1, x2, y2)
+    """
+    values = text.split(',') if isinstance(text, str) else list(text)
+    try:
+        x1, y1, x2, y2 = (int(value) for value in values)
+    except (TypeError, ValueError):
+        raise argparse.ArgumentTypeError(f"region must be x1,y1,x2,y2: {text}")
+    if x2 <= x1 or y2 <= y1:
+        raise argparse.ArgumentTypeError(f"empty region: {text}")
+    return x1, y1, x2, y2
+
+
+def set_option_defaults(parser, **defaults):
+    """
+    옵션 기본값 지정
+
+    작업 큐 명령(argument_default=SUPPRESS)은 지정한 옵션만 작업 설정으로 저장하고
+    나머지는 프로필과 JobQueue.DEFAULTS 값을 쓰므로 기본값을 두지 않는다.
+    """
+    if parser.argument_default is not argparse.SUPPRESS:
+        parser.set_defaults(**defaults)
+
+
+def add_capture_options(parser):
+    """캡처 영역, 타이밍, 중간 저장 옵션"""
+    group = parser.add_argument_group('capture')
+    group.add_argument('--region', type=parse_region, metavar='X1,Y1,X2,Y2',
+                       help='모니터 기준 캡처 영역')
+    group.add_argument('--monitor', type=int, help='모니터 번호 (기본 0)')
+    group.add_argument('--pages', type=int, help='캡처할 페이지 수 (--auto-stop이면 최대값)')
+    group.add_argument('--delay', type=float,
+                       help='페이지 넘김 딜레이 초 (--wait-stable이면 최대 대기 시간)')
+    group.add_argument('--start-delay', type=float,
+                       help='캡처 시작 전 대기 초 (리더 창으로 전환할 시간)')
+    group.add_argument('--wait-stable', action='store_true', help='화면이 멈추는 즉시 캡처')
+    group.add_argument('--auto-stop', action='store_true', help='마지막 페이지 자동 감지')
+    group.add_argument('--retry-missed', action='store_true',
+                       help='페이지가 넘어가지 않으면 키 재입력')
+    group.add_argument('--spread', choices=('ltr', 'rtl'),
+                       help='두 쪽 펼침 분할 (ltr: 왼쪽부터, rtl: 오른쪽부터)')
+    group.add_argument('--intermediate',
+                       help="임시 저장 형식 ('spool', 'png:1', 'bmp', 'zraw:1' 등)")
+    group.add_argument('--encoder-workers', type=int, help='캡처 인코더 스레드 수')
+    group.add_argument('--replay', metavar='DIR',
+                       help='화면 대신 이미지 디렉토리나 녹화된 세션을 재생')
+    group.add_argument('--record', metavar='DIR',
+                       help='캡처한 화면과 렌더링 지연을 녹화 (--replay로 재생 가능)')
+    set_option_defaults(parser, monitor=0, delay=0.5, start_delay=0.0, intermediate='spool')
+
+
+def add_convert_options(parser):
+    """PDF 출력과 코덱 옵션"""
+    group = parser.add_argument_group('pdf')
+    group.add_argument('--output', '-o', help='출력 PDF 경로')
+    group.add_argument('--codec',
+                       help="페이지 코덱 ('auto', 'auto:70', 'lossless', 'raw', "
+                            "'auto:60,scale=0.85,threshold' 등)")
+    group.add_argument('--engine', choices=('pymupdf', 'pillow'))
+    group.add_argument('--workers', type=int, help='페이지 압축 프로세스 수 (기본 CPU 수)')
+    group.add_argument('--target-mb', type=float, help='목표 PDF 크기 (MB)')
+    group.add_argument('--no-dedup', action='store_true', help='중복 페이지 이미지 공유 안 함')
+    group.add_argument('--keep-temp', action='store_true', help='변환 후 임시 파일 유지')
+    set_option_defaults(parser, codec='auto', engine='pymupdf')
+
+
+def add_processing_options(parser):
+    """페이지 후처리 옵션"""
+    group = parser.add_argument_group('processing')
+    group.add_argument('--paper', metavar='NAME',
+                       help="용지 맞춤 축소 ('A5', '148x210', 화면 배율 보정은 'screen')")
+    group.add_argument('--dpi', type=float, help='목표 해상도 (기본 300)')
+    group.add_argument('--crop', choices=('book', 'page'),
+                       help='여백 자르기 (book: 책 전체 동일, page: 페이지별)')
+    group.add_argument('--cleanup', action='store_true', help='배경 흰색 처리 및 대비 보정')
+    group.add_argument('--threshold', action='store_true', help='글자 페이지 흑백 변환')
+    set_option_defaults(parser, dpi=300.0)
+
+
+def build_parser():
+    """
+    명령줄 파서 생성
+
+    Returns:
+        tuple: (최상위 파서, 명령 이름별 하위 파서 딕셔너리)
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--config', metavar='FILE', help='JSON 설정 파일')
+    common.add_argument('--work-dir', default='img', help='임시 이미지 디렉토리 (기본 img)')
+    common.add_argument('--report', metavar='FILE',
+                        help='JSON 리포트 경로 (기본: PDF 옆 <파일명>.perf.json)')
+    common.add_argument('--quiet', '-q', action='store_true', help='진행 상황 출력 안 함')
+
+    parser = argparse.ArgumentParser(
+        prog='cli.py', description='이북 PDF 변환기 (GUI 없이 실행)')
+    subparsers = parser.add_subparsers(dest='command', metavar='command', required=True)
+    commands = {
+        'capture': subparsers.add_parser('capture', parents=[common], help='화면 캡처'),
+        'convert': subparsers.add_parser('convert', parents=[common],
+                                         help='캡처 결과를 PDF로 변환'),
+        'run': subparsers.add_parser('run', parents=[common], help='캡처 후 PDF 변환'),
+        'bench': subparsers.add_parser('bench', parents=[common],
+                                       help='형식/후처리/변환 성능 측정'),
+    }
+    for name in ('capture', 'run'):
+        add_capture_options(commands[name])
+    for name in ('capture', 'convert', 'run', 'bench'):
+        add_convert_options(commands[name])
+        add_processing_options(commands[name])
+    commands['convert'].add_argument('--pages', type=int,
+                                     help='변환할 페이지 수 (기본: 작업 디렉토리에서 감지)')
+    bench = commands['bench']
+    bench.add_argument('--pages', type=int, help='변환 측정에 사용할 페이지 수 (기본 전체)')
+    bench.add_argument('--samples', type=int, default=8,
+                       help='형식/후처리 측정 표본 페이지 수 (기본 8)')
+    bench.add_argument('--formats', help="측정할 임시 저장 형식 (쉼표 구분, 기본 전체)")
+
+    # 작업 큐: 지정한 옵션만 저장하도록 기본값 없이 해석
+    queue_common = argparse.ArgumentParser(add_help=False)
+    queue_common.add_argument('--queue', default='jobs.json',
+                              help='작업 큐 파일 (기본 jobs.json)')
+    commands['queue'] = subparsers.add_parser('queue', help='여러 책 일괄 변환 작업 큐')
+    actions = commands['queue'].add_subparsers(dest='action', metavar='action', required=True)
+    profile = actions.add_parser('profile', parents=[queue_common],
+                                 argument_default=argparse.SUPPRESS,
+                                 help='영역 프로필 저장 (캡처 옵션)')
+    profile.add_argument('name', help='프로필 이름')
+    add_capture_options(profile)
+    add = actions.add_parser('add', parents=[queue_common], argument_default=argparse.SUPPRESS,
+                             help='작업 추가 (프로필 값을 옵션으로 덮어씀)')
+    add.add_argument('--profile', help='영역 프로필 이름')
+    add.add_argument('--name', help='작업 이름 (기본: 출력 파일 이름)')
+    add.add_argument('--max-attempts', type=int, help='최대 시도 횟수 (기본 3)')
+    add_capture_options(add)
+    add_convert_options(add)
+    add_processing_options(add)
+    actions.add_parser('list', parents=[queue_common], help='작업 목록')
+    run = actions.add_parser('run', parents=[queue_common],
+                             help='대기 중인 작업 처리 (캡처와 변환을 겹쳐 실행)')
+    run.add_argument('--convert-workers', type=int, default=1,
+                     help='동시에 변환할 책 수 (기본 1)')
+    retry = actions.add_parser('retry', parents=[queue_common], help='실패한 작업 다시 대기')
+    retry.add_argument('ids', type=int, nargs='*', help='작업 번호 (기본: 실패한 작업 전체)')
+
+    for name, command in commands.items():
+        command.set_defaults(handler=globals()[f'cmd_{name}'])
+    return parser, commands
+
+
+def load_config(path):
+    """
+    JSON 설정 파일 읽기
+
+    Returns:
+        dict: 옵션 이름('-'는 '_'로 바꿈)별 값
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError("config must be a JSON object")
+    return {key.replace('-', '_'): value for key, value in config.items()}
+
+
+def parse_args(argv=None):
+    """
+    명령줄과 설정 파일을 합쳐 옵션 해석
+
+    설정 파일 값을 하위 파서의 기본값으로 넣고 다시 해석하므로, 명령줄에서
+    지정한 옵션이 설정 파일보다 우선한다.
+
+    Returns:
+        argparse.Namespace: 해석된 옵션
+    """
+    parser, commands = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, 'config', None):
+        return check_paper(args, commands)
+
+    command = commands[args.command]
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError) as e:
+        command.error(f"cannot read config {args.config}: {e}")
+    unknown = sorted(set(config) - (set(vars(args)) - {'command', 'handler', 'config'}))
+    if unknown:
+        command.error(f"unknown options in {args.config}: {', '.join(unknown)}")
+    command.set_defaults(**config)
+    args = parser.parse_args(argv)
+    if isinstance(getattr(args, 'region', None), list):
+        # 설정 파일의 [x1, y1, x2, y2] 리스트 (문자열은 argparse가 변환)
+        try:
+            args.region = parse_region(args.region)
+        except argparse.ArgumentTypeError as e:
+            command.error(str(e))
+    return check_paper(args, commands)
+
+
+def check_paper(args, commands):
+    """
+    --paper screen 검증
+
+    화면 배율 보정은 캡처한 모니터의 배율을 쓰므로 모니터를 지정하지 않는
+    명령(convert, bench)에서는 받지 않는다 (처리 없이 변환되는 것을 막음).
+
+    Returns:
+        argparse.Namespace: 그대로 돌려준 옵션
+    """
+    if getattr(args, 'paper', None) == 'screen' and args.command in ('convert', 'bench'):
+        commands[args.command].error(
+            "--paper screen needs the capture monitor; use it with capture or run")
+    return args
+
+
+def make_processor(args):
+    """옵션에 맞는 PageProcessor (처리할 것이 없으면 None)"""
+    from app.core.processing import PageProcessor
+
+    paper = args.paper
+    scale = None
+    if paper == 'screen':
+        from app.utils.monitor import MonitorManager
+        monitor = MonitorManager.get_monitor(args.monitor)
+        scale = monitor.get('scale', 1.0) if monitor else 1.0
+        paper = None
+    return PageProcessor.build(paper=paper, dpi=args.dpi, crop=args.crop,
+                               cleanup=args.cleanup, threshold=args.threshold,
+                               source_scale=scale)
+
+
+def target_bytes(args):
+    """목표 PDF 크기 (바이트, 제한 없으면 None)"""
+    return int(args.target_mb * 1024 * 1024) if args.target_mb else None
+
+
+def report_path(args):
+    """리포트 저장 경로 (--report가 없으면 PDF 옆, PDF도 없으면 None)"""
+    if args.report:
+        return args.report
+    if args.output:
+        return os.path.splitext(args.output)[0] + '.perf.json'
+    return None
+
+
+def write_report(args, report):
+    """리포트를 JSON으로 저장"""
+    from app.utils.perf import PerfRecorder
+
+    path = report_path(args)
+    if path and PerfRecorder.write_report(path, report):
+        print(f"Performance report saved: {path}")
+
+
+def print_progress(args, label, total):
+    """
+    진행 상황을 표준 오류에 한 줄로 갱신하는 콜백
+
+    Returns:
+        function: 처리한 페이지 수를 받는 함수 (--quiet이면 아무것도 하지 않음)
+    """
+    def update(value):
+        if args.quiet:
+            return
+        suffix = f"/{total}" if total else ""
+        print(f"\r{label}: {value}{suffix} 페이지", end='', file=sys.stderr, flush=True)
+    return update
+
+
+def end_progress(args):
+    """진행 상황 줄 마무리"""
+    if not args.quiet:
+        print(file=sys.stderr)
+
+
+def run_capture(args, pdf_path=None, processor=None):
+    """
+    CaptureThread를 현재 스레드에서 실행
+
+    Args:
+        args: 해석된 옵션
+        pdf_path: 캡처하면서 작성할 PDF 경로 (None이면 작업 디렉토리에만 저장)
+        processor: 캡처 중 적용할 PageProcessor
+
+    Returns:
+        tuple: (저장된 페이지 수, 캡처 성능 리포트, CaptureThread)
+    """
+    from app.core.capture import CaptureThread
+    from app.core.processing import SpreadSplitter
+    from app.core.sources import ReplayFrameSource, ReplayPageTurner
+
+    source = turner = None
+    region = args.region
+    monitor = args.monitor
+    if args.replay:
+        source = ReplayFrameSource(args.replay)
+        turner = ReplayPageTurner(source)
+        # 재생 프레임은 영역과 모니터 위치를 쓰지 않음
+        region = region or (0, 0, 0, 0)
+        monitor = {'top': 0, 'left': 0}
+
+    if args.start_delay > 0:
+        if not args.quiet:
+            print(f"{args.start_delay:g}초 후 캡처를 시작합니다...", file=sys.stderr)
+        time.sleep(args.start_delay)
+
+    thread = CaptureThread(
+        *region, args.pages, monitor, args.delay,
+        encoder_workers=args.encoder_workers,
+        wait_stable=args.wait_stable,
+        auto_stop=args.auto_stop,
+        retry_missed=args.retry_missed,
+        source=source,
+        turner=turner,
+        pdf_path=pdf_path,
+        work_dir=args.work_dir,
+        intermediate=args.intermediate,
+        codec=args.codec,
+        processor=processor,
+        spread=SpreadSplitter(rtl=args.spread == 'rtl') if args.spread else None,
+        record_dir=args.record
+    )
+    result = {'pages': 0, 'report': None}
+    thread.progress.connect(print_progress(args, '캡처', args.pages))
+    thread.timings.connect(lambda report: result.update(report=report))
+    thread.pages_captured.connect(lambda count: result.update(pages=count))
+    try:
+        thread.run()
+    finally:
+        end_progress(args)
+    return result['pages'], result['report'], thread
+
+
+def run_convert(args, page_count, processor, output=None):
+    """
+    작업 디렉토리의 페이지를 PDF로 변환
+
+    Args:
+        args: 해석된 옵션
+        page_count: 변환할 페이지 수
+        processor: 압축 전에 적용할 PageProcessor
+        output: 출력 PDF 경로 (None이면 --output)
+
+    Returns:
+        tuple: (성공 여부, 변환 통계 딕셔너리)
+    """
+    from app.core.converter import PDFConverter
+
+    stats = {}
+    try:
+        success = PDFConverter.convert_images_to_pdf(
+            page_count, output or args.output, args.work_dir,
+            engine=args.engine,
+            stats=stats,
+            progress_callback=print_progress(args, 'PDF 변환', page_count),
+            codec=args.codec,
+            workers=args.workers,
+            dedup=not args.no_dedup,
+            target_bytes=target_bytes(args),
+            processor=processor)
+    finally:
+        end_progress(args)
+    return success, stats
+
+
+def check_capture_args(args):
+    """캡처 옵션 검증 (문제가 있으면 오류 메시지, 없으면 None)"""
+    if args.region is None and not args.replay:
+        return "--region is required (or --replay)"
+    if args.pages is None and not args.auto_stop:
+        return "--pages is required unless --auto-stop is set"
+    return None
+
+
+def cmd_capture(args):
+    """capture 명령: 캡처만 실행 (--output이면 캡처하면서 PDF 작성)"""
+    error = check_capture_args(args)
+    if error:
+        print(error, file=sys.stderr)
+        return 2
+    if args.crop is not None and args.output:
+        # 여백 자르기는 변환 단계에서만 적용하므로 캡처 중 PDF 작성과 함께 쓸 수 없음
+        print("--crop cannot be combined with --output; use run or convert", file=sys.stderr)
+        return 2
+    # 여백 자르기를 하면 모든 후처리를 convert 단계로 미룸 (두 번 처리하지 않도록)
+    processor = make_processor(args) if args.crop is None else None
+    pages, capture_report, thread = run_capture(args, args.output, processor)
+    print(f"캡처 완료: {pages} 페이지 ({args.work_dir})")
+    write_report(args, {
+        'command': 'capture',
+        'output': args.output,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'capture': capture_report,
+    })
+    if args.output:
+        return 0 if thread.pdf_pages > 0 else 1
+    return 0 if pages > 0 else 1
+
+
+def cmd_convert(args):
+    """convert 명령: 작업 디렉토리의 캡처 결과를 PDF로 변환"""
+    from app.core.converter import PDFConverter
+
+    if not args.output:
+        print("--output is required", file=sys.stderr)
+        return 2
+    page_count = args.pages or PDFConverter.count_pages(args.work_dir)
+    if not page_count:
+        print(f"No captured pages in {args.work_dir}", file=sys.stderr)
+        return 1
+    success, stats = run_convert(args, page_count, make_processor(args))
+    write_report(args, {
+        'command': 'convert',
+        'output': args.output,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'capture': None,
+        'conversion': stats,
+    })
+    if success and not args.keep_temp:
+        PDFConverter.cleanup_temp_images(page_count, args.work_dir)
+    return 0 if success else 1
+
+
+def cmd_run(args):
+    """
+    run 명령: 캡처 후 PDF 변환
+
+    GUI와 같이 목표 크기나 여백 자르기는 표본 페이지가 필요하므로 변환 단계에서
+    처리하고, 그 밖에는 캡처하면서 PDF를 작성한다.
+    """
+    from app.core.converter import PDFConverter
+
+    error = check_capture_args(args) or (None if args.output else "--output is required")
+    if error:
+        print(error, file=sys.stderr)
+        return 2
+    processor = make_processor(args)
+    process_on_convert = args.crop is not None
+    incremental = (args.engine == 'pymupdf' and target_bytes(args) is None
+                   and not process_on_convert)
+
+    pages, capture_report, thread = run_capture(
+        args, args.output if incremental else None,
+        None if process_on_convert else processor)
+    stats = None
+    if incremental:
+        success = thread.pdf_pages > 0
+    elif pages:
+        # 캡처 중 후처리한 페이지는 다시 처리하지 않음
+        success, stats = run_convert(args, pages, processor if process_on_convert else None)
+    else:
+        success = False
+
+    write_report(args, {
+        'command': 'run',
+        'output': args.output,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'capture': capture_report,
+        'conversion': stats,
+    })
+    if success:
+        if not args.keep_temp:
+            PDFConverter.cleanup_temp_images(pages, args.work_dir)
+        print(f"완료! {args.output} 생성됨 ({pages} 페이지)")
+        return 0
+    print("PDF 변환 실패", file=sys.stderr)
+    return 1
+
+
+def cmd_bench(args):
+    """bench 명령: 작업 디렉토리의 페이지로 형식/후처리/변환 성능 측정 (결과는 JSON 출력)"""
+    import tempfile
+    import contextlib
+    from app.core.converter import PDFConverter
+    from app.core.formats import IntermediateFormat
+
+    page_count = args.pages or PDFConverter.count_pages(args.work_dir)
+    if not page_count:
+        print(f"No captured pages in {args.work_dir}", file=sys.stderr)
+        return 1
+    samples = [PDFConverter.read_page(args.work_dir, page_index) for page_index in
+               PDFConverter.sample_indices(page_count, args.samples)]
+    samples = [image for image in samples if image is not None]
+    processor = make_processor(args)
+
+    specs = args.formats.split(',') if args.formats else None
+    report = {
+        'command': 'bench',
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'input': args.work_dir,
+        'pages': page_count,
+        'sample_pages': len(samples),
+        'formats': IntermediateFormat.benchmark(samples, specs),
+        'processing': None,
+        'conversion': None,
+    }
+    if processor:
+        if processor.needs_fit:
+            processor.fit(samples)
+        report['processing'] = processor.benchmark(samples)
+
+    # 표준 출력은 JSON 결과만 쓰도록 변환 로그는 표준 오류로 보냄
+    with tempfile.TemporaryDirectory() as temp_dir, contextlib.redirect_stdout(sys.stderr):
+        output = os.path.join(temp_dir, 'bench.pdf')
+        success, stats = run_convert(args, page_count, processor, output)
+        if success:
+            stats['pdf_bytes'] = os.path.getsize(output)
+        report['conversion'] = stats
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.report:
+        with contextlib.redirect_stdout(sys.stderr):
+            write_report(args, report)
+    return 0 if success else 1
+
+
+def cmd_queue(args):
+    """queue 명령: 작업 큐 관리와 실행"""
+    from app.core.jobs import JobQueue, JobScheduler
+
+    try:
+        queue = JobQueue(args.queue)
+        if args.action == 'profile':
+            settings = {key: value for key, value in vars(args).items()
+                        if key in JobQueue.DEFAULTS}
+            queue.set_profile(args.name, settings)
+            print(f"프로필 저장: {args.name} {settings}")
+            return 0
+
+        if args.action == 'add':
+            if 'output' not in args:
+                print("--output is required", file=sys.stderr)
+                return 2
+            settings = {key: value for key, value in vars(args).items()
+                        if key in JobQueue.DEFAULTS}
+            job = queue.add(args.output, profile=getattr(args, 'profile', None),
+                            name=getattr(args, 'name', None),
+                            max_attempts=getattr(args, 'max_attempts', None), **settings)
+            print(f"작업 {job['id']} 추가: {job['name']} -> {job['output']}")
+            return 0
+
+        if args.action == 'retry':
+            count = queue.retry(args.ids or None)
+            print(f"{count}개 작업을 다시 대기 상태로 바꿨습니다")
+            return 0
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    if args.action == 'list':
+        for job in queue.jobs:
+            line = (f"{job['id']:>4}  {job['status']:<10} {job['attempts']}/{job['max_attempts']}  "
+                    f"{job['pages']:>5}p  {job['name']} -> {job['output']}")
+            if job['error']:
+                line += f"  ({job['error']})"
+            print(line)
+        return 0
+
+    summary = JobScheduler(queue, args.convert_workers).run()
+    print(f"완료 {summary['done']}, 실패 {summary['failed']} ({summary['seconds']}초)")
+    return 0 if summary['failed'] == 0 else 1
+
+
+def main(argv=None):
+    """
+    명령 실행
+
+    Returns:
+        int: 종료 코드 (0 성공, 1 실패, 2 옵션 오류)
+    """
+    args = parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    # PDF 변환 프로세스 풀 지원 (Windows 패키징 빌드)
+    multiprocessing.freeze_support()
+    sys.exit(main())
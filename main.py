@@ -11,6 +11,7 @@
 """
 
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 from app.gui import MainWindow
 
@@ -24,4 +25,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # PDF 변환 프로세스 풀 지원 (Windows 패키징 빌드)
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""
+테스트 공통 설정
+
+저장소 루트에서 `python -m pytest`로 실행하며, 어느 디렉토리에서 실행해도
+app 패키지를 가져올 수 있도록 저장소 루트를 경로에 추가한다.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,166 @@
+"""캡처 루프와 녹화/재생 소스 테스트 (디스플레이 없이 실행)"""
+
+import json
+
+import pytest
+from PIL import Image
+
+from app.core.capture import CaptureThread
+from app.core.sources import (Frame, FrameSource, PageTurner, ReplayFrameSource,
+                              ReplayPageTurner, RecordingFrameSource, RecordingPageTurner)
+
+SHADES = [230, 170, 110, 50]
+
+
+def solid(shade):
+    """단색 8x8 프레임"""
+    return Frame.from_image(Image.new('RGB', (8, 8), (shade, shade, shade)))
+
+
+@pytest.fixture
+def book(tmp_path):
+    """페이지마다 밝기가 다른 재생용 이미지 디렉토리"""
+    directory = tmp_path / 'book'
+    directory.mkdir()
+    for index, shade in enumerate(SHADES):
+        Image.new('RGB', (40, 60), (shade, shade, shade)).save(directory / f'{index}.png')
+    return str(directory)
+
+
+def run_capture(tmp_path, source, pages, delay, turner=None, **options):
+    """
+    재생 소스로 캡처 루프를 실행
+
+    Returns:
+        tuple: (CaptureThread, 저장된 페이지의 밝기 목록)
+    """
+    work_dir = tmp_path / 'work'
+    thread = CaptureThread(0, 0, 0, 0, pages, {'top': 0, 'left': 0}, delay,
+                           poll_interval=0.02, source=source,
+                           turner=turner or ReplayPageTurner(source),
+                           work_dir=str(work_dir), intermediate='png:1', **options)
+    thread.run()
+    assert not thread.errors
+    shades = []
+    for index in range(1, thread.captured_count + 1):
+        with Image.open(work_dir / f'page_{index}.png') as image:
+            shades.append(image.getpixel((0, 0))[0])
+    return thread, shades
+
+
+def test_wait_stable_outlasts_render_latency(tmp_path, book):
+    # 렌더링 지연이 여러 번의 확인 간격보다 길어도 새 페이지가 보일 때까지 기다림
+    source = ReplayFrameSource(book, render_latency=0.15)
+    _, shades = run_capture(tmp_path, source, len(SHADES), 1.0, wait_stable=True)
+    assert shades == SHADES
+
+
+@pytest.mark.parametrize('wait_stable', [False, True])
+def test_render_latency_longer_than_delay_stores_no_stale_frame(tmp_path, book, wait_stable):
+    # 딜레이(안정화 모드에서는 최대 대기 시간)가 지나도 이전 페이지가 보이면
+    # 중복으로 보고 저장하지 않은 채 다시 확인함
+    source = ReplayFrameSource(book, render_latency=0.15)
+    thread, shades = run_capture(tmp_path, source, len(SHADES), 0.05,
+                                 wait_stable=wait_stable, retry_missed=True, retry_backoff=0.2)
+    assert shades == SHADES
+    assert thread.retry_stats['recovered_pages'] == len(SHADES) - 1
+
+
+@pytest.mark.parametrize('retry_missed', [False, True])
+def test_auto_stop_at_last_page(tmp_path, book, retry_missed):
+    # 페이지 수를 모르면 마지막 페이지가 반복될 때 멈추고 반복 화면은 저장하지 않음
+    source = ReplayFrameSource(book, render_latency=0.02)
+    thread, shades = run_capture(tmp_path, source, None, 0.05, wait_stable=True,
+                                 auto_stop=True, retry_missed=retry_missed,
+                                 retry_backoff=0.01)
+    assert shades == SHADES
+    assert thread.retry_stats['recovered_pages'] == 0
+
+
+def test_auto_stop_respects_page_limit(tmp_path, book):
+    source = ReplayFrameSource(book)
+    _, shades = run_capture(tmp_path, source, 2, 0.02, auto_stop=True)
+    assert shades == SHADES[:2]
+
+
+class DroppingTurner(ReplayPageTurner):
+    """지정한 순번의 페이지 넘김 키 입력을 무시하는 페이지 넘김"""
+
+    def __init__(self, source, dropped):
+        super().__init__(source)
+        self.dropped = dropped
+        self.turns = 0
+
+    def turn(self):
+        self.turns += 1
+        if self.turns not in self.dropped:
+            super().turn()
+
+
+def test_dropped_turn_is_retried(tmp_path, book):
+    source = ReplayFrameSource(book)
+    turner = DroppingTurner(source, {2})
+    thread, shades = run_capture(tmp_path, source, len(SHADES), 0.02, turner=turner,
+                                 retry_missed=True, retry_backoff=0.01)
+    assert shades == SHADES
+    assert turner.turns == len(SHADES)
+    assert thread.retry_stats['retries'] == 1
+    assert thread.retry_stats['recovered_pages'] == 1
+    assert thread.retry_stats['exhausted'] == 0
+
+
+def test_exhausted_retries_are_not_recovered(tmp_path, book):
+    # 두 번째 페이지 이후 키 입력이 모두 무시되면 재시도를 소진하고 같은 페이지를 저장
+    source = ReplayFrameSource(book)
+    turner = DroppingTurner(source, set(range(2, 10)))
+    thread, shades = run_capture(tmp_path, source, 3, 0.02, turner=turner,
+                                 retry_missed=True, max_retries=2, retry_backoff=0.01)
+    assert shades == [SHADES[0], SHADES[1], SHADES[1]]
+    assert thread.retry_stats['retries'] == 2
+    assert thread.retry_stats['recovered_pages'] == 0
+    assert thread.retry_stats['exhausted'] == 1
+
+
+class RenderingSource(FrameSource):
+    """페이지를 넘긴 직후 렌더링 중인 중간 프레임을 먼저 보여주는 소스"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.index = 0
+        self.rendering = False
+
+    def advance(self):
+        self.index = min(self.index + 1, len(self.pages) - 1)
+        self.rendering = True
+
+    def grab(self):
+        if self.rendering:
+            # 첫 확인에는 중간 프레임, 그다음부터 완성된 페이지
+            self.rendering = False
+            return solid(self.pages[self.index] // 2)
+        return solid(self.pages[self.index])
+
+
+class AdvanceTurner(PageTurner):
+    def __init__(self, source):
+        self.source = source
+
+    def turn(self):
+        self.source.advance()
+
+
+def test_recorder_keeps_only_settled_frames(tmp_path):
+    source = RenderingSource([200, 120, 40])
+    recorder = RecordingFrameSource(source, str(tmp_path))
+    turner = RecordingPageTurner(AdvanceTurner(source), recorder)
+    with recorder:
+        recorder.grab()
+        for _ in range(3):
+            # 마지막 넘김은 페이지가 넘어가지 않아 같은 화면이 반복됨
+            turner.turn()
+            recorder.grab()
+            recorder.grab()
+    with open(tmp_path / 'session.json', encoding='utf-8') as f:
+        frames = json.load(f)['frames']
+    shades = [Image.open(tmp_path / item['file']).getpixel((0, 0))[0] for item in frames]
+    assert shades == [200, 120, 40]
@@ -0,0 +1,75 @@
+"""명령줄 진입점 테스트 (재생 소스 사용)"""
+
+import json
+
+import fitz
+import pytest
+from PIL import Image, ImageDraw
+
+import cli
+
+
+@pytest.fixture
+def book(tmp_path):
+    """재생용 페이지 이미지 디렉토리"""
+    directory = tmp_path / 'book'
+    directory.mkdir()
+    for index in range(3):
+        image = Image.new('RGB', (200, 260), (60, 60, 60))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((20, 20, 179, 239), fill='white')
+        draw.rectangle((50, 50 + index * 40, 150, 70 + index * 40), fill='black')
+        image.save(directory / f'{index}.png')
+    return str(directory)
+
+
+def test_capture_refuses_crop_with_incremental_pdf(tmp_path, book):
+    code = cli.main(['capture', '--replay', book, '--auto-stop', '--crop', 'page',
+                     '--output', str(tmp_path / 'out.pdf'), '--work-dir', str(tmp_path / 'w')])
+    assert code == 2
+
+
+def test_capture_defers_processing_when_cropping(tmp_path, book):
+    work_dir = tmp_path / 'w'
+    code = cli.main(['capture', '--replay', book, '--auto-stop', '--crop', 'book',
+                     '--paper', 'A6', '--work-dir', str(work_dir)])
+    assert code == 0
+    # 캡처 중에는 아무 처리도 하지 않고 변환 단계로 미룸
+    with open(work_dir / 'intermediate.json', encoding='utf-8') as f:
+        assert 'processing' not in json.load(f)
+
+
+def test_run_with_crop(tmp_path, book):
+    output = tmp_path / 'out.pdf'
+    code = cli.main(['run', '--replay', book, '--auto-stop', '--crop', 'book',
+                     '--output', str(output), '--work-dir', str(tmp_path / 'w')])
+    assert code == 0
+    with fitz.open(str(output)) as doc:
+        assert doc.page_count == 3
+    with open(tmp_path / 'out.perf.json', encoding='utf-8') as f:
+        report = json.load(f)
+    assert report['conversion']['processing'][0]['stage'] == 'crop'
+
+
+def test_record_then_replay(tmp_path, book):
+    session = tmp_path / 'session'
+    code = cli.main(['capture', '--replay', book, '--auto-stop', '--record', str(session),
+                     '--work-dir', str(tmp_path / 'w1')])
+    assert code == 0
+    # 끝 감지용 반복 화면은 같은 페이지이므로 페이지당 프레임 하나만 녹화
+    with open(session / 'session.json', encoding='utf-8') as f:
+        assert len(json.load(f)['frames']) == 3
+    output = tmp_path / 'out.pdf'
+    code = cli.main(['run', '--replay', str(session), '--auto-stop',
+                     '--output', str(output), '--work-dir', str(tmp_path / 'w2')])
+    assert code == 0
+    with fitz.open(str(output)) as doc:
+        assert doc.page_count == 3
+
+
+@pytest.mark.parametrize('command', ['convert', 'bench'])
+def test_screen_paper_needs_capture_monitor(tmp_path, command, capsys):
+    with pytest.raises(SystemExit) as error:
+        cli.main([command, '--paper', 'screen', '--output', str(tmp_path / 'out.pdf')])
+    assert error.value.code == 2
+    assert '--paper screen' in capsys.readouterr().err
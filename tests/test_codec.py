@@ -0,0 +1,147 @@
+"""PageCodec 분류/압축 테스트"""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from app.core.codec import PageCodec
+from app.core.converter import PDFConverter
+
+
+def text_page(size=(600, 400)):
+    """흰 바탕에 폭이 제각각인 검은 획(글자 모양)이 줄지어 있는 페이지"""
+    rng = np.random.default_rng(0)
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    for top in range(20, size[1] - 30, 22):
+        left = 20
+        while left < size[0] - 40:
+            width = int(rng.integers(2, 9))
+            height = int(rng.integers(6, 14))
+            draw.rectangle((left, top + 14 - height, left + width, top + 14), fill='black')
+            left += width + int(rng.integers(2, 12))
+    return image
+
+
+def line_art_page(size=(600, 400)):
+    """흰 바탕에 검은 원 윤곽선이 흩어진 페이지 (CCITT가 Flate보다 작은 흑백 페이지)"""
+    rng = np.random.default_rng(0)
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    for _ in range(25):
+        x = int(rng.integers(0, size[0] - 40))
+        y = int(rng.integers(0, size[1] - 40))
+        radius = int(rng.integers(10, 60))
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), outline='black', width=3)
+    return image
+
+
+def gray_page(size=(200, 150)):
+    """가로 방향 회색 그라데이션 페이지"""
+    row = np.linspace(0, 255, size[0]).astype(np.uint8)
+    pixels = np.repeat(np.tile(row, (size[1], 1))[..., None], 3, axis=2)
+    return Image.fromarray(pixels, 'RGB')
+
+
+def photo_page(size=(200, 150)):
+    """색이 많은 무작위 컬러 페이지"""
+    rng = np.random.default_rng(1)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8), 'RGB')
+
+
+def palette_page(size=(200, 150)):
+    """몇 가지 색으로만 이루어진 페이지 (도표, 표지)"""
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((10, 10, 90, 70), fill=(200, 30, 30))
+    draw.rectangle((100, 60, 180, 140), fill=(20, 60, 200))
+    return image
+
+
+@pytest.mark.parametrize('factory, kind', [
+    (text_page, 'bilevel'),
+    (line_art_page, 'bilevel'),
+    (gray_page, 'gray'),
+    (palette_page, 'palette'),
+    (photo_page, 'color'),
+])
+def test_classify(factory, kind):
+    assert PageCodec().classify(factory()) == kind
+
+
+def test_lossless_keeps_midtones():
+    image = text_page()
+    image.putpixel((0, 0), (128, 128, 128))
+    assert PageCodec(lossless=True).classify(image) == 'gray'
+    assert PageCodec().classify(image) == 'bilevel'
+
+
+def test_parse():
+    assert PageCodec.parse('raw') is None
+    assert PageCodec.parse(None) is None
+    assert PageCodec.parse('auto:70').jpeg_quality == 70
+    assert PageCodec.parse('lossless').lossless
+    with pytest.raises(ValueError):
+        PageCodec.parse('webp')
+    with pytest.raises(ValueError):
+        PageCodec.parse('auto:70,sharpen')
+
+
+@pytest.mark.parametrize('codec', [
+    PageCodec(),
+    PageCodec(lossless=True),
+    PageCodec(lossless=True, jpeg_quality=70, flate_level=9),
+    PageCodec(jpeg_quality=60, scale=0.85, threshold_text=True),
+    PageCodec(jpeg_quality=40, scale=0.5, prefer_jpeg=True, flate_level=1),
+])
+def test_spec_round_trip(codec):
+    assert PageCodec.parse(codec.spec) == codec
+    assert PageCodec.parse(codec.spec).spec == codec.spec
+
+
+def test_spec_keeps_every_setting():
+    assert PageCodec.parse('auto') == PageCodec.parse('auto:80')
+    assert PageCodec.parse('auto:60,scale=0.85') != PageCodec.parse('auto:60')
+    assert PageCodec.parse('auto:60,jpeg') != PageCodec.parse('auto:60,threshold')
+
+
+def test_digest():
+    assert PageCodec.digest(text_page()) == PageCodec.digest(text_page())
+    assert PageCodec.digest(text_page()) != PageCodec.digest(gray_page())
+
+
+def rendered_polarity(encoded, image):
+    """렌더링 결과에서 원본의 검은/흰 픽셀 위치의 밝기"""
+    rendered = np.asarray(PDFConverter.render_encoded(encoded).convert('L'))
+    original = np.asarray(image.convert('L'))
+    return rendered[original < 128].mean(), rendered[original >= 128].mean()
+
+
+@pytest.mark.skipif(not PageCodec.ccitt_available(), reason="libtiff not available")
+def test_ccitt_polarity():
+    image = line_art_page()
+    encoded = PageCodec().encode(image)
+    assert encoded.kind == 'bilevel'
+    assert encoded.codec == 'ccitt'
+    black, white = rendered_polarity(encoded, image)
+    # 선은 검게, 바탕은 희게 (반전되지 않음)
+    assert black < 32
+    assert white > 223
+
+
+def test_bilevel_flate_polarity(monkeypatch):
+    monkeypatch.setattr(PageCodec, 'ccitt_available', staticmethod(lambda: False))
+    image = text_page()
+    encoded = PageCodec().encode(image)
+    assert encoded.codec == 'flate'
+    assert encoded.bits_per_component == 1
+    black, white = rendered_polarity(encoded, image)
+    assert black < 32
+    assert white > 223
+
+
+@pytest.mark.parametrize('factory', [gray_page, palette_page, photo_page])
+def test_encoded_page_renders_at_original_size(factory):
+    image = factory()
+    encoded = PageCodec().encode(image)
+    assert PDFConverter.render_encoded(encoded).size == image.size
@@ -0,0 +1,65 @@
+"""IncrementalPDFWriter 중복 페이지 공유 테스트"""
+
+import fitz
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.core.codec import PageCodec
+from app.core.converter import IncrementalPDFWriter
+
+
+def make_image(seed, size=(64, 48)):
+    """재현 가능한 무작위 RGB 이미지"""
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8), 'RGB')
+
+
+def page_images(path):
+    """페이지별 이미지 xref 목록"""
+    with fitz.open(path) as doc:
+        return [[image[0] for image in page.get_images()] for page in doc]
+
+
+@pytest.mark.parametrize('codec', [None, PageCodec()])
+def test_duplicates_share_one_image_across_flushes(tmp_path, codec):
+    output = str(tmp_path / 'out.pdf')
+    # 아주 작은 예산으로 페이지마다 증분 저장 후 다시 열기
+    writer = IncrementalPDFWriter(output, flush_budget_mb=0.001, codec=codec)
+    pages = [make_image(1), make_image(2), make_image(1), make_image(3), make_image(2)]
+    for page_index, image in enumerate(pages, 1):
+        writer.add_page(page_index, image)
+    assert writer.finalize() == 5
+
+    assert writer.dedup_stats['unique_images'] == 3
+    assert writer.dedup_stats['duplicate_pages'] == 2
+    assert writer.dedup_stats['duplicates'] == [[3, 1], [5, 2]]
+    assert writer.dedup_stats['saved_bytes'] > 0
+
+    images = page_images(output)
+    assert len(images) == 5
+    assert images[0] == images[2]
+    assert images[1] == images[4]
+    assert len({xref for page in images for xref in page}) == 3
+
+
+def test_out_of_order_pages_dedup_in_page_order(tmp_path):
+    output = str(tmp_path / 'out.pdf')
+    writer = IncrementalPDFWriter(output, flush_budget_mb=0.001)
+    writer.add_page(3, make_image(1))
+    writer.add_page(2, make_image(2))
+    writer.add_page(1, make_image(1))
+    writer.finalize()
+    # 먼저 도착한 3쪽이 아니라 앞 페이지(1쪽)의 이미지를 공유
+    assert writer.dedup_stats['duplicates'] == [[3, 1]]
+
+
+def test_dedup_disabled(tmp_path):
+    output = str(tmp_path / 'out.pdf')
+    writer = IncrementalPDFWriter(output, dedup=False)
+    writer.add_page(1, make_image(1))
+    writer.add_page(2, make_image(1))
+    assert writer.finalize() == 2
+    assert writer.dedup_stats['unique_images'] == 0
+    assert writer.dedup_stats['duplicate_pages'] == 0
+
@@ -0,0 +1,72 @@
+"""IntermediateFormat 인코딩/마커 테스트"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.core.formats import IntermediateFormat
+
+
+def make_image(size=(16, 10)):
+    """재현 가능한 무작위 RGB 이미지"""
+    rng = np.random.default_rng(3)
+    pixels = rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    return Image.fromarray(pixels, 'RGB')
+
+
+@pytest.mark.parametrize('spec', [spec for spec in IntermediateFormat.available()
+                                  if spec != 'spool'])
+def test_codec_round_trip_is_lossless(spec):
+    fmt = IntermediateFormat.parse(spec)
+    image = make_image()
+    decoded = fmt.decode(fmt.encode(image))
+    assert decoded.size == image.size
+    assert decoded.convert('RGB').tobytes() == image.tobytes()
+
+
+@pytest.mark.parametrize('spec', ['png:1', 'zraw:1'])
+def test_load_page_file(tmp_path, spec):
+    fmt = IntermediateFormat.parse(spec)
+    image = make_image()
+    path = fmt.page_path(str(tmp_path), 4)
+    with open(path, 'wb') as f:
+        f.write(fmt.encode(image))
+    page = fmt.load(path)
+    if fmt.openable:
+        # PIL이 직접 여는 형식은 경로를 그대로 돌려줌
+        assert page == path
+        page = Image.open(page)
+    assert page.convert('RGB').tobytes() == image.tobytes()
+
+
+def test_parse():
+    assert IntermediateFormat.parse('png').level is None
+    assert IntermediateFormat.parse('png:1').spec == 'png:1'
+    # zraw는 레벨을 생략하면 가장 빠른 레벨
+    assert IntermediateFormat.parse('zraw').spec == 'zraw:1'
+    with pytest.raises(ValueError):
+        IntermediateFormat.parse('gif')
+
+
+def test_rejects_corrupt_raw_header():
+    fmt = IntermediateFormat.parse('zraw')
+    data = bytearray(fmt.encode(make_image()))
+    data[:4] = b'XXXX'
+    with pytest.raises(ValueError):
+        fmt.decode(bytes(data))
+
+
+def test_marker(tmp_path):
+    directory = str(tmp_path)
+    # 표시 파일이 없으면 PNG
+    assert IntermediateFormat.read_marker(directory).spec == 'png'
+    assert IntermediateFormat.read_processing(directory) is None
+
+    IntermediateFormat.write_marker(directory, 'bmp')
+    assert IntermediateFormat.read_marker(directory).spec == 'bmp'
+    assert IntermediateFormat.read_processing(directory) is None
+
+    processing = {'stages': [{'stage': 'resample', 'dpi': 150.0}], 'dpi': 150.0}
+    IntermediateFormat.write_marker(directory, 'png:1', processing)
+    assert IntermediateFormat.read_marker(directory).spec == 'png:1'
+    assert IntermediateFormat.read_processing(directory) == processing
@@ -0,0 +1,102 @@
+"""JobQueue 저장/복구와 JobScheduler 실행 테스트"""
+
+import os
+
+import pytest
+from PIL import Image, ImageDraw
+
+from app.core import JobQueue, JobScheduler
+
+
+def test_queue_round_trip(tmp_path):
+    path = str(tmp_path / 'jobs.json')
+    queue = JobQueue(path)
+    queue.set_profile('kindle', {'region': [10, 20, 610, 820], 'delay': 0.8})
+    first = queue.add(str(tmp_path / 'a.pdf'), profile='kindle', pages=120)
+    second = queue.add(str(tmp_path / 'b.pdf'), name='second', codec='lossless')
+    queue.update(first['id'], status=JobQueue.CAPTURED, pages=120, work_dir='w')
+    # 임시 파일에 쓴 뒤 교체하므로 남는 파일이 없음
+    assert not os.path.exists(path + '.tmp')
+
+    reloaded = JobQueue(path)
+    assert reloaded.profiles == queue.profiles
+    assert [job['id'] for job in reloaded.jobs] == [1, 2]
+    job = reloaded.get(first['id'])
+    assert job['status'] == JobQueue.CAPTURED
+    assert job['name'] == 'a'
+    assert reloaded.get(second['id'])['name'] == 'second'
+
+    # 기본값 < 프로필 < 작업 설정
+    settings = reloaded.settings_for(job)
+    assert settings['region'] == [10, 20, 610, 820]
+    assert settings['delay'] == 0.8
+    assert settings['pages'] == 120
+    assert settings['codec'] == 'auto'
+    assert reloaded.settings_for(reloaded.get(second['id']))['codec'] == 'lossless'
+
+
+def test_rejects_unknown_settings_and_profiles(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.json'))
+    with pytest.raises(ValueError):
+        queue.add('a.pdf', colour='blue')
+    with pytest.raises(ValueError):
+        queue.add('a.pdf', profile='missing')
+    with pytest.raises(ValueError):
+        queue.set_profile('bad', {'speed': 2})
+
+
+def test_recover_and_retry(tmp_path):
+    path = str(tmp_path / 'jobs.json')
+    queue = JobQueue(path)
+    for name in ('capturing', 'converting', 'failed'):
+        queue.add(f'{name}.pdf')
+    queue.update(1, status=JobQueue.CAPTURING)
+    queue.update(2, status=JobQueue.CONVERTING)
+    queue.update(3, status=JobQueue.FAILED, attempts=3, error='boom')
+
+    # 중간에 종료된 뒤 다시 열어서 복구
+    queue = JobQueue(path)
+    queue.recover()
+    assert queue.get(1)['status'] == JobQueue.PENDING
+    assert queue.get(2)['status'] == JobQueue.CAPTURED
+    assert queue.next_job(JobQueue.CAPTURED)['id'] == 2
+
+    assert queue.retry() == 1
+    job = JobQueue(path).get(3)
+    assert (job['status'], job['attempts'], job['error']) == (JobQueue.PENDING, 0, None)
+
+
+def test_scheduler_runs_replayed_books(tmp_path):
+    book = tmp_path / 'book'
+    book.mkdir()
+    for index in range(3):
+        image = Image.new('RGB', (120, 160), 'white')
+        ImageDraw.Draw(image).rectangle((10, 10 + index * 30, 100, 30 + index * 30),
+                                        fill='black')
+        image.save(book / f'{index}.png')
+
+    queue = JobQueue(str(tmp_path / 'jobs.json'))
+    for name in ('a', 'b', 'c'):
+        queue.add(str(tmp_path / f'{name}.pdf'), replay=str(book), auto_stop=True,
+                  delay=0.0, workers=1)
+    scheduler = JobScheduler(queue)
+    in_flight = []
+    submit = scheduler._submit
+
+    def counting_submit(pool, converting, job):
+        submit(pool, converting, job)
+        in_flight.append(len(converting))
+
+    scheduler._submit = counting_submit
+    summary = scheduler.run()
+
+    assert summary['done'] == 3 and summary['failed'] == 0
+    # 동시에 변환하는 책은 convert_workers권을 넘지 않음
+    assert len(in_flight) == 3 and max(in_flight) <= scheduler.convert_workers
+    for job in JobQueue(queue.path).jobs:
+        assert job['status'] == JobQueue.DONE
+        assert job['pages'] == 3
+        assert os.path.exists(job['output'])
+        assert os.path.exists(job['report'])
+        # 변환이 끝나면 작업 디렉토리 정리
+        assert not os.path.exists(job['work_dir'])
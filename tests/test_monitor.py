@@ -0,0 +1,73 @@
+"""MonitorManager 모니터 구성 캐시 테스트"""
+
+import pytest
+
+from app.utils import MonitorManager
+
+
+@pytest.fixture
+def topology(monkeypatch):
+    """mss/Qt 대신 조회 횟수를 세는 가짜 모니터 구성"""
+    calls = []
+    monitors = [{'left': 0, 'top': 0, 'width': 1920, 'height': 1080, 'scale': 1.0,
+                 'name': 'primary'}]
+
+    def enumerate_monitors():
+        calls.append(1)
+        return [dict(monitor) for monitor in monitors]
+
+    monkeypatch.setattr(MonitorManager, '_enumerate', staticmethod(enumerate_monitors))
+    monkeypatch.setattr(MonitorManager, '_topology', None)
+    monkeypatch.setattr(MonitorManager, '_listeners', [])
+    return calls, monitors
+
+
+def test_topology_is_cached(topology):
+    calls, _ = topology
+    assert MonitorManager.get_monitors()[0]['width'] == 1920
+    assert MonitorManager.get_monitor(0)['name'] == 'primary'
+    assert MonitorManager.get_monitor_offset(0) == {'top': 0, 'left': 0}
+    assert len(calls) == 1
+    assert MonitorManager.get_monitor(1) is None
+
+
+def test_callers_get_copies(topology):
+    MonitorManager.get_monitors()[0]['left'] = 500
+    assert MonitorManager.get_monitors()[0]['left'] == 0
+
+
+def test_invalidate_notifies_and_refreshes(topology):
+    calls, monitors = topology
+    notified = []
+    MonitorManager.add_listener(lambda: notified.append(MonitorManager.get_monitors()))
+    MonitorManager.get_monitors()
+
+    # 두 번째 모니터 연결
+    monitors.append({'left': 1920, 'top': 0, 'width': 2560, 'height': 1440, 'scale': 2.0,
+                     'name': 'external'})
+    assert len(MonitorManager.get_monitors()) == 1
+    MonitorManager.invalidate()
+    assert len(notified) == 1 and len(notified[0]) == 2
+    assert MonitorManager.get_monitor_offset(1) == {'top': 0, 'left': 1920}
+    assert len(calls) == 2
+
+
+def test_refresh_bypasses_cache(topology):
+    calls, _ = topology
+    MonitorManager.get_monitors()
+    MonitorManager.get_monitors(refresh=True)
+    assert len(calls) == 2
+
+
+def test_listener_errors_do_not_propagate(topology):
+    def broken():
+        raise RuntimeError("listener failed")
+
+    called = []
+    MonitorManager.add_listener(broken)
+    MonitorManager.add_listener(lambda: called.append(True))
+    MonitorManager.invalidate()
+    assert called == [True]
+
+    MonitorManager.remove_listener(broken)
+    assert broken not in MonitorManager._listeners
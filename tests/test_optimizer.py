@@ -0,0 +1,56 @@
+"""SizeOptimizer 목표 크기 탐색 테스트"""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFilter
+
+from app.core.codec import PageCodec
+from app.core.optimizer import SizeOptimizer
+
+# 선택된 후보가 넘어야 하는 최소 화질 (dB)
+PSNR_FLOOR = 30.0
+
+
+@pytest.fixture
+def pages(tmp_path):
+    """사진 페이지와 글자 페이지 (PNG 중간 형식), 각 페이지 이미지 리스트"""
+    rng = np.random.default_rng(1)
+    y, x = np.mgrid[0:300, 0:400]
+    pixels = np.stack([(x * 0.6) % 256, (y * 0.8) % 256, ((x + y) * 0.3) % 256], -1)
+    pixels = pixels + rng.normal(0, 6, pixels.shape)
+    photo = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+    text = Image.new('RGB', (400, 300), 'white')
+    draw = ImageDraw.Draw(text)
+    for top in range(20, 270, 20):
+        left = 20
+        while left < 370:
+            width = int(rng.integers(2, 8))
+            height = int(rng.integers(6, 13))
+            draw.rectangle((left, top + 12 - height, left + width, top + 12), fill=(30, 30, 30))
+            left += width + int(rng.integers(2, 10))
+    # 화면 캡처처럼 글자 가장자리를 부드럽게
+    text = text.filter(ImageFilter.GaussianBlur(0.8))
+
+    images = [photo, text]
+    for index, image in enumerate(images, 1):
+        image.save(tmp_path / f'page_{index}.png')
+    return str(tmp_path), images
+
+
+def test_chosen_codec_fits_budget_with_quality(pages):
+    input_dir, images = pages
+    lossless = [len(PageCodec(lossless=True).encode(image).data) for image in images]
+    # 무손실 평균의 1/4만 허용하여 손실 후보를 고르게 함
+    budget = sum(lossless) / len(lossless) / 4
+    optimizer = SizeOptimizer(page_budget=budget / SizeOptimizer.SAFETY_MARGIN, workers=1)
+    codec, report = optimizer.search(len(images), input_dir)
+
+    chosen = report['candidates'][report['chosen_level']]
+    assert chosen['fits']
+    assert chosen['min_psnr_db'] >= PSNR_FLOOR
+    # 글자 페이지는 손실 압축이 더 클 수도 있으므로 표본 전체 크기로 비교
+    assert chosen['bytes_per_page'] <= sum(lossless) / len(lossless)
+    assert sum(len(codec.encode(image).data) for image in images) <= sum(lossless)
+    # 리포트의 코덱 문자열로 같은 설정을 다시 쓸 수 있음
+    assert PageCodec.parse(report['chosen_codec']) == codec
@@ -0,0 +1,35 @@
+"""PerfMonitor 구간 측정과 스트리밍 작성기 종료 처리 테스트"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.core.converter import IncrementalPDFWriter
+from app.utils import PerfMonitor
+
+
+@pytest.mark.skipif(PerfMonitor.rss_mb() is None, reason="current RSS not measurable")
+def test_monitor_measures_the_window():
+    with PerfMonitor(interval=0.01) as monitor:
+        block = np.ones(64 * 1024 * 1024, dtype=np.uint8)
+        block.sum()
+    del block
+    assert monitor.peak_mb >= monitor.start_mb
+    assert monitor.delta_mb > 32
+
+    # 다음 구간은 앞 구간의 최대값을 이어받지 않음
+    with PerfMonitor(interval=0.01) as second:
+        pass
+    assert second.delta_mb < 32
+
+
+def test_abort_after_failed_finalize_keeps_error(tmp_path):
+    writer = IncrementalPDFWriter(str(tmp_path / 'missing' / 'out.pdf'))
+    writer.add_page(1, Image.new('RGB', (8, 8), 'white'))
+    with pytest.raises(RuntimeError, match='cannot open'):
+        try:
+            writer.finalize()
+        except Exception:
+            # 실패한 finalize() 뒤의 abort()는 문서를 다시 닫지 않음
+            writer.abort()
+            raise
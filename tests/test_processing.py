@@ -0,0 +1,246 @@
+"""페이지 후처리 단계 테스트"""
+
+import threading
+
+import fitz
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from app.core import CaptureThread, PDFConverter, PageProcessor
+from app.core.processing import CropStage, ResampleStage, SpreadSplitter
+from app.core.sources import Frame, ReplayFrameSource, ReplayPageTurner
+
+
+class CountingStage:
+    """적용 횟수를 세는 단계 (처리는 ResampleStage에 맡김)"""
+
+    def __init__(self, source_scale):
+        self.stage = ResampleStage(150.0, source_scale=source_scale)
+        self.dpi = self.stage.dpi
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def process(self, image):
+        with self._lock:
+            self.calls += 1
+        return self.stage.process(image)
+
+    def describe(self):
+        return self.stage.describe()
+
+
+def write_book(directory, count=4, size=(240, 320)):
+    """재생용 페이지 이미지 (페이지마다 다른 내용)"""
+    for index in range(count):
+        image = Image.new('RGB', size, 'white')
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((20, 20 + index * 40, 200, 40 + index * 40), fill='black')
+        image.save(directory / f'{index}.png')
+
+
+def capture(book, work_dir, processor):
+    """재생 소스로 책 끝까지 캡처"""
+    source = ReplayFrameSource(str(book))
+    thread = CaptureThread(0, 0, 240, 320, None, {'top': 0, 'left': 0}, 0.0,
+                           auto_stop=True, source=source, turner=ReplayPageTurner(source),
+                           work_dir=str(work_dir), processor=processor)
+    thread.run()
+    return thread.captured_count
+
+
+def test_resample_target_size():
+    stage = ResampleStage(300.0, 'A5')
+    # A5 300 DPI는 약 1748 x 2480 픽셀
+    assert stage.target_size((3496, 4960)) == (1748, 2480)
+    # 확대하지 않고, 1픽셀만 줄어드는 축소도 하지 않음
+    assert stage.target_size((800, 1000)) == (800, 1000)
+    assert ResampleStage(300.0, source_scale=2.0).target_size((1001, 1001)) == (500, 500)
+    with pytest.raises(ValueError):
+        ResampleStage.parse_paper('huge')
+
+
+def test_build():
+    assert PageProcessor.build(paper=None, crop=None) is None
+    processor = PageProcessor.build(paper='A5', dpi=200.0, cleanup=True)
+    assert processor.dpi == 200.0
+    assert [stage['stage'] for stage in processor.describe()][0] == 'resample'
+    with pytest.raises(ValueError):
+        PageProcessor.build(crop='all')
+
+
+def test_capture_time_processing_is_applied_once(tmp_path):
+    book = tmp_path / 'book'
+    book.mkdir()
+    write_book(book)
+    work_dir = tmp_path / 'work'
+    stage = CountingStage(source_scale=2.0)
+    processor = PageProcessor([stage])
+
+    pages = capture(book, work_dir, processor)
+    assert pages == 4
+    assert stage.calls == 4
+
+    # 같은 설정으로 변환하면 다시 처리하지 않고 기록된 해상도만 사용
+    stats = {}
+    output = str(tmp_path / 'out.pdf')
+    assert PDFConverter.convert_images_to_pdf(pages, output, str(work_dir), stats=stats,
+                                              workers=1, processor=processor)
+    assert stage.calls == 4
+    assert stats['processed_at_capture'] == processor.describe()
+    with fitz.open(output) as doc:
+        # 120 x 160 픽셀을 150 DPI로 배치
+        assert doc[0].rect.width == pytest.approx(120 * 72 / 150)
+        assert doc[0].rect.height == pytest.approx(160 * 72 / 150)
+
+    # 처리 없이 변환해도 기록된 해상도로 배치
+    output = str(tmp_path / 'plain.pdf')
+    assert PDFConverter.convert_images_to_pdf(pages, output, str(work_dir), workers=1)
+    with fitz.open(output) as doc:
+        assert doc[0].rect.width == pytest.approx(120 * 72 / 150)
+
+
+def test_conversion_refuses_different_processing(tmp_path):
+    book = tmp_path / 'book'
+    book.mkdir()
+    write_book(book)
+    work_dir = tmp_path / 'work'
+    pages = capture(book, work_dir, PageProcessor([ResampleStage(150.0, source_scale=2.0)]))
+
+    stats = {}
+    other = PageProcessor([ResampleStage(300.0, 'A6')])
+    assert not PDFConverter.convert_images_to_pdf(pages, str(tmp_path / 'out.pdf'),
+                                                  str(work_dir), stats=stats, workers=1,
+                                                  processor=other)
+    assert 'already processed' in stats['error']
+
+
+def reader_page(block, size=(300, 400), chrome=30):
+    """
+    어두운 뷰어 테두리 안의 흰 종이에 검은 글자 줄이 있는 화면
+
+    글자 줄은 block의 top부터 8픽셀 간격, 4픽셀 높이로 그린다.
+    """
+    image = Image.new('RGB', size, (40, 40, 40))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((chrome, chrome, size[0] - chrome - 1, size[1] - chrome - 1), fill='white')
+    if block is not None:
+        left, top, right, bottom = block
+        for y in range(top, bottom, 8):
+            draw.rectangle((left, y, right - 1, min(bottom, y + 4) - 1), fill='black')
+    return image
+
+
+def test_crop_detects_page_and_content():
+    stage = CropStage(margin=10)
+    page_box, content_box = stage.detect(reader_page((80, 100, 220, 300)))
+    assert page_box == pytest.approx((30, 30, 270, 370), abs=2)
+    assert content_box == pytest.approx((70, 90, 230, 306), abs=2)
+
+    page_box, content_box = stage.detect(reader_page(None))
+    assert content_box is None
+
+
+def test_book_crop_uses_union_of_samples():
+    stage = CropStage(margin=10)
+    assert stage.needs_fit
+    samples = [reader_page((80, 100, 220, 200)), reader_page((60, 150, 200, 300)),
+               reader_page(None)]
+    stage.fit(samples)
+    assert stage.box == pytest.approx((50, 90, 230, 308), abs=2)
+    cropped = stage.process(reader_page((80, 100, 220, 200)))
+    assert cropped.size == (stage.box[2] - stage.box[0], stage.box[3] - stage.box[1])
+
+
+def test_per_page_crop():
+    stage = CropStage(per_page=True, margin=10)
+    assert not stage.needs_fit and stage.variable_size
+    assert stage.process(reader_page((80, 100, 220, 200))).size == pytest.approx((160, 120), abs=4)
+    assert stage.process(reader_page((60, 150, 200, 300))).size == pytest.approx((160, 170), abs=4)
+
+
+def test_capture_rejects_processors_that_need_fitting():
+    book_crop = PageProcessor.build(crop='book')
+    with pytest.raises(ValueError):
+        CaptureThread(0, 0, 10, 10, 1, {'top': 0, 'left': 0}, 0.0, processor=book_crop)
+    # 페이지별 자르기는 표본이 필요 없으므로 캡처 중에도 사용 가능
+    CaptureThread(0, 0, 10, 10, 1, {'top': 0, 'left': 0}, 0.0,
+                  processor=PageProcessor.build(crop='page'))
+
+
+def spread(gutter_left=300, gutter_right=360, size=(600, 400)):
+    """안쪽 여백(gutter_left~gutter_right)을 사이에 둔 두 쪽 펼침 화면"""
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    for y in range(30, size[1] - 30, 12):
+        draw.rectangle((20, y, gutter_left - 1, y + 5), fill='black')
+        draw.rectangle((gutter_right, y, size[0] - 21, y + 5), fill='black')
+    return image
+
+
+def test_find_gutter_off_center():
+    image = spread()
+    gutter = SpreadSplitter().find_gutter(np.asarray(image))
+    assert abs(gutter - 330) <= 4
+
+
+def test_find_gutter_fixed_positions():
+    pixels = np.asarray(spread())
+    assert SpreadSplitter('center').find_gutter(pixels) == 300
+    assert SpreadSplitter(0.4).find_gutter(pixels) == 240
+    with pytest.raises(ValueError):
+        SpreadSplitter(1.5)
+
+
+def test_split_reading_order():
+    image = spread()
+    left, right = SpreadSplitter().split(image)
+    assert left.width + right.width == image.width
+    assert abs(left.width - 330) <= 4
+    # 오른쪽에서 왼쪽으로 읽는 책은 오른쪽 페이지가 먼저
+    first, second = SpreadSplitter(rtl=True).split(image)
+    assert first.tobytes() == right.tobytes()
+    assert second.tobytes() == left.tobytes()
+
+
+def test_split_frame_matches_image_split():
+    image = spread()
+    splitter = SpreadSplitter()
+    frames = splitter.split_frame(Frame.from_image(image))
+    images = splitter.split(image)
+    assert [frame.to_image().tobytes() for frame in frames] == \
+        [page.tobytes() for page in images]
+
+
+def desktop(size=(800, 600), page=(200, 100, 500, 520)):
+    """어두운 바탕화면 위 뷰어 창에 흰 페이지가 떠 있는 화면"""
+    image = Image.new('RGB', size, (30, 30, 30))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((150, 60, 650, 560), fill=(90, 90, 95))
+    draw.rectangle((150, 60, 650, 90), fill=(200, 200, 205))
+    left, top, right, bottom = page
+    draw.rectangle((left, top, right - 1, bottom - 1), fill='white')
+    # 글자 줄: 획 사이에 종이가 보이도록 짧은 세로 획을 띄엄띄엄 그림
+    for y in range(top + 30, bottom - 30, 14):
+        for x in range(left + 30, right - 30, 5):
+            draw.rectangle((x, y, x + 1, y + 7), fill='black')
+    return image
+
+
+def test_page_at_finds_clicked_page():
+    pixels = np.asarray(desktop())
+    # 글자 줄 사이를 클릭해도, 글자 위를 클릭해도 같은 페이지
+    for x, y in ((350, 303), (250, 133)):
+        assert CropStage.page_at(pixels, x, y) == pytest.approx((200, 100, 500, 520), abs=2)
+
+
+def test_page_at_accepts_bgra_pixels():
+    rgb = np.asarray(desktop())
+    bgra = np.dstack([rgb[..., ::-1], np.full(rgb.shape[:2], 255, dtype=np.uint8)])
+    assert CropStage.page_at(bgra, 350, 300) == pytest.approx((200, 100, 500, 520), abs=2)
+
+
+def test_page_at_outside_image():
+    pixels = np.asarray(desktop())
+    assert CropStage.page_at(pixels, -1, 10) is None
+    assert CropStage.page_at(pixels, 10, 600) is None
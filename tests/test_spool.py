@@ -0,0 +1,80 @@
+"""FrameSpool 기록/읽기 테스트"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.core.sources import Frame
+from app.core.spool import FrameSpool
+
+
+def make_image(seed, size=(12, 8)):
+    """재현 가능한 무작위 RGB 이미지"""
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    return Image.fromarray(pixels, 'RGB')
+
+
+def test_round_trip(tmp_path):
+    images = {page_index: make_image(page_index) for page_index in (1, 2, 3)}
+    with FrameSpool.create(str(tmp_path), (12, 8), expected_frames=3) as spool:
+        for page_index, image in images.items():
+            spool.write(page_index, Frame.from_image(image))
+
+    assert FrameSpool.exists(str(tmp_path))
+    with FrameSpool.open(str(tmp_path)) as spool:
+        assert spool.pages == {1, 2, 3}
+        for page_index, image in images.items():
+            page = spool.read_image(page_index)
+            assert page.mode == 'RGB'
+            assert page.tobytes() == image.tobytes()
+
+
+def test_out_of_order_writes_grow_past_expected_frames(tmp_path):
+    with FrameSpool.create(str(tmp_path), (12, 8), expected_frames=1) as spool:
+        spool.write(5, Frame.from_image(make_image(5)))
+        spool.write(2, Frame.from_image(make_image(2)))
+
+    with FrameSpool.open(str(tmp_path)) as spool:
+        assert spool.pages == {2, 5}
+        assert spool.read_image(3) is None
+        assert spool.read_image(5).tobytes() == make_image(5).tobytes()
+
+
+def test_image_outlives_spool(tmp_path):
+    image = make_image(7)
+    with FrameSpool.create(str(tmp_path), (12, 8)) as spool:
+        spool.write(1, Frame.from_image(image))
+    with FrameSpool.open(str(tmp_path)) as spool:
+        page = spool.read_image(1)
+    # 디코더가 픽셀을 복사하므로 스풀을 닫은 뒤에도 읽을 수 있음
+    assert page.tobytes() == image.tobytes()
+
+
+def test_rejects_frame_of_other_size(tmp_path):
+    with FrameSpool.create(str(tmp_path), (12, 8)) as spool:
+        with pytest.raises(ValueError):
+            spool.write(1, Frame.from_image(make_image(1, size=(8, 8))))
+
+
+def test_discard_removes_files(tmp_path):
+    with FrameSpool.create(str(tmp_path), (12, 8)) as spool:
+        spool.write(1, Frame.from_image(make_image(1)))
+    FrameSpool.discard(str(tmp_path))
+    assert not FrameSpool.exists(str(tmp_path))
+
+
+def test_grows_in_bounded_steps(tmp_path, monkeypatch):
+    stride = 12 * 8 * FrameSpool.BYTES_PER_PIXEL
+    monkeypatch.setattr(FrameSpool, 'GROW_BYTES', 4 * stride)
+    data_path = tmp_path / FrameSpool.DATA_FILE
+    with FrameSpool.create(str(tmp_path), (12, 8)) as spool:
+        assert data_path.stat().st_size == 4 * stride
+        spool.write(5, Frame.from_image(make_image(5)))
+        assert data_path.stat().st_size == 8 * stride
+
+    # 예상 프레임 수를 알면 그보다 크게 늘리지 않음
+    with FrameSpool.create(str(tmp_path), (12, 8), expected_frames=6) as spool:
+        assert data_path.stat().st_size == 4 * stride
+        spool.write(5, Frame.from_image(make_image(5)))
+        assert data_path.stat().st_size == 6 * stride